@@ -0,0 +1,215 @@
+"""
+과부하 시 입장 제어(admission control)
+
+- `AdmissionQueue`: 동시 처리 슬롯 수와 대기열 길이를 제한하고, 대기 기한을 넘긴 요청은 `Overloaded`로 거절합니다.
+  업스트림 LLM이 rate limit을 반환하면 `pause`로 잠시 새 호출을 받지 않습니다.
+- `ClientRateLimiter`: 클라이언트(IP 또는 지정한 헤더 값)별 토큰 버킷으로 요청 빈도를 제한합니다.
+
+거절된 요청은 `main.py`의 예외 처리기에서 429와 `Retry-After` 헤더로 즉시 응답합니다.
+채팅(새 업스트림 호출)과 조회 엔드포인트는 서로 다른 `AdmissionQueue`를 사용하므로 채팅이 포화되어도 조회는 영향을 받지 않습니다.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from fastapi import Request
+
+from .config import (
+    ADMISSION_ENABLED,
+    CHAT_MAX_CONCURRENCY,
+    CHAT_MAX_QUEUE,
+    CHAT_QUEUE_TIMEOUT,
+    CHAT_RATE_LIMIT,
+    CHAT_RATE_BURST,
+    CHAT_RATE_LIMIT_HEADER,
+    READ_MAX_CONCURRENCY,
+    READ_MAX_QUEUE,
+    READ_QUEUE_TIMEOUT,
+)
+from .telemetry import ADMISSION_REJECTED, telemetry
+
+
+class Overloaded(Exception):
+    """입장 제어로 거절된 요청 (429 + Retry-After로 응답)"""
+
+    def __init__(self, pool: str, reason: str, retry_after: float):
+        super().__init__(f"{pool}: {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0  # 슬롯이 없어 기다린 뒤 입장한 요청 수
+    rejected_queue_full: int = 0
+    rejected_timeout: int = 0
+    rejected_paused: int = 0
+
+
+class AdmissionQueue:
+    """
+    동시 처리 슬롯 + 길이 제한 대기열
+
+    슬롯이 없으면 도착 순서대로 최대 `max_queue`건까지 기다리고, 대기열이 가득 찼으면 바로,
+    `queue_timeout`초 안에 슬롯을 받지 못하면 기한이 지난 시점에 `Overloaded`를 발생시킵니다.
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue: int, queue_timeout: float, enabled: bool = ADMISSION_ENABLED):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.enabled = enabled
+        self.active = 0
+        self.stats = AdmissionStats()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        """슬롯을 얻을 때까지 기다리는 함수 (거절 시 Overloaded)"""
+        if not self.enabled:
+            return
+        paused_for = self._paused_until - time.monotonic()
+        if paused_for > 0:
+            self.stats.rejected_paused += 1
+            raise self._reject("upstream_rate_limited", paused_for)
+        if self.active < self.capacity and not self._waiters:
+            self.active += 1
+            self.stats.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats.rejected_queue_full += 1
+            raise self._reject("queue_full", self.queue_timeout)
+
+        # 슬롯이 나면 release()가 대기 중인 future에 슬롯을 넘겨줌
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        with telemetry.stage("admission_queue"):
+            try:
+                await asyncio.wait((waiter,), timeout=self.queue_timeout)
+            except BaseException:
+                self._abandon(waiter)
+                raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self.stats.rejected_timeout += 1
+            raise self._reject("queue_timeout", self.queue_timeout)
+        self.stats.admitted += 1
+        self.stats.queued += 1
+
+    def release(self) -> None:
+        """슬롯을 반납하는 함수 (대기 중인 요청이 있으면 바로 넘겨줌)"""
+        if not self.enabled:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def pause(self, seconds: float) -> None:
+        """업스트림이 과부하(rate limit)일 때 `seconds`초 동안 새 요청을 바로 거절하는 함수"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "capacity": self.capacity,
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            **self.stats.__dict__,
+        }
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        # 기한 초과/취소로 대기를 포기: 그 사이 슬롯을 넘겨받았다면 반납하고, 아니면 대기열에서 제거
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _reject(self, reason: str, retry_after: float) -> Overloaded:
+        ADMISSION_REJECTED.inc(pool=self.name, reason=reason)
+        telemetry.annotate(rejected=reason)
+        return Overloaded(self.name, reason, retry_after)
+
+
+class ClientRateLimiter:
+    """
+    클라이언트별 토큰 버킷
+
+    클라이언트마다 분당 `rate_per_minute`개씩 토큰이 채워지고 최대 `burst`개까지 모아 둘 수 있습니다.
+    메모리 사용량을 제한하기 위해 최근 요청한 클라이언트 `max_clients`명의 버킷만 보관합니다.
+
+    클라이언트는 접속 주소로 구분하고, `header`를 지정하면 그 헤더 값(쉼표로 나뉜 목록이면 첫 값)으로 구분합니다.
+    Next.js rewrite와 Render 프록시를 거치면 접속 주소는 프록시 것이므로 사용자별로 제한하려면 프록시가 설정하는 헤더가 필요합니다.
+    """
+
+    def __init__(self, rate_per_minute: float = CHAT_RATE_LIMIT, burst: float = CHAT_RATE_BURST,
+                 max_clients: int = 10000, enabled: bool = ADMISSION_ENABLED, header: str = CHAT_RATE_LIMIT_HEADER):
+        self.rate = rate_per_minute / 60
+        self.burst = max(1.0, burst)
+        self.max_clients = max_clients
+        self.header = header
+        self.enabled = enabled and rate_per_minute > 0
+        self.rejected = 0
+        # 클라이언트 -> (남은 토큰, 마지막 갱신 시각)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def client(self, request: Request) -> Optional[str]:
+        """요청을 보낸 클라이언트 식별자 (헤더가 없으면 접속 주소)"""
+        if self.header:
+            value = request.headers.get(self.header, "").split(",")[0].strip()
+            if value:
+                return value
+        return request.client.host if request.client else None
+
+    def check(self, client: Optional[str], pool: str = "chat") -> None:
+        """요청 1건에 토큰 1개를 사용하고, 토큰이 없으면 Overloaded를 발생시키는 함수"""
+        if not self.enabled:
+            return
+        key = client or "unknown"
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            ADMISSION_REJECTED.inc(pool=pool, reason="rate_limited")
+            telemetry.annotate(rejected="rate_limited")
+            raise Overloaded(pool, "rate_limited", (1.0 - tokens) / self.rate)
+        self._buckets[key] = (tokens - 1.0, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "rate_per_minute": round(self.rate * 60, 3),
+            "burst": self.burst,
+            "header": self.header or None,
+            "clients": len(self._buckets),
+            "rejected": self.rejected,
+        }
+
+
+# 프로세스 전역 입장 제어 (워커별)
+chat_admission = AdmissionQueue("chat", CHAT_MAX_CONCURRENCY, CHAT_MAX_QUEUE, CHAT_QUEUE_TIMEOUT)
+read_admission = AdmissionQueue("read", READ_MAX_CONCURRENCY, READ_MAX_QUEUE, READ_QUEUE_TIMEOUT)
+chat_rate_limiter = ClientRateLimiter()
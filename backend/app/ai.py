@@ -1,24 +1,31 @@
-import os
-import openai
-from typing import List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from .config import OPENAI_API_KEY
 from .database import Policy
 from .schemas import ChatResponse
+from .schemas import Policy as PolicySchema
+from .admission import chat_admission
+from .config import LLM_RATE_LIMIT_COOLDOWN
+from .llm import LLMRateLimitError, get_llm_client
+from .retrieval import estimate_tokens
+from .telemetry import COMPLETION_TOKENS, FALLBACKS, LLM_ERRORS, PROMPT_TOKENS, get_logger, telemetry
 
-# OpenAI API 키 설정
-openai.api_key = OPENAI_API_KEY
+logger = get_logger("algovote.ai")
 
-async def get_ai_response(question: str, policies: Optional[List[Policy]] = None) -> ChatResponse:
+SYSTEM_PROMPT = "당신은 선거 정책 분석 전문가로, 객관적이고 중립적으로 답변합니다."
+FALLBACK_ANSWER = "죄송합니다. 현재 AI 답변 서비스에 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
+
+
+def build_messages(question: str, policies: Optional[List[Policy]] = None) -> Tuple[List[Dict[str, str]], List[PolicySchema]]:
     """
-    질문에 대한 AI 응답을 생성하는 함수
+    질문과 관련 정책으로 LLM 메시지를 구성하는 함수
     
     Args:
         question: 사용자 질문
         policies: 관련 정책 목록 (선택적)
         
     Returns:
-        ChatResponse: AI 응답 및 관련 정책
+        Tuple: LLM 메시지 목록, 응답에 포함할 관련 정책 목록
     """
     # 관련 정책이 있는 경우 프롬프트에 추가
     policy_context = ""
@@ -30,7 +37,7 @@ async def get_ai_response(question: str, policies: Optional[List[Policy]] = None
             policy_context += f"후보: {policy.candidate.name}\n"
             policy_context += f"정책: {policy.title}\n"
             policy_context += f"설명: {policy.description}\n\n"
-            related_policies.append(policy)
+            related_policies.append(PolicySchema.model_validate(policy))
     
     # 프롬프트 구성
     prompt = f"""
@@ -41,28 +48,151 @@ async def get_ai_response(question: str, policies: Optional[List[Policy]] = None
     질문: {question}
     """
     
-    # OpenAI API 호출
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    return messages, related_policies
+
+
+def build_prompt(question: str, policies: Optional[List[Policy]] = None) -> Tuple[List[Dict[str, str]], List[PolicySchema]]:
+    """build_messages에 프롬프트 구성 시간과 프롬프트 토큰 수 계측을 더한 함수"""
+    with telemetry.stage("prompt"):
+        messages, related_policies = build_messages(question, policies)
+    PROMPT_TOKENS.observe(sum(estimate_tokens(message["content"]) for message in messages))
+    return messages, related_policies
+
+
+def record_llm_failure(operation: str, error: Exception, fallback: bool = True) -> None:
+    """
+    LLM 호출 실패를 카운터와 로그에 기록하는 함수 (fallback이면 실패한 요청을 FALLBACK_ANSWER로 응답한 것으로 기록)
+
+    업스트림 rate limit이면 그동안 새 채팅 호출을 받지 않고 429로 바로 거절하도록 입장 제어를 잠시 멈춥니다.
+    """
+    if isinstance(error, LLMRateLimitError):
+        chat_admission.pause(error.retry_after or LLM_RATE_LIMIT_COOLDOWN)
+    LLM_ERRORS.inc(operation=operation, error=type(error).__name__)
+    if fallback:
+        FALLBACKS.inc()
+        telemetry.annotate(fallback=True, llm_error=type(error).__name__)
+    logger.warning("LLM API 오류", extra={"fields": {"operation": operation, "error": type(error).__name__, "detail": str(error)}})
+
+
+async def stream_ai_response(question: str, policies: Optional[List[Policy]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    질문에 대한 AI 응답을 토큰 단위 이벤트로 생성하는 비동기 제너레이터
+    
+    이벤트 순서:
+        {"type": "policies", "related_policies": [...]}  # 가장 먼저 전송
+        {"type": "token", "content": "..."}              # 토큰이 도착할 때마다
+        {"type": "done", "answer": "..."}                # 완료 시 전체 답변
+        {"type": "error", "answer": "..."}               # 실패 시 안내 메시지
+    
+    Args:
+        question: 사용자 질문
+        policies: 관련 정책 목록 (선택적)
+        
+    Yields:
+        Dict: 스트리밍 이벤트
+    """
+    messages, related_policies = build_prompt(question, policies)
+    yield {
+        "type": "policies",
+        "related_policies": [policy.model_dump() for policy in related_policies],
+    }
+    
+    answer = ""
+    start = time.perf_counter()
+    first_token = None
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "당신은 선거 정책 분석 전문가로, 객관적이고 중립적으로 답변합니다."},
-                {"role": "user", "content": prompt}
-            ],
+        async for token in get_llm_client().stream_chat(
+            messages=messages,
             max_tokens=1000,
             temperature=0.7
-        )
-        
-        answer = response.choices[0].message["content"].strip()
+        ):
+            if first_token is None:
+                first_token = time.perf_counter()
+                telemetry.record("llm_first_token", first_token - start)
+            answer += token
+            yield {"type": "token", "content": token}
+    except Exception as e:
+        record_llm_failure("stream", e)
+        yield {"type": "error", "answer": FALLBACK_ANSWER}
+        return
+    
+    # 토큰 전달(구독자 처리 시간 포함)까지의 전체 LLM 대기 시간
+    telemetry.record("llm", time.perf_counter() - start)
+    COMPLETION_TOKENS.observe(estimate_tokens(answer))
+    yield {"type": "done", "answer": answer.strip()}
+
+
+async def summarize_category(category: str, pledges: List[Tuple[str, List[Dict[str, Any]]]]) -> Optional[str]:
+    """
+    한 정책 분야의 후보별 공약을 비교 요약하는 함수
+
+    Args:
+        category: 정책 분야
+        pledges: (후보 이름, 해당 분야 공약 목록) 목록
+
+    Returns:
+        Optional[str]: 비교 요약 (실패 시 None)
+    """
+    context = ""
+    for name, policies in pledges:
+        context += f"후보: {name}\n"
+        for policy in policies:
+            context += f"- {policy['title']}: {policy.get('description') or ''}\n"
+        context += "\n"
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": (
+            f"다음은 '{category}' 분야의 후보별 공약입니다. 후보 간 차이점을 중심으로 3~5문장으로 비교 요약해주세요.\n\n"
+            f"{context}질문: {category} 분야 공약 비교"
+        )},
+    ]
+    try:
+        with telemetry.stage("summary_llm"):
+            summary = await get_llm_client().chat(messages=messages, max_tokens=500, temperature=0.3)
+        COMPLETION_TOKENS.observe(estimate_tokens(summary))
+        return summary.strip() or None
+    except Exception as e:
+        record_llm_failure("summary", e, fallback=False)
+        return None
+
+
+async def response_events(response: ChatResponse) -> AsyncIterator[Dict[str, Any]]:
+    """
+    이미 완성된 답변(캐시 등)을 스트리밍 이벤트 형식으로 변환하는 비동기 제너레이터
+    
+    Args:
+        response: 완성된 AI 응답
         
-        return ChatResponse(
-            answer=answer,
-            related_policies=related_policies
-        )
+    Yields:
+        Dict: 스트리밍 이벤트
+    """
+    yield {
+        "type": "policies",
+        "related_policies": [policy.model_dump() for policy in response.related_policies or []],
+    }
+    yield {"type": "token", "content": response.answer}
+    yield {"type": "done", "answer": response.answer}
+
+
+async def collect_response(events: AsyncIterator[Dict[str, Any]]) -> ChatResponse:
+    """
+    스트리밍 이벤트를 끝까지 받아 하나의 응답으로 합치는 함수 (response_events의 반대)
+    
+    Args:
+        events: stream_ai_response 형식의 이벤트
         
-    except Exception as e:
-        print(f"OpenAI API 오류: {e}")
-        return ChatResponse(
-            answer="죄송합니다. 현재 AI 답변 서비스에 문제가 발생했습니다. 잠시 후 다시 시도해주세요.",
-            related_policies=[]
-        ) 
\ No newline at end of file
+    Returns:
+        ChatResponse: 완성된 답변 및 관련 정책 (완료 이벤트 없이 끝나면 안내 메시지)
+    """
+    related_policies = []
+    async for event in events:
+        if event["type"] == "policies":
+            related_policies = event["related_policies"]
+        elif event["type"] == "done":
+            return ChatResponse(answer=event["answer"], related_policies=related_policies)
+    return ChatResponse(answer=FALLBACK_ANSWER, related_policies=[])
@@ -0,0 +1,280 @@
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_MAX_BYTES,
+    ANSWER_CACHE_SEMANTIC,
+    ANSWER_CACHE_SIMILARITY,
+)
+from .schemas import ChatResponse
+from .llm import get_llm_client
+from .telemetry import LLM_ERRORS, get_logger
+
+logger = get_logger("algovote.cache")
+
+# 질문 끝의 물음표/마침표 등은 같은 질문으로 취급
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.。？！~]+$")
+
+CacheKey = Tuple[str, Tuple[int, ...], Optional[int], int]
+
+
+def normalize_question(question: str) -> str:
+    """
+    캐시 키 생성을 위해 질문을 정규화하는 함수
+
+    유니코드 정규화(NFKC), 소문자 변환, 공백 축약, 끝 문장부호 제거를 적용합니다.
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = " ".join(text.split())
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+@dataclass
+class CacheEntry:
+    response: ChatResponse
+    expires_at: float
+    size: int
+    embedding: Optional[List[float]] = None
+
+
+@dataclass
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class AnswerCache:
+    """
+    LLM 답변 캐시
+
+    (정규화된 질문, 정렬된 후보 ID, 관련 정책 수, 데이터 버전)을 키로 정확히 일치하는 답변을 먼저 찾고,
+    `semantic`이 켜져 있으면 같은 후보 조합 안에서 임베딩 유사도가 `similarity` 이상인 답변을 재사용합니다.
+    TTL 만료, 항목 수/메모리 상한 초과 시 가장 오래 사용되지 않은 항목부터 제거(LRU)합니다.
+    후보자/정책이 변경되면 `invalidate()`로 데이터 버전을 올려 이전 답변을 모두 무효화합니다.
+    캐시는 워커 프로세스별이므로 다른 워커의 변경은 TTL이 지나야 반영됩니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = ANSWER_CACHE_ENABLED,
+        ttl: float = ANSWER_CACHE_TTL,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        max_bytes: int = ANSWER_CACHE_MAX_BYTES,
+        semantic: bool = ANSWER_CACHE_SEMANTIC,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.semantic = semantic
+        self.similarity = similarity
+        self.data_version = 0
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def make_key(
+        self,
+        question: str,
+        candidate_ids: Optional[Iterable[int]] = None,
+        match_count: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> CacheKey:
+        # match_count가 다르면 프롬프트에 들어가는 정책이 달라지므로 다른 답변으로 취급
+        version = self.data_version if version is None else version
+        return (normalize_question(question), tuple(sorted(set(candidate_ids or []))), match_count, version)
+
+    async def get(
+        self, question: str, candidate_ids: Optional[Iterable[int]] = None, match_count: Optional[int] = None
+    ) -> Optional[ChatResponse]:
+        """
+        캐시된 답변을 조회하는 함수
+
+        Args:
+            question: 사용자 질문
+            candidate_ids: 질문 대상 후보 ID 목록
+            match_count: 프롬프트에 넣은 관련 정책 수
+
+        Returns:
+            Optional[ChatResponse]: 캐시된 답변 (없으면 None)
+        """
+        response, _ = await self.lookup(question, candidate_ids, match_count)
+        return response
+
+    async def lookup(
+        self, question: str, candidate_ids: Optional[Iterable[int]] = None, match_count: Optional[int] = None
+    ) -> Tuple[Optional[ChatResponse], Optional[List[float]]]:
+        """
+        캐시된 답변과, 유사도 검색에 사용한 질문 임베딩을 함께 반환하는 함수
+
+        캐시 실패 후 `set`에 임베딩을 넘기면 같은 질문을 다시 임베딩하지 않습니다.
+
+        Args:
+            question: 사용자 질문
+            candidate_ids: 질문 대상 후보 ID 목록
+            match_count: 프롬프트에 넣은 관련 정책 수
+
+        Returns:
+            Tuple: 캐시된 답변 (없으면 None), 질문 임베딩 (만들지 않았으면 None)
+        """
+        if not self.enabled:
+            return None, None
+
+        key = self.make_key(question, candidate_ids, match_count)
+        entry = self._lookup(key)
+        if entry is not None:
+            self.stats.exact_hits += 1
+            return entry.response, None
+
+        embedding = None
+        if self.semantic:
+            entry, embedding = await self._lookup_similar(key)
+            if entry is not None:
+                self.stats.semantic_hits += 1
+                return entry.response, embedding
+
+        self.stats.misses += 1
+        return None, embedding
+
+    async def set(
+        self,
+        question: str,
+        candidate_ids: Optional[Iterable[int]],
+        response: ChatResponse,
+        embedding: Optional[List[float]] = None,
+        match_count: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        답변을 캐시에 저장하는 함수
+
+        답변을 만드는 동안 후보자/정책이 바뀌었으면 이전 데이터로 만든 답변이므로 저장하지 않습니다.
+
+        Args:
+            question: 사용자 질문
+            candidate_ids: 질문 대상 후보 ID 목록
+            response: 저장할 답변
+            embedding: `lookup`이 반환한 질문 임베딩 (없으면 새로 생성)
+            match_count: 프롬프트에 넣은 관련 정책 수
+            version: 답변을 만들기 시작할 때(캐시 조회 시점)의 데이터 버전 (None이면 현재 버전)
+        """
+        if not self.enabled:
+            return
+
+        key = self.make_key(question, candidate_ids, match_count, version)
+        if key[-1] != self.data_version:
+            return
+        if self.semantic and embedding is None:
+            embedding = await self._embed(key[0])
+        # 임베딩을 기다리는 동안 데이터가 바뀌었으면 저장하지 않음
+        if key[-1] != self.data_version:
+            return
+
+        size = len(response.model_dump_json()) + len(key[0].encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = CacheEntry(
+            response=response,
+            expires_at=time.monotonic() + self.ttl,
+            size=size,
+            embedding=embedding,
+        )
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self) -> None:
+        """후보자/정책 데이터 변경 시 모든 캐시 답변을 무효화하는 함수"""
+        self.data_version += 1
+        self.stats.invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        """캐시 적중/실패 통계를 반환하는 함수"""
+        lookups = self.stats.exact_hits + self.stats.semantic_hits + self.stats.misses
+        hits = self.stats.exact_hits + self.stats.semantic_hits
+        return {
+            "enabled": self.enabled,
+            "semantic": self.semantic,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "data_version": self.data_version,
+            "exact_hits": self.stats.exact_hits,
+            "semantic_hits": self.stats.semantic_hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "invalidations": self.stats.invalidations,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _lookup(self, key: CacheKey) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _lookup_similar(self, key: CacheKey) -> Tuple[Optional[CacheEntry], Optional[List[float]]]:
+        # 같은 후보 조합의 답변이 없으면 임베딩 호출 자체를 생략
+        if not any(other_key[1:] == key[1:] for other_key in self._entries):
+            return None, None
+        embedding = await self._embed(key[0])
+        if embedding is None:
+            return None, None
+
+        now = time.monotonic()
+        best_key, best_score = None, self.similarity
+        for other_key, entry in self._entries.items():
+            # 후보 조합, 관련 정책 수, 데이터 버전이 같은 답변만 비교
+            if other_key[1:] != key[1:] or entry.embedding is None or entry.expires_at <= now:
+                continue
+            score = sum(a * b for a, b in zip(embedding, entry.embedding))
+            if score >= best_score:
+                best_key, best_score = other_key, score
+
+        if best_key is None:
+            return None, embedding
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key], embedding
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        # 유사도 계산이 내적이 되도록 정규화된 벡터로 저장
+        try:
+            vector = await get_llm_client().embed(text)
+        except Exception as e:
+            LLM_ERRORS.inc(operation="embed", error=type(e).__name__)
+            logger.warning("임베딩 생성 오류", extra={"fields": {"error": type(e).__name__, "detail": str(e)}})
+            return None
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        return [v / norm for v in vector]
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.stats.evictions += 1
+
+
+# 프로세스 전역 답변 캐시
+answer_cache = AnswerCache()
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import CATALOG_TTL
+from .database import Candidate, Policy
+from .schemas import CandidateBase as CandidateBaseSchema
+from .schemas import Policy as PolicySchema
+from .telemetry import telemetry
+
+
+def render(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Validator(Protocol):
+    """조건부 요청 판단에 쓰는 값을 가진 응답 (카탈로그/비교표 스냅샷)"""
+
+    etag: str
+    last_modified: datetime
+
+
+def versioned(body: bytes, previous: Optional[Validator]) -> Tuple[str, datetime]:
+    """응답 본문의 ETag와 Last-Modified를 만드는 함수"""
+    etag = f'W/"{hashlib.sha1(body).hexdigest()[:16]}"'
+    # 내용이 같으면 이전 Last-Modified를 유지해 조건부 요청이 계속 304를 받도록 함
+    if previous is not None and previous.etag == etag:
+        return etag, previous.last_modified
+    return etag, datetime.now(timezone.utc).replace(microsecond=0)
+
+
+@dataclass
+class CatalogSnapshot:
+    """특정 시점의 후보자/정책 목록과 미리 직렬화한 응답 본문"""
+
+    candidates: List[Dict[str, Any]]
+    candidates_by_id: Dict[int, Dict[str, Any]]
+    policies_by_candidate: Dict[int, List[Dict[str, Any]]]
+    candidates_body: bytes
+    policies_body: bytes
+    etag: str
+    last_modified: datetime
+    loaded_at: float
+
+
+class Catalog:
+    """
+    후보자/정책 조회용 프로세스 내 read-through 캐시
+
+    첫 조회 시 후보자와 정책을 한 번에 읽어 스냅샷을 만들고, 이후 조회는 DB를 거치지 않습니다.
+    후보자/정책이 생성되면 `invalidate()`로 스냅샷을 버리고 다음 조회에서 다시 만듭니다.
+    다른 워커 프로세스에서 일어난 변경은 `ttl`초마다 다시 읽어 반영합니다.
+    스냅샷마다 ETag/Last-Modified를 부여해 조건부 요청에 304로 응답할 수 있게 합니다.
+    """
+
+    def __init__(self, ttl: float = CATALOG_TTL):
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._generation += 1
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """
+        현재 스냅샷을 반환하는 함수 (없으면 DB에서 읽어 생성)
+
+        Args:
+            db: 데이터베이스 세션
+
+        Returns:
+            CatalogSnapshot: 후보자/정책 스냅샷
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        # 동시에 들어온 요청이 모두 DB를 읽지 않도록 하나만 로딩
+        async with self._lock:
+            if self._is_fresh(self._snapshot):
+                return self._snapshot
+            generation = self._generation
+            snapshot = await self._load(db)
+            # 로딩하는 동안 데이터가 바뀌었으면 이번 스냅샷은 이번 요청에만 사용
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl
+
+    async def _load(self, db: AsyncSession) -> CatalogSnapshot:
+        # 후보자 수와 관계없이 후보자 1회 + 정책 1회, 총 2번의 쿼리로 로딩 (쿼리 시간은 db 단계로 기록)
+        with telemetry.stage("db"):
+            rows = (await db.scalars(select(Candidate).order_by(Candidate.id))).all()
+            policy_rows = (await db.scalars(select(Policy).order_by(Policy.id))).all()
+
+        policies = [PolicySchema.model_validate(row).model_dump() for row in policy_rows]
+        policies_by_candidate: Dict[int, List[Dict[str, Any]]] = {row.id: [] for row in rows}
+        for policy in policies:
+            policies_by_candidate.setdefault(policy["candidate_id"], []).append(policy)
+
+        candidates = [
+            {
+                **CandidateBaseSchema.model_validate(row, from_attributes=True).model_dump(),
+                "id": row.id,
+                "policies": policies_by_candidate[row.id],
+            }
+            for row in rows
+        ]
+
+        candidates_body = render(candidates)
+        etag, last_modified = versioned(candidates_body, self._snapshot)
+
+        return CatalogSnapshot(
+            candidates=candidates,
+            candidates_by_id={candidate["id"]: candidate for candidate in candidates},
+            policies_by_candidate=policies_by_candidate,
+            candidates_body=candidates_body,
+            policies_body=render(policies),
+            etag=etag,
+            last_modified=last_modified,
+            loaded_at=time.monotonic(),
+        )
+
+
+def not_modified(request: Request, snapshot: Validator) -> bool:
+    """조건부 요청 헤더(If-None-Match, If-Modified-Since)로 304 응답 가능 여부를 판단하는 함수"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # 약한 비교: W/ 접두사는 무시
+        return "*" in tags or snapshot.etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return snapshot.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Accept-Encoding에서 gzip의 q 값이 0보다 큰지 확인하는 함수 (gzip 항목이 없으면 * 항목을 따름)"""
+    qualities: Dict[str, float] = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+def conditional_response(request: Request, snapshot: Validator, body: bytes, gzip_body: Optional[bytes] = None) -> Response:
+    """
+    ETag/Last-Modified를 붙여 응답하는 함수
+
+    변경이 없으면 본문 없이 304로 응답하고, 미리 압축한 본문(`gzip_body`)이 있으면
+    클라이언트가 gzip을 받을 수 있을 때 그 본문으로 응답합니다.
+    """
+    headers = {
+        "ETag": snapshot.etag,
+        "Last-Modified": format_datetime(snapshot.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if gzip_body is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if not_modified(request, snapshot):
+        return Response(status_code=304, headers=headers)
+    if gzip_body is not None and accepts_gzip(request):
+        return Response(content=gzip_body, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# 프로세스 전역 카탈로그
+catalog = Catalog()
@@ -0,0 +1,206 @@
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .ai import summarize_category
+from .catalog import CatalogSnapshot, catalog, render, versioned
+from .config import COMPARISON_SUMMARIES
+from .database import ComparisonSummary, SessionLocal
+from .telemetry import get_logger
+
+logger = get_logger("algovote.comparison")
+
+UNCATEGORIZED = "기타"  # 분야가 없는 정책
+SUMMARY_RETRY_INTERVAL = 60.0  # 요약 생성에 실패한 분야를 다시 시도하기까지의 시간(초)
+
+
+@dataclass
+class CategoryCells:
+    """비교표의 한 행: 한 정책 분야의 후보별 공약과 그 내용의 해시"""
+
+    category: str
+    policies: Dict[int, List[Dict[str, Any]]]
+    digest: str
+
+
+@dataclass
+class ComparisonSnapshot:
+    """미리 직렬화/압축한 비교표 응답"""
+
+    source: CatalogSnapshot  # 비교표를 만든 카탈로그 스냅샷 (바뀌면 다시 만듦)
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    last_modified: datetime
+    pending: int
+
+
+class ComparisonMatrix:
+    """
+    후보자 × 정책 분야 비교표
+
+    카탈로그 스냅샷에서 정책을 분야/후보별로 묶어 응답 본문을 한 번 만들고 gzip으로 압축해 두므로,
+    비교 화면은 후보별 조회를 여러 번 하는 대신 캐시된 응답 하나를 받습니다.
+    카탈로그가 바뀌면(정책 추가, 다른 워커의 변경 반영) 비교표 전체를 다시 묶고 직렬화/압축합니다.
+
+    분야별 LLM 비교 요약(`summaries=True`)은 분야 이름과 후보별 공약 내용의 해시로 구분해
+    DB(`comparison_summaries`)에 저장합니다. 정책이 추가되면 내용이 바뀐 분야의 요약만 백그라운드에서 다시 만들고,
+    나머지 분야와 다른 워커/재시작 후의 요청은 저장된 요약을 재사용합니다.
+    요약이 준비되기 전에는 summary가 비어 있는 비교표를 바로 응답하고, 요약이 생성되면 ETag가 바뀝니다.
+    """
+
+    def __init__(self, summaries: bool = COMPARISON_SUMMARIES):
+        self.summaries = summaries
+        self._snapshot: Optional[ComparisonSnapshot] = None
+        self._summaries: Dict[str, str] = {}  # 내용 해시 -> 요약
+        self._pending: Set[str] = set()  # 생성 중인 요약의 내용 해시
+        self._failed: Dict[str, float] = {}  # 생성에 실패한 요약의 내용 해시 -> 실패 시각
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        # 요약은 내용 해시로 구분하므로 유지하고, 응답 본문만 다시 만듦
+        self._snapshot = None
+
+    async def get(self, db: AsyncSession) -> ComparisonSnapshot:
+        """
+        현재 비교표를 반환하는 함수 (카탈로그가 바뀌었으면 다시 생성)
+
+        Args:
+            db: 데이터베이스 세션
+
+        Returns:
+            ComparisonSnapshot: 비교표 응답
+        """
+        source = await catalog.get(db)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.source is source:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.source is source:
+                return snapshot
+            rows = self._group(source)
+            if self.summaries:
+                await self._load_summaries(db, rows)
+                self._schedule(source, rows)
+            snapshot = self._render(source, rows)
+            self._snapshot = snapshot
+            return snapshot
+
+    async def wait_for_summaries(self) -> None:
+        """진행 중인 요약 생성이 모두 끝날 때까지 기다리는 함수 (벤치마크/종료 처리용)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _group(self, source: CatalogSnapshot) -> List[CategoryCells]:
+        grouped: Dict[str, Dict[int, List[Dict[str, Any]]]] = {}
+        for candidate in source.candidates:
+            for policy in candidate["policies"]:
+                cell = grouped.setdefault(policy["category"] or UNCATEGORIZED, {}).setdefault(candidate["id"], [])
+                cell.append({"id": policy["id"], "title": policy["title"], "description": policy["description"]})
+
+        names = {candidate["id"]: candidate["name"] for candidate in source.candidates}
+        rows = []
+        for category in sorted(grouped):
+            policies = grouped[category]
+            # 요약에 영향을 주는 내용(분야, 후보 이름, 공약 제목/설명)만으로 해시
+            content = [category, [[names[candidate_id], policies[candidate_id]] for candidate_id in sorted(policies)]]
+            rows.append(CategoryCells(category, policies, hashlib.sha1(render(content)).hexdigest()))
+        return rows
+
+    def _render(self, source: CatalogSnapshot, rows: List[CategoryCells]) -> ComparisonSnapshot:
+        pending = sum(1 for row in rows if row.digest in self._pending)
+        body = render({
+            "candidates": [
+                {"id": candidate["id"], "name": candidate["name"], "party": candidate["party"]}
+                for candidate in source.candidates
+            ],
+            "categories": [
+                {"category": row.category, "policies": row.policies, "summary": self._summaries.get(row.digest)}
+                for row in rows
+            ],
+            "summaries_pending": pending,
+        })
+        etag, last_modified = versioned(body, self._snapshot)
+        return ComparisonSnapshot(
+            source=source,
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=6),
+            etag=etag,
+            last_modified=last_modified,
+            pending=pending,
+        )
+
+    async def _load_summaries(self, db: AsyncSession, rows: List[CategoryCells]) -> None:
+        # 현재 분야의 요약만 남기고, 메모리에 없는 요약은 DB에서 한 번에 조회
+        digests = {row.digest for row in rows}
+        self._summaries = {digest: summary for digest, summary in self._summaries.items() if digest in digests}
+        missing = [digest for digest in digests if digest not in self._summaries]
+        if not missing:
+            return
+        result = await db.execute(
+            select(ComparisonSummary.content_hash, ComparisonSummary.summary)
+            .where(ComparisonSummary.content_hash.in_(missing))
+        )
+        self._summaries.update(dict(result.all()))
+
+    def _schedule(self, source: CatalogSnapshot, rows: List[CategoryCells]) -> None:
+        now = time.monotonic()
+        digests = {row.digest for row in rows}
+        self._failed = {digest: failed_at for digest, failed_at in self._failed.items() if digest in digests}
+        todo = [
+            row for row in rows
+            if row.digest not in self._summaries and row.digest not in self._pending
+            and now - self._failed.get(row.digest, -SUMMARY_RETRY_INTERVAL) >= SUMMARY_RETRY_INTERVAL
+        ]
+        if not todo:
+            return
+        self._pending.update(row.digest for row in todo)
+        names = {candidate["id"]: candidate["name"] for candidate in source.candidates}
+        # 요청과 분리된 작업이므로 요청 로그/단계 기록(ContextVar)을 물려받지 않도록 빈 컨텍스트에서 실행
+        task = asyncio.create_task(self._summarize(todo, names), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, rows: List[CategoryCells], names: Dict[int, str]) -> None:
+        # LLM 부하를 늘리지 않도록 분야별로 하나씩 생성
+        for row in rows:
+            try:
+                pledges = [(names[candidate_id], row.policies[candidate_id]) for candidate_id in sorted(row.policies)]
+                summary = await summarize_category(row.category, pledges)
+                if summary is None:
+                    self._failed[row.digest] = time.monotonic()
+                    continue
+                self._failed.pop(row.digest, None)
+                self._summaries[row.digest] = summary
+                await self._store(row, summary)
+            except Exception as e:
+                logger.warning("비교 요약 저장 실패", extra={"fields": {"category": row.category, "error": type(e).__name__}})
+            finally:
+                self._pending.discard(row.digest)
+                # 다음 조회에서 새 요약(또는 생성 완료 상태)을 반영해 다시 직렬화
+                self._snapshot = None
+
+    async def _store(self, row: CategoryCells, summary: str) -> None:
+        async with SessionLocal() as db:
+            db.add(ComparisonSummary(content_hash=row.digest, category=row.category, summary=summary))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # 다른 워커가 같은 내용의 요약을 먼저 저장한 경우
+                await db.rollback()
+
+
+# 프로세스 전역 비교표
+comparison = ComparisonMatrix()
@@ -1,14 +1,83 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey
+from typing import Optional
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import Session, relationship
+
+from .config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_ECHO,
+)
+
+# 동기 드라이버 URL을 비동기 드라이버 URL로 변환
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    async_url = make_url(f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}")
+    # asyncpg에는 libpq의 sslmode 인자가 없으므로 같은 값을 받는 ssl 인자로 변환 (Render/Supabase의 ?sslmode=require)
+    if async_url.drivername == "postgresql+asyncpg" and "sslmode" in async_url.query:
+        sslmode = async_url.query["sslmode"]
+        async_url = async_url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return async_url.render_as_string(hide_password=False)
+
+def engine_options(url: str) -> dict:
+    options = {"echo": DB_ECHO}
+    # SQLite(aiosqlite)는 파일 DB에 NullPool, 메모리 DB에 StaticPool을 자동으로 사용
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    return options
 
-from .config import DATABASE_URL
+# 데이터베이스 엔진은 처음 사용할 때 생성 (import 시점에는 드라이버 로딩/접속을 하지 않음)
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+_engine: Optional[AsyncEngine] = None
 
-# 데이터베이스 엔진 생성
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        # 비동기 드라이버 + 커넥션 풀
+        _engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+    return _engine
+
+async def dispose_engine():
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+# 세션은 실제로 쿼리를 실행할 때 엔진을 가져오므로 SessionLocal()만으로는 엔진이 생성되지 않음
+class LazyBindSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        return get_engine().sync_engine
+
+SessionLocal = async_sessionmaker(class_=AsyncSession, sync_session_class=LazyBindSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+# 기존 코드/스크립트의 `from app.database import engine` 호환 (이 때 엔진 생성)
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # 데이터베이스 모델
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -30,10 +99,34 @@ class Policy(Base):
     description = Column(Text)
     candidate = relationship("Candidate", back_populates="policies")
 
+class DebateChunk(Base):
+    __tablename__ = "debate_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    speaker = Column(String(100), nullable=False, index=True)  # 발화자 (후보 이름을 포함하면 해당 후보로 연결)
+    date = Column(String(10))  # 방송일 (YYYY.MM.DD)
+    source = Column(String(255))
+    content = Column(Text, nullable=False)
+
+class ComparisonSummary(Base):
+    __tablename__ = "comparison_summaries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(40), nullable=False, unique=True)  # 분야 이름과 후보별 공약 내용의 해시 (공약이 바뀌면 새로 생성)
+    category = Column(String(100))
+    summary = Column(Text, nullable=False)
+
+# 테이블 생성 (python -m app.migrate 또는 DB_CREATE_TABLES=True일 때 앱 시작 시 실행)
+async def create_tables():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# 데이터베이스 접속 가능 여부 확인 (준비 상태 점검용)
+async def ping():
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
 # 데이터베이스 세션 가져오기
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
@@ -0,0 +1,331 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .config import (
+    OPENAI_API_KEY,
+    OPENAI_API_BASE,
+    LLM_PROVIDER,
+    LLM_MODEL,
+    EMBEDDING_MODEL,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BACKOFF,
+    FAKE_LLM_LATENCY,
+    FAKE_LLM_TOKEN_RATE,
+    FAKE_LLM_PREFILL_RATE,
+)
+from .telemetry import LLM_RETRIES, telemetry
+
+Messages = List[Dict[str, str]]
+T = TypeVar("T")
+
+
+class LLMError(Exception):
+    """재시도 후에도 LLM 호출에 실패한 경우 발생하는 예외"""
+
+
+class LLMRateLimitError(LLMError):
+    """재시도 후에도 업스트림이 rate limit(429)을 반환한 경우 발생하는 예외"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # 업스트림이 알려준 재시도 대기 시간(초)
+
+
+class BaseLLMClient(ABC):
+    """
+    비동기 LLM 클라이언트의 공통 로직
+
+    동시 요청 수 제한(세마포어), 요청당 타임아웃, 429/5xx 재시도를 담당하며
+    실제 호출은 하위 클래스의 `_complete`(일괄), `_stream`(스트리밍), `_embed`(임베딩)에서 구현합니다.
+    재시도 전 백오프 동안에는 슬롯을 반납해 다른 요청이 먼저 진행할 수 있게 합니다.
+    임베딩은 별도 세마포어를 사용해, 긴 스트리밍 답변이 슬롯을 모두 차지해도 캐시 조회용 임베딩이 기다리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_backoff: float = LLM_RETRY_BACKOFF,
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._embed_semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def chat(self, messages: Messages, max_tokens: int = 1000, temperature: float = 0.7) -> str:
+        """
+        채팅 완성을 요청하고 응답 텍스트를 반환하는 함수
+
+        Args:
+            messages: OpenAI 형식의 메시지 목록
+            max_tokens: 최대 생성 토큰 수
+            temperature: 샘플링 온도
+
+        Returns:
+            str: 생성된 응답 텍스트
+        """
+        return await self._call(lambda: self._complete(messages, max_tokens, temperature))
+
+    async def stream_chat(
+        self, messages: Messages, max_tokens: int = 1000, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        채팅 완성을 스트리밍으로 요청하고 토큰 조각을 도착하는 대로 반환하는 비동기 제너레이터
+
+        첫 토큰이 도착하기 전의 실패만 재시도하며, 토큰 사이의 대기에도 타임아웃이 적용됩니다.
+
+        Args:
+            messages: OpenAI 형식의 메시지 목록
+            max_tokens: 최대 생성 토큰 수
+            temperature: 샘플링 온도
+
+        Yields:
+            str: 응답 텍스트 조각
+        """
+        attempt = 0
+        while True:
+            async with self._slot():
+                stream = self._stream(messages, max_tokens, temperature)
+                started = False
+                try:
+                    while True:
+                        try:
+                            delta = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        if delta:
+                            yield delta
+                except Exception as e:
+                    if started or attempt >= self.max_retries or not self._is_retryable(e):
+                        raise self._final_error(e) from e
+                    LLM_RETRIES.inc(error=type(e).__name__)
+                finally:
+                    await stream.aclose()
+            # 백오프는 슬롯 밖에서 기다림
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        텍스트 임베딩 벡터를 반환하는 함수 (타임아웃/재시도는 `chat`과 같고, 동시성 제한은 채팅과 별도)
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            List[float]: 임베딩 벡터
+        """
+        return await self._call(lambda: self._embed(text), self._embed_semaphore)
+
+    async def _call(self, factory: Callable[[], Awaitable[T]], semaphore: Optional[asyncio.Semaphore] = None) -> T:
+        # 세마포어 안에서 타임아웃을 걸어 호출하고, 재시도 가능한 오류면 슬롯을 반납한 채 백오프 후 다시 시도
+        attempt = 0
+        while True:
+            async with self._slot(semaphore):
+                try:
+                    return await asyncio.wait_for(factory(), timeout=self.timeout)
+                except Exception as e:
+                    if attempt >= self.max_retries or not self._is_retryable(e):
+                        raise self._final_error(e) from e
+                    LLM_RETRIES.inc(error=type(e).__name__)
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    @asynccontextmanager
+    async def _slot(self, semaphore: Optional[asyncio.Semaphore] = None):
+        # 동시 요청 수 제한에 걸려 기다린 시간을 llm_queue 단계로 기록 (기본은 채팅 세마포어)
+        start = time.perf_counter()
+        async with semaphore or self._semaphore:
+            telemetry.record("llm_queue", time.perf_counter() - start)
+            yield
+
+    @abstractmethod
+    async def _complete(self, messages: Messages, max_tokens: int, temperature: float) -> str:
+        """채팅 완성 1회 호출 (재시도/타임아웃은 공통 로직에서 처리)"""
+
+    @abstractmethod
+    async def _embed(self, text: str) -> List[float]:
+        """임베딩 1회 호출"""
+
+    @abstractmethod
+    def _stream(self, messages: Messages, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """스트리밍 채팅 완성 1회 호출 (비동기 제너레이터로 구현)"""
+
+    def _is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, asyncio.TimeoutError)
+
+    def _rate_limit_retry_after(self, error: Exception) -> Optional[float]:
+        """rate limit 오류이면 재시도 대기 시간(모르면 0), 아니면 None"""
+        return None
+
+    def _final_error(self, error: Exception) -> LLMError:
+        message = str(error) or type(error).__name__
+        retry_after = self._rate_limit_retry_after(error)
+        if retry_after is not None:
+            return LLMRateLimitError(message, retry_after or None)
+        return LLMError(message)
+
+    def _backoff(self, attempt: int) -> float:
+        # 지수 백오프 + 지터
+        delay = self.retry_backoff * (2 ** attempt)
+        return delay + random.uniform(0, delay)
+
+
+class OpenAIClient(BaseLLMClient):
+    """
+    openai SDK의 비동기 API(`acreate`)를 사용하는 클라이언트
+
+    openai SDK는 불러오는 데 시간이 오래 걸리므로 모듈 import 시점이 아니라 클라이언트를 처음 만들 때 불러옵니다.
+    """
+
+    def __init__(self, model: str = LLM_MODEL, embedding_model: str = EMBEDDING_MODEL, **kwargs):
+        super().__init__(**kwargs)
+        import openai
+
+        # OpenAI API 키 설정
+        openai.api_key = OPENAI_API_KEY
+        if OPENAI_API_BASE:
+            openai.api_base = OPENAI_API_BASE
+        self.openai = openai
+        self.model = model
+        self.embedding_model = embedding_model
+
+    async def _complete(self, messages: Messages, max_tokens: int, temperature: float) -> str:
+        response = await self.openai.ChatCompletion.acreate(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        return response.choices[0].message["content"].strip()
+
+    async def _stream(self, messages: Messages, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        response = await self.openai.ChatCompletion.acreate(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk.choices[0].delta.get("content", "")
+
+    async def _embed(self, text: str) -> List[float]:
+        response = await self.openai.Embedding.acreate(model=self.embedding_model, input=text)
+        return response["data"][0]["embedding"]
+
+    def _is_retryable(self, error: Exception) -> bool:
+        errors = self.openai.error
+        if isinstance(error, (
+            asyncio.TimeoutError,
+            errors.RateLimitError,
+            errors.ServiceUnavailableError,
+            errors.APIConnectionError,
+            errors.Timeout,
+        )):
+            return True
+        if isinstance(error, errors.APIError):
+            status = getattr(error, "http_status", None)
+            return status is None or status >= 500
+        return False
+
+    def _rate_limit_retry_after(self, error: Exception) -> Optional[float]:
+        if not isinstance(error, self.openai.error.RateLimitError):
+            return None
+        headers = getattr(error, "headers", None) or {}
+        value = next((value for name, value in headers.items() if name.lower() == "retry-after"), 0)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+
+class FakeLLMClient(BaseLLMClient):
+    """
+    로컬 부하 테스트용 가짜 LLM 클라이언트
+
+    외부 API를 호출하지 않고 질문을 바탕으로 만든 고정 답변을 반환합니다.
+    첫 토큰까지 `latency`초, 이후 초당 `token_rate`개의 속도로 토큰을 생성하는 것처럼 동작합니다.
+    `prefill_rate`를 지정하면 프롬프트 길이에 비례한 처리 시간이 첫 토큰 지연에 더해집니다.
+    """
+
+    def __init__(
+        self,
+        latency: float = FAKE_LLM_LATENCY,
+        token_rate: float = FAKE_LLM_TOKEN_RATE,
+        prefill_rate: float = FAKE_LLM_PREFILL_RATE,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.token_rate = token_rate
+        self.prefill_rate = prefill_rate
+        self.calls = 0
+
+    async def _complete(self, messages: Messages, max_tokens: int, temperature: float) -> str:
+        return "".join([token async for token in self._stream(messages, max_tokens, temperature)]).strip()
+
+    async def _stream(self, messages: Messages, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        self.calls += 1
+        delay = self.latency
+        if self.prefill_rate > 0:
+            prompt_bytes = sum(len(message["content"].encode("utf-8")) for message in messages)
+            delay += prompt_bytes / 4 / self.prefill_rate
+        await asyncio.sleep(delay)
+        tokens = self._answer(messages).split(" ")[:max_tokens]
+        for i, token in enumerate(tokens):
+            if i > 0 and self.token_rate > 0:
+                await asyncio.sleep(1 / self.token_rate)
+            yield token if i == 0 else " " + token
+
+    async def _embed(self, text: str) -> List[float]:
+        # 문자 bigram 해시 벡터 (외부 호출 없이 비슷한 문장이 비슷한 벡터를 갖도록)
+        vector = [0.0] * 256
+        compact = "".join(text.split())
+        for i in range(len(compact) - 1):
+            digest = hashlib.md5(compact[i:i + 2].encode("utf-8")).digest()
+            vector[digest[0]] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def _answer(self, messages: Messages) -> str:
+        question = messages[-1]["content"].strip().splitlines()[-1].strip().removeprefix("질문:").strip() if messages else ""
+        return f"[fake] {question}에 대한 답변입니다."
+
+
+_client: Optional[BaseLLMClient] = None
+
+
+def create_llm_client(provider: str = LLM_PROVIDER, **kwargs) -> BaseLLMClient:
+    """설정된 provider에 맞는 LLM 클라이언트를 생성하는 함수"""
+    if provider == "fake":
+        return FakeLLMClient(**kwargs)
+    if provider == "openai":
+        return OpenAIClient(**kwargs)
+    raise ValueError(f"지원하지 않는 LLM provider입니다: {provider}")
+
+
+def get_llm_client() -> BaseLLMClient:
+    """프로세스 전역 LLM 클라이언트를 반환하는 함수"""
+    global _client
+    if _client is None:
+        _client = create_llm_client()
+    return _client
+
+
+def set_llm_client(client: Optional[BaseLLMClient]) -> None:
+    """전역 LLM 클라이언트를 교체하는 함수 (테스트/벤치마크용)"""
+    global _client
+    _client = client
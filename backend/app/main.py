@@ -1,19 +1,29 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import json
 import os
+import time
 
-from .config import APP_NAME, VERSION, DEBUG
-from .database import get_db, engine, Base, Candidate, Policy
+from .config import APP_NAME, VERSION, DEBUG, DB_CREATE_TABLES, READINESS_TIMEOUT
+from .database import get_db, create_tables, dispose_engine, ping, SessionLocal, Candidate, DebateChunk, Policy
 from .schemas import Candidate as CandidateSchema
 from .schemas import Policy as PolicySchema
-from .schemas import CandidateCreate, PolicyCreate, ChatRequest, ChatResponse
-from .ai import get_ai_response
+from .schemas import DebateChunk as DebateChunkSchema
+from .schemas import CandidateCreate, PolicyCreate, DebateChunkCreate, DebateSearchResult, ChatRequest, ChatResponse, Comparison
+from .ai import collect_response, response_events, stream_ai_response
+from .cache import answer_cache
+from .retrieval import debate_retriever, policy_retriever
+from .catalog import catalog, conditional_response, render
+from .comparison import comparison
+from .singleflight import SingleFlight
+from .admission import Overloaded, chat_admission, chat_rate_limiter, read_admission
+from .telemetry import CHAT_REQUESTS, REGISTRY, TelemetryMiddleware, telemetry
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
 
 # 허용할 오리진 리스트
 origins = [
@@ -24,11 +34,21 @@ origins = [
     "http://localhost:3000",
 ]
 
+# 앱 시작/종료 처리 (import 시점에는 DB 접속이나 외부 SDK 로딩을 하지 않음)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 테이블 생성은 python -m app.migrate로 별도 실행하고, 개발 환경에서만 DB_CREATE_TABLES=True로 시작 시 실행
+    if DB_CREATE_TABLES:
+        await create_tables()
+    yield
+    await dispose_engine()
+
 # FastAPI 앱 생성 시 직접 CORS 설정 추가
 app = FastAPI(
     title=APP_NAME,
     version=VERSION,
-    debug=DEBUG
+    debug=DEBUG,
+    lifespan=lifespan,
 )
 
 # CORS 미들웨어 설정
@@ -42,6 +62,26 @@ app.add_middleware(
     max_age=86400,  # 프리플라이트 요청 캐시 시간(초)
 )
 
+# 요청별 처리 시간 기록 및 구조화 로그
+app.add_middleware(TelemetryMiddleware)
+
+# 입장 제어로 거절된 요청은 기다리지 않고 429와 Retry-After로 응답
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", "reason": exc.reason},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+# 조회 엔드포인트는 채팅과 별도의 슬롯을 사용 (채팅이 포화되어도 조회는 대기하지 않음)
+async def read_slot():
+    await read_admission.acquire()
+    try:
+        yield
+    finally:
+        read_admission.release()
+
 # 프리플라이트 요청에 대한 전용 엔드포인트 (루트 레벨)
 @app.options("/{rest_of_path:path}")
 async def options_route(rest_of_path: str, request: Request):
@@ -60,66 +100,216 @@ async def options_route(rest_of_path: str, request: Request):
 async def root():
     return {"message": "AlgoVote API에 오신 것을 환영합니다!"}
 
-# 후보자 관련 엔드포인트
-@app.get("/candidates/", response_model=List[CandidateSchema])
-async def read_candidates(db: Session = Depends(get_db)):
-    candidates = db.query(Candidate).all()
-    return candidates
+# 준비 상태 엔드포인트 (DB에 접속할 수 없으면 503, 로드밸런서/오케스트레이터의 readiness probe용)
+@app.get("/ready")
+async def ready():
+    try:
+        await asyncio.wait_for(ping(), READINESS_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": type(e).__name__})
+    return {"status": "ready", "database": "ok"}
+
+# 후보자/정책 변경 시 이를 바탕으로 만든 캐시와 색인을 무효화 (비교표 요약은 내용이 바뀐 분야만 다시 생성)
+def invalidate_derived_data():
+    answer_cache.invalidate()
+    policy_retriever.invalidate()
+    debate_retriever.invalidate()
+    catalog.invalidate()
+    comparison.invalidate()
 
-@app.get("/candidates/{candidate_id}", response_model=CandidateSchema)
-async def read_candidate(candidate_id: int, db: Session = Depends(get_db)):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+# 후보자 관련 엔드포인트 (조회는 카탈로그 스냅샷에서 응답, 변경이 없으면 304)
+@app.get("/candidates/", response_model=List[CandidateSchema], dependencies=[Depends(read_slot)])
+async def read_candidates(request: Request, db: AsyncSession = Depends(get_db)):
+    snapshot = await catalog.get(db)
+    return conditional_response(request, snapshot, snapshot.candidates_body)
+
+@app.get("/candidates/{candidate_id}", response_model=CandidateSchema, dependencies=[Depends(read_slot)])
+async def read_candidate(candidate_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    snapshot = await catalog.get(db)
+    candidate = snapshot.candidates_by_id.get(candidate_id)
     if candidate is None:
         raise HTTPException(status_code=404, detail="후보자를 찾을 수 없습니다")
-    return candidate
+    return conditional_response(request, snapshot, render(candidate))
 
 @app.post("/candidates/", response_model=CandidateSchema)
-async def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
-    db_candidate = Candidate(**candidate.dict())
+async def create_candidate(candidate: CandidateCreate, db: AsyncSession = Depends(get_db)):
+    db_candidate = Candidate(**candidate.dict(), policies=[])
     db.add(db_candidate)
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    invalidate_derived_data()
     return db_candidate
 
 # 정책 관련 엔드포인트
-@app.get("/policies/", response_model=List[PolicySchema])
-async def read_policies(candidate_id: Optional[int] = None, db: Session = Depends(get_db)):
-    policies = db.query(Policy)
+@app.get("/policies/", response_model=List[PolicySchema], dependencies=[Depends(read_slot)])
+async def read_policies(request: Request, candidate_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    snapshot = await catalog.get(db)
     if candidate_id:
-        policies = policies.filter(Policy.candidate_id == candidate_id)
-    return policies.all()
+        body = render(snapshot.policies_by_candidate.get(candidate_id, []))
+    else:
+        body = snapshot.policies_body
+    return conditional_response(request, snapshot, body)
 
 @app.post("/policies/", response_model=PolicySchema)
-async def create_policy(policy: PolicyCreate, candidate_id: int, db: Session = Depends(get_db)):
+async def create_policy(policy: PolicyCreate, candidate_id: int, db: AsyncSession = Depends(get_db)):
     db_policy = Policy(**policy.dict(), candidate_id=candidate_id)
     db.add(db_policy)
-    db.commit()
-    db.refresh(db_policy)
+    await db.commit()
+    invalidate_derived_data()
     return db_policy
 
+# 후보 비교표 (후보자 × 정책 분야, 미리 만들어 압축한 응답 하나로 제공, 변경이 없으면 304)
+@app.get("/comparison/", response_model=Comparison, dependencies=[Depends(read_slot)])
+async def read_comparison(request: Request, db: AsyncSession = Depends(get_db)):
+    snapshot = await comparison.get(db)
+    return conditional_response(request, snapshot, snapshot.body, snapshot.gzip_body)
+
+# 토론 발화 관련 엔드포인트 (preprocess/chunking.py로 만든 화자 단위 청크를 일괄 등록)
+@app.post("/debates/", response_model=List[DebateChunkSchema])
+async def create_debate_chunks(chunks: List[DebateChunkCreate], db: AsyncSession = Depends(get_db)):
+    db_chunks = [DebateChunk(**chunk.dict()) for chunk in chunks]
+    db.add_all(db_chunks)
+    await db.commit()
+    debate_retriever.invalidate()
+    return db_chunks
+
+# 후보를 지정하면 해당 후보의 발화 색인에서만 검색
+@app.get("/debates/search", response_model=List[DebateSearchResult], dependencies=[Depends(read_slot)])
+async def search_debates(
+    q: str,
+    candidate_id: Optional[List[int]] = Query(None),
+    k: Optional[int] = Query(None, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await debate_retriever.search(db, q, candidate_id, k)
+    return [
+        DebateSearchResult(
+            **DebateChunkSchema.model_validate(chunk).model_dump(),
+            candidate_id=chunk_candidate_id,
+            score=score,
+        )
+        for chunk, chunk_candidate_id, score in results
+    ]
+
+# 스트리밍 이벤트를 NDJSON(한 줄에 JSON 하나)으로 직렬화 (직렬화 시간은 스트림이 끝날 때 한 번에 기록)
+async def ndjson_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    elapsed = 0.0
+    async for event in events:
+        start = time.perf_counter()
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        elapsed += time.perf_counter() - start
+        yield line
+    telemetry.record("serialize", elapsed)
+
+def streaming_response(events: AsyncIterator[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    return StreamingResponse(
+        ndjson_stream(events),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+    )
+
+# 동일 질문의 동시 요청은 업스트림 호출 1건을 함께 구독
+chat_flights = SingleFlight()
+
+# 업스트림 호출 1건: 관련 정책 검색 후 토큰을 생성하고, 완료된 답변을 캐시에 저장
+# (version: 캐시 조회 시점의 데이터 버전, 생성 중에 데이터가 바뀌면 저장하지 않음)
+async def upstream_ai_events(
+    request: ChatRequest, embedding: Optional[List[float]] = None, version: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    # 새 업스트림 호출만 채팅 슬롯을 사용하고(캐시 적중/합류한 요청은 슬롯 없이 처리), 대기 기한을 넘기면 Overloaded
+    await chat_admission.acquire()
+    try:
+        # 요청과 분리된 작업에서 실행되므로 요청 세션 대신 별도 세션으로 검색 (match_count개, 토큰 예산 이내)
+        async with SessionLocal() as db:
+            policies = await policy_retriever.retrieve(db, request.question, request.candidate_ids, request.match_count)
+        
+        related_policies = []
+        async for event in stream_ai_response(request.question, policies):
+            if event["type"] == "policies":
+                related_policies = event["related_policies"]
+            elif event["type"] == "done":
+                response = ChatResponse(answer=event["answer"], related_policies=related_policies)
+                await answer_cache.set(
+                    request.question, request.candidate_ids, response, embedding,
+                    match_count=match_count(request), version=version,
+                )
+            yield event
+    finally:
+        chat_admission.release()
+
+# 캐시/합류 키에 쓰는 실제 관련 정책 수 (match_count 미지정 요청과 기본값을 지정한 요청은 같은 키)
+def match_count(request: ChatRequest) -> int:
+    return policy_retriever.limit(request.match_count)
+
+# 채팅 요청 처리 경로(cache, coalesced, upstream)를 카운터와 요청 로그에 기록
+def count_chat_request(source: str, request: ChatRequest) -> None:
+    CHAT_REQUESTS.inc(source=source, stream=str(request.stream).lower())
+    telemetry.annotate(source=source, stream=request.stream)
+
+# 같은 질문의 진행 중인 호출에 합류해(없으면 시작) 이벤트를 전달 (embedding/version: 캐시 조회에 사용한 질문 임베딩/데이터 버전)
+async def shared_ai_events(
+    request: ChatRequest, embedding: Optional[List[float]] = None, version: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    key = answer_cache.make_key(request.question, request.candidate_ids, match_count(request), version)
+    flight = chat_flights.join(key, lambda: upstream_ai_events(request, embedding, key[-1]))
+    count_chat_request("coalesced" if flight.followers else "upstream", request)
+    async for event in flight.subscribe():
+        yield event
+
+# 캐시 적중 시 저장된 답변을, 아니면 공유 호출의 이벤트를 전달
+async def cached_ai_events(request: ChatRequest) -> AsyncIterator[Dict[str, Any]]:
+    version = answer_cache.data_version
+    with telemetry.stage("cache"):
+        cached, embedding = await answer_cache.lookup(request.question, request.candidate_ids, match_count(request))
+    if cached is not None:
+        count_chat_request("cache", request)
+        async for event in response_events(cached):
+            yield event
+        return
+    
+    async for event in shared_ai_events(request, embedding, version):
+        yield event
+
+# 첫 이벤트가 나온 뒤에 스트리밍 응답을 시작해, 입장 제어로 거절되면 스트림 대신 429로 응답
+async def started_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    first = await events.__anext__()
+
+    async def chained() -> AsyncIterator[Dict[str, Any]]:
+        yield first
+        async for event in events:
+            yield event
+    return chained()
+
+# 클라이언트별 채팅 요청 빈도 제한 (CHAT_RATE_LIMIT_HEADER를 지정하면 그 헤더 값으로 클라이언트 구분)
+def check_rate_limit(http_request: Request) -> None:
+    chat_rate_limiter.check(chat_rate_limiter.client(http_request))
+
+# 일괄 응답 버전: 같은 이벤트를 끝까지 받아 하나의 응답으로 합침
+async def cached_ai_response(request: ChatRequest) -> ChatResponse:
+    version = answer_cache.data_version
+    with telemetry.stage("cache"):
+        cached, embedding = await answer_cache.lookup(request.question, request.candidate_ids, match_count(request))
+    if cached is not None:
+        count_chat_request("cache", request)
+        return cached
+    
+    return await collect_response(shared_ai_events(request, embedding, version))
+
 # 챗봇 엔드포인트
 @app.post("/chat/", response_model=ChatResponse)
-async def chat(request: ChatRequest, db: Session = Depends(get_db)):
-    # 관련 정책 가져오기
-    policies = []
-    if request.candidate_ids:
-        policies = db.query(Policy).filter(Policy.candidate_id.in_(request.candidate_ids)).all()
+async def chat(request: ChatRequest, http_request: Request):
+    check_rate_limit(http_request)
+    # 스트리밍 요청이면 토큰을 도착하는 대로 전달
+    if request.stream:
+        return streaming_response(await started_events(cached_ai_events(request)))
     
-    # AI 응답 생성
-    response = await get_ai_response(request.question, policies)
-    return response
+    response = await cached_ai_response(request)
+    with telemetry.stage("serialize"):
+        return JSONResponse(content=response.model_dump())
 
 # 새로운 API 엔드포인트 - /api/question
 @app.post("/api/question")
-async def answer_question(request: ChatRequest, db: Session = Depends(get_db)):
-    # 관련 정책 가져오기
-    policies = []
-    if request.candidate_ids:
-        policies = db.query(Policy).filter(Policy.candidate_id.in_(request.candidate_ids)).all()
-    
-    # AI 응답 생성
-    response = await get_ai_response(request.question, policies)
-    
+async def answer_question(request: ChatRequest, http_request: Request):
+    check_rate_limit(http_request)
     # CORS 헤더 추가
     headers = {
         "Access-Control-Allow-Origin": "*",
@@ -127,7 +317,33 @@ async def answer_question(request: ChatRequest, db: Session = Depends(get_db)):
         "Access-Control-Allow-Headers": "*",
     }
     
-    return JSONResponse(content=response.dict(), headers=headers)
+    # 스트리밍 요청이면 토큰을 도착하는 대로 전달
+    if request.stream:
+        return streaming_response(await started_events(cached_ai_events(request)), headers)
+    
+    response = await cached_ai_response(request)
+    
+    with telemetry.stage("serialize"):
+        return JSONResponse(content=response.dict(), headers=headers)
+
+# 답변 캐시 및 동시 요청 합치기 통계
+@app.get("/cache/stats")
+async def cache_stats():
+    return {**answer_cache.snapshot(), "coalescing": chat_flights.snapshot()}
+
+# 입장 제어 상태 (워커 프로세스별)
+@app.get("/admission/stats")
+async def admission_stats():
+    return {
+        "chat": chat_admission.snapshot(),
+        "read": read_admission.snapshot(),
+        "rate_limit": chat_rate_limiter.snapshot(),
+    }
+
+# Prometheus 형식 지표 (워커 프로세스별)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,23 @@
+"""
+데이터베이스 테이블 생성 스크립트
+
+앱 시작과 분리해 배포 시 한 번 실행합니다.
+
+실행:
+    python -m app.migrate
+"""
+import asyncio
+
+from .database import ASYNC_DATABASE_URL, create_tables, dispose_engine
+
+
+async def migrate() -> None:
+    try:
+        await create_tables()
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
+    print(f"테이블 생성 완료: {ASYNC_DATABASE_URL.split('@')[-1]}")
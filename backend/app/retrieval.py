@@ -0,0 +1,314 @@
+import asyncio
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from .catalog import CatalogSnapshot, catalog
+from .config import DEBATE_TOP_K, RETRIEVAL_TOP_K, RETRIEVAL_TOKEN_BUDGET
+from .database import DebateChunk, Policy
+from .telemetry import telemetry
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색용 토큰화 함수
+
+    한국어는 조사/어미가 붙어 단어가 그대로 일치하지 않는 경우가 많으므로
+    공백 단위 단어와 함께 글자 bigram을 토큰으로 사용합니다. ("부동산은" ↔ "부동산")
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """LLM 토큰 수 근사치 (UTF-8 4바이트당 1토큰, 한국어는 대략 글자당 0.75토큰)"""
+    return math.ceil(len((text or "").encode("utf-8")) / 4)
+
+
+@dataclass
+class CorpusStats:
+    """BM25 점수 계산에 쓰는 말뭉치 전체 통계 (문서 빈도, 문서 수, 전체 길이)"""
+
+    document_frequency: Counter = field(default_factory=Counter)
+    documents: int = 0
+    total_length: int = 0
+
+
+class BM25Index:
+    """
+    프로세스 내 BM25 역색인
+
+    문서마다 임의의 메타데이터 키(`group`)를 함께 저장해 검색 전에 범위를 좁힐 수 있습니다.
+    (예: 후보 ID로 필터링한 뒤 해당 후보의 문서만 점수 계산)
+    여러 색인이 `stats`를 공유하면 IDF와 평균 문서 길이를 말뭉치 전체 기준으로 계산하므로
+    색인별 검색 결과의 점수를 서로 비교할 수 있습니다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, stats: Optional[CorpusStats] = None):
+        self.k1 = k1
+        self.b = b
+        self.stats = stats if stats is not None else CorpusStats()
+        self._postings: Dict[str, Dict[Hashable, int]] = defaultdict(dict)
+        self._lengths: Dict[Hashable, int] = {}
+        self._groups: Dict[Hashable, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: Hashable, text: str, group: Hashable = None) -> None:
+        tokens = tokenize(text)
+        for token, count in Counter(tokens).items():
+            self._postings[token][doc_id] = count
+            self.stats.document_frequency[token] += 1
+        self._lengths[doc_id] = len(tokens)
+        self._groups[doc_id] = group
+        self.stats.documents += 1
+        self.stats.total_length += len(tokens)
+
+    def search(self, query: str, k: int, groups: Optional[Iterable[Hashable]] = None) -> List[Tuple[Hashable, float]]:
+        """
+        질문과 관련도가 높은 문서를 점수 순으로 반환하는 함수
+
+        Args:
+            query: 검색 질문
+            k: 반환할 최대 문서 수
+            groups: 검색 대상 그룹 (None이면 전체)
+
+        Returns:
+            List[Tuple]: (문서 ID, BM25 점수) 목록
+        """
+        if not self._lengths or k <= 0:
+            return []
+
+        allowed = set(groups) if groups is not None else None
+        total = self.stats.documents
+        avg_length = self.stats.total_length / total or 1.0
+        scores: Dict[Hashable, float] = defaultdict(float)
+
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            frequency = self.stats.document_frequency[token]
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for doc_id, freq in postings.items():
+                if allowed is not None and self._groups[doc_id] not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+
+def policy_text(policy: Dict[str, Any], candidate: Dict[str, Any]) -> str:
+    # 질문에 후보 이름/정당이 들어가면("홍길동 후보(OO당)의 공약...") 해당 후보의 정책이 우선 검색되도록 함께 색인
+    return " ".join(filter(None, [
+        candidate["name"], candidate["party"], policy["title"], policy["category"], policy["description"],
+    ]))
+
+
+class PolicyRetriever:
+    """
+    질문과 관련된 정책만 골라 프롬프트에 넣기 위한 검색기
+
+    카탈로그 스냅샷의 후보자/정책으로 BM25 색인을 만들고, 스냅샷 내용(ETag)이 바뀌면 다시 만듭니다.
+    카탈로그는 `CATALOG_TTL`마다 다시 읽으므로 다른 워커에서 등록한 정책도 그 안에 반영됩니다.
+    후보를 지정한 질문이 어떤 정책과도 일치하지 않으면 해당 후보의 정책을 순서대로 넣습니다.
+    """
+
+    def __init__(self, top_k: int = RETRIEVAL_TOP_K, token_budget: int = RETRIEVAL_TOKEN_BUDGET):
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self._index: Optional[BM25Index] = None
+        self._token_counts: Dict[int, int] = {}
+        self._policy_ids: Dict[int, List[int]] = {}  # 후보 ID -> 정책 ID 목록 (검색 결과가 없을 때 사용)
+        self._etag: Optional[str] = None
+
+    def limit(self, match_count: Optional[int] = None) -> int:
+        """요청의 match_count를 실제 검색할 정책 수로 바꾸는 함수 (미지정 시 기본값)"""
+        return match_count if match_count is not None else self.top_k
+
+    def invalidate(self) -> None:
+        self._index = None
+        self._etag = None
+
+    def build(self, source: CatalogSnapshot) -> BM25Index:
+        index = BM25Index()
+        token_counts, policy_ids = {}, {}
+        with telemetry.stage("index_build"):
+            for candidate in source.candidates:
+                policy_ids[candidate["id"]] = [policy["id"] for policy in candidate["policies"]]
+                for policy in candidate["policies"]:
+                    text = policy_text(policy, candidate)
+                    index.add(policy["id"], text, group=candidate["id"])
+                    token_counts[policy["id"]] = estimate_tokens(text)
+        self._index, self._token_counts, self._policy_ids = index, token_counts, policy_ids
+        self._etag = source.etag
+        return index
+
+    async def retrieve(
+        self,
+        db: AsyncSession,
+        question: str,
+        candidate_ids: Optional[Sequence[int]] = None,
+        match_count: Optional[int] = None,
+    ) -> List[Policy]:
+        """
+        질문과 관련된 정책을 토큰 예산 안에서 최대 `match_count`개 반환하는 함수
+
+        Args:
+            db: 데이터베이스 세션
+            question: 사용자 질문
+            candidate_ids: 검색 대상 후보 ID 목록 (None이면 전체 후보)
+            match_count: 반환할 최대 정책 수 (None이면 기본값)
+
+        Returns:
+            List[Policy]: 관련도 순으로 정렬된 정책 목록
+        """
+        source = await catalog.get(db)
+        index = self._index
+        if index is None or self._etag != source.etag:
+            index = self.build(source)
+        token_counts = self._token_counts
+        k = self.limit(match_count)
+        with telemetry.stage("retrieval"):
+            ranked = [policy_id for policy_id, _ in index.search(question, k, groups=candidate_ids or None)]
+            if not ranked and candidate_ids:
+                # 일치하는 정책이 없으면 지정한 후보들의 정책을 번갈아 k개까지
+                per_candidate = [self._policy_ids.get(candidate_id, []) for candidate_id in dict.fromkeys(candidate_ids)]
+                ranked = [policy_id for policy_id in chain.from_iterable(zip_longest(*per_candidate)) if policy_id is not None][:k]
+
+            selected, used = [], 0
+            for policy_id in ranked:
+                tokens = token_counts.get(policy_id, 0)
+                # 가장 관련도 높은 정책은 예산을 넘더라도 포함
+                if selected and used + tokens > self.token_budget:
+                    continue
+                selected.append(policy_id)
+                used += tokens
+
+        if not selected:
+            return []
+        # 프롬프트에 후보 이름이 필요하므로 후보자를 함께 로딩
+        query = select(Policy).options(selectinload(Policy.candidate)).where(Policy.id.in_(selected))
+        with telemetry.stage("db"):
+            policies = {policy.id: policy for policy in (await db.scalars(query)).all()}
+        return [policies[policy_id] for policy_id in selected if policy_id in policies]
+
+
+def speaker_candidate(speaker: str, candidates: Sequence[Dict[str, Any]]) -> Optional[int]:
+    """발화자 표기('홍길동 후보' 등)에 이름이 포함된 후보의 ID를 찾는 함수 (여럿이면 가장 긴 이름)"""
+    matched = [candidate for candidate in candidates if candidate["name"] and candidate["name"] in speaker]
+    if not matched:
+        return None
+    return max(matched, key=lambda candidate: len(candidate["name"]))["id"]
+
+
+class DebateRetriever:
+    """
+    토론 발화 청크 검색기
+
+    청크를 발화자에 해당하는 후보별로 나눠 후보마다 별도의 BM25 색인을 만듭니다.
+    후보를 지정한 검색은 해당 후보의 색인만 점수를 계산하므로, 전체 청크를 훑은 뒤 걸러내는 방식보다
+    검색 범위가 후보 수만큼 줄어듭니다. 후보가 아닌 발화자(사회자 등)의 청크는 None 색인에 들어갑니다.
+    후보별 색인은 말뭉치 통계를 공유하므로 여러 후보를 검색해 합친 결과도 같은 기준의 점수로 정렬됩니다.
+
+    색인은 카탈로그 스냅샷마다 다시 만듭니다. 카탈로그는 `CATALOG_TTL`마다 다시 읽으므로
+    다른 워커에서 등록한 청크와 후보도 그 안에 반영됩니다.
+    """
+
+    def __init__(self, top_k: int = DEBATE_TOP_K):
+        self.top_k = top_k
+        self._indexes: Optional[Dict[Optional[int], BM25Index]] = None
+        self._source: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._indexes = None
+        self._source = None
+        self._generation += 1
+
+    async def build(self, db: AsyncSession, source: CatalogSnapshot) -> Dict[Optional[int], BM25Index]:
+        generation = self._generation
+        stats = CorpusStats()
+        indexes: Dict[Optional[int], BM25Index] = defaultdict(lambda: BM25Index(stats=stats))
+        with telemetry.stage("index_build"):
+            for chunk in (await db.scalars(select(DebateChunk))).all():
+                candidate_id = speaker_candidate(chunk.speaker, source.candidates)
+                indexes[candidate_id].add(chunk.id, chunk.content, group=candidate_id)
+        indexes = dict(indexes)
+        # 조회하는 동안 데이터가 바뀌었으면 이번 색인은 이번 요청에만 사용
+        if generation == self._generation:
+            self._indexes, self._source = indexes, source
+        return indexes
+
+    async def get(self, db: AsyncSession) -> Dict[Optional[int], BM25Index]:
+        """현재 카탈로그 스냅샷에 맞는 후보별 색인을 반환하는 함수 (스냅샷이 바뀌었으면 다시 생성)"""
+        source = await catalog.get(db)
+        if self._indexes is not None and self._source is source:
+            return self._indexes
+        # 동시에 들어온 요청이 모두 색인을 만들지 않도록 하나만 생성
+        async with self._lock:
+            if self._indexes is not None and self._source is source:
+                return self._indexes
+            return await self.build(db, source)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        candidate_ids: Optional[Sequence[int]] = None,
+        k: Optional[int] = None,
+    ) -> List[Tuple[DebateChunk, Optional[int], float]]:
+        """
+        질문과 관련된 토론 발화 청크를 점수 순으로 반환하는 함수
+
+        Args:
+            db: 데이터베이스 세션
+            query: 검색 질문
+            candidate_ids: 검색 대상 후보 ID 목록 (None이면 전체 발화자)
+            k: 반환할 최대 청크 수 (None이면 기본값)
+
+        Returns:
+            List[Tuple]: (청크, 후보 ID, BM25 점수) 목록
+        """
+        indexes = await self.get(db)
+        k = k if k is not None else self.top_k
+        keys = list(dict.fromkeys(candidate_ids)) if candidate_ids else list(indexes)
+
+        ranked = []
+        for key in keys:
+            index = indexes.get(key)
+            if index is not None:
+                ranked.extend((doc_id, key, score) for doc_id, score in index.search(query, k))
+        ranked.sort(key=lambda item: item[2], reverse=True)
+        ranked = ranked[:k]
+
+        if not ranked:
+            return []
+        query_ids = [doc_id for doc_id, _, _ in ranked]
+        chunks = {chunk.id: chunk for chunk in (await db.scalars(select(DebateChunk).where(DebateChunk.id.in_(query_ids)))).all()}
+        return [(chunks[doc_id], key, score) for doc_id, key, score in ranked if doc_id in chunks]
+
+
+# 프로세스 전역 정책 검색기
+policy_retriever = PolicyRetriever()
+
+# 프로세스 전역 토론 발화 검색기
+debate_retriever = DebateRetriever()
@@ -1,5 +1,5 @@
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 
 # 정책 스키마
 class PolicyBase(BaseModel):
@@ -15,7 +15,7 @@ class Policy(PolicyBase):
     candidate_id: int
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # 후보자 스키마
 class CandidateBase(BaseModel):
@@ -32,12 +32,55 @@ class Candidate(CandidateBase):
     policies: List[Policy] = []
     
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+# 토론 발화 청크 스키마
+class DebateChunkBase(BaseModel):
+    speaker: str
+    content: str
+    date: Optional[str] = None
+    source: Optional[str] = None
+
+class DebateChunkCreate(DebateChunkBase):
+    pass
+
+class DebateChunk(DebateChunkBase):
+    id: int
+    
+    class Config:
+        from_attributes = True
+
+class DebateSearchResult(DebateChunk):
+    candidate_id: Optional[int] = None  # 발화자에 해당하는 후보 ID (사회자 등은 None)
+    score: float
+
+# 후보 비교표 스키마 (후보자 × 정책 분야)
+class ComparisonCandidate(BaseModel):
+    id: int
+    name: str
+    party: Optional[str] = None
+
+class ComparisonPolicy(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+
+class ComparisonCategory(BaseModel):
+    category: str
+    policies: Dict[int, List[ComparisonPolicy]]  # 후보자 ID별 해당 분야 공약 (공약이 없는 후보는 생략)
+    summary: Optional[str] = None  # LLM 비교 요약 (사용하지 않거나 생성 전이면 None)
+
+class Comparison(BaseModel):
+    candidates: List[ComparisonCandidate]
+    categories: List[ComparisonCategory]
+    summaries_pending: int = 0  # 생성 중인 요약 수
 
 # AI 응답 스키마
 class ChatRequest(BaseModel):
     question: str
     candidate_ids: Optional[List[int]] = None
+    match_count: Optional[int] = Field(default=None, ge=1, le=50)  # 프롬프트에 넣을 관련 정책 수
+    stream: bool = False  # True이면 NDJSON 스트리밍으로 응답
 
 class ChatResponse(BaseModel):
     answer: str
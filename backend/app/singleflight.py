@@ -0,0 +1,117 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional
+
+from .config import CHAT_COALESCE_ENABLED
+
+Event = Dict[str, Any]
+
+
+class Flight:
+    """
+    진행 중인 업스트림 호출 1건
+
+    생성된 이벤트를 모두 버퍼에 보관하므로, 중간에 합류한 구독자도 처음 이벤트부터 차례로 받은 뒤
+    이후 이벤트를 실시간으로 받습니다.
+    """
+
+    def __init__(self):
+        self.events: List[Event] = []
+        self.followers = 0  # 시작한 요청 외에 합류한 요청 수
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, event: Event) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Event]:
+        """버퍼에 쌓인 이벤트부터 완료될 때까지 모든 이벤트를 순서대로 반환하는 비동기 제너레이터"""
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.events) or self.done)
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    followers: int = 0
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 요청을 하나의 업스트림 호출로 합치는 single-flight
+
+    키별로 진행 중인 호출이 없으면 `producer`로 새 호출을 시작하고, 있으면 그 호출에 합류합니다.
+    호출은 요청과 분리된 작업으로 실행되므로 먼저 시작한 클라이언트가 연결을 끊어도 나머지 구독자는
+    끝까지 결과를 받습니다. 호출이 끝나면 키를 지우므로 이후 요청은 답변 캐시에서 처리됩니다.
+    """
+
+    def __init__(self, enabled: bool = CHAT_COALESCE_ENABLED):
+        self.enabled = enabled
+        self.stats = SingleFlightStats()
+        self._flights: Dict[Hashable, Flight] = {}
+
+    def join(self, key: Hashable, producer: Callable[[], AsyncIterator[Event]]) -> Flight:
+        """
+        키에 해당하는 진행 중인 호출에 합류하거나 새로 시작하는 함수
+
+        Args:
+            key: 동일 요청 판별 키
+            producer: 업스트림 이벤트를 생성하는 함수 (새 호출을 시작할 때만 실행)
+
+        Returns:
+            Flight: 구독할 호출
+        """
+        flight = self._flights.get(key) if self.enabled else None
+        if flight is not None:
+            self.stats.followers += 1
+            flight.followers += 1
+            return flight
+
+        self.stats.leaders += 1
+        flight = Flight()
+        if self.enabled:
+            self._flights[key] = flight
+        flight._task = asyncio.create_task(self._run(key, flight, producer))
+        return flight
+
+    def snapshot(self) -> Dict[str, Any]:
+        """합류 통계를 반환하는 함수"""
+        requests = self.stats.leaders + self.stats.followers
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "upstream_calls": self.stats.leaders,
+            "coalesced": self.stats.followers,
+            "coalesced_ratio": round(self.stats.followers / requests, 4) if requests else 0.0,
+        }
+
+    async def _run(self, key: Hashable, flight: Flight, producer: Callable[[], AsyncIterator[Event]]) -> None:
+        error = None
+        try:
+            async for event in producer():
+                await flight.publish(event)
+        except Exception as e:
+            error = e
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            await flight.finish(error)
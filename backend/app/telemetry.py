@@ -0,0 +1,281 @@
+"""
+요청 지연 계측, Prometheus 형식 지표, 구조화 로그
+
+외부 라이브러리 없이 카운터/히스토그램을 프로세스 메모리에 기록하고 `/metrics`에서 Prometheus 텍스트 형식으로 노출합니다.
+요청마다 단계별 소요 시간(DB 조회, 검색, 프롬프트 구성, LLM 대기 등)을 모아 요청이 끝날 때 JSON 한 줄로 로그를 남깁니다.
+지표는 워커 프로세스별로 집계되므로 여러 워커를 띄우면 Prometheus에서 워커별로 수집해 합산합니다.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import METRICS_ENABLED, LOG_LEVEL, LOG_REQUESTS
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_key(names: Tuple[str, ...], labels: Dict[str, Any]) -> Tuple[str, ...]:
+    # 요청마다 호출되므로 제너레이터 대신 리스트 컴프리헨션 사용
+    return tuple([str(labels.get(name, "")) for name in names]) if names else ()
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """버킷 경계별 관측 수를 세는 히스토그램 (관측 1회 = 이진 탐색 1회 + 덧셈 몇 번)"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 조합별 [버킷별 관측 수(+Inf 포함), 합계, 개수]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(self.labelnames, labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(_label_key(self.labelnames, labels))
+        return state[2] if state else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 지표
+REGISTRY = Registry()
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "algovote_http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 마지막 바이트까지)",
+    ("method", "route", "status"),
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "algovote_chat_stage_duration_seconds", "채팅 처리 단계별 소요 시간", ("stage",),
+))
+PROMPT_TOKENS = REGISTRY.register(Histogram(
+    "algovote_chat_prompt_tokens", "LLM 요청 프롬프트 토큰 수(근사치)", buckets=TOKEN_BUCKETS,
+))
+COMPLETION_TOKENS = REGISTRY.register(Histogram(
+    "algovote_chat_completion_tokens", "LLM 응답 토큰 수(근사치)", buckets=TOKEN_BUCKETS,
+))
+CHAT_REQUESTS = REGISTRY.register(Counter(
+    "algovote_chat_requests_total", "채팅 요청 수 (source: cache, coalesced, upstream)", ("source", "stream"),
+))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "algovote_llm_errors_total", "LLM 호출 실패 수 (재시도 후 최종 실패)", ("operation", "error"),
+))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "algovote_llm_retries_total", "LLM 호출 재시도 수", ("error",),
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "algovote_admission_rejected_total", "입장 제어로 429 응답한 요청 수", ("pool", "reason"),
+))
+FALLBACKS = REGISTRY.register(Counter(
+    "algovote_chat_fallbacks_total", "안내 메시지(FALLBACK_ANSWER)로 대체한 응답 수",
+))
+
+
+@dataclass
+class RequestTrace:
+    """요청 1건의 단계별 소요 시간과 부가 정보 (요청이 끝나면 로그 한 줄로 기록)"""
+
+    request_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    stages: Dict[str, float] = field(default_factory=dict)
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+_trace: ContextVar[Optional[RequestTrace]] = ContextVar("algovote_trace", default=None)
+
+
+class Telemetry:
+    """계측 on/off 스위치와 단계 기록 함수 묶음"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, log_requests: bool = LOG_REQUESTS):
+        self.enabled = enabled
+        self.log_requests = log_requests
+
+    def record(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        STAGE_SECONDS.observe(seconds, stage=stage)
+        trace = _trace.get()
+        if trace is not None:
+            trace.stages[stage] = trace.stages.get(stage, 0.0) + seconds
+
+    def stage(self, name: str) -> "_Stage":
+        """블록 실행 시간을 단계 히스토그램과 현재 요청 기록에 남기는 컨텍스트 매니저"""
+        return _Stage(self, name)
+
+    def annotate(self, **attrs: Any) -> None:
+        """현재 요청 로그에 필드를 추가하는 함수"""
+        trace = _trace.get()
+        if trace is not None:
+            trace.attrs.update(attrs)
+
+
+class _Stage:
+    # 요청 경로에서 여러 번 쓰이므로 @contextmanager(제너레이터)보다 가벼운 클래스로 구현
+    __slots__ = ("telemetry", "name", "start")
+
+    def __init__(self, telemetry: Telemetry, name: str):
+        self.telemetry = telemetry
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.telemetry.record(self.name, time.perf_counter() - self.start)
+
+
+telemetry = Telemetry()
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 출력 (`extra={"fields": {...}}`로 넘긴 값을 최상위 필드로 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def get_logger(name: str = "algovote") -> logging.Logger:
+    logger = logging.getLogger(name)
+    root = logging.getLogger("algovote")
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+    return logger
+
+
+logger = get_logger("algovote.request")
+
+
+class TelemetryMiddleware:
+    """
+    요청별 처리 시간을 기록하고 구조화 로그를 남기는 ASGI 미들웨어
+
+    스트리밍 응답도 마지막 바이트를 보낼 때까지를 처리 시간으로 봅니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not telemetry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = _trace.set(trace)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route_path, status=status)
+            if telemetry.log_requests and route_path != "/metrics":
+                logger.info("request", extra={"fields": {
+                    "request_id": trace.request_id,
+                    "method": scope["method"],
+                    "route": route_path,
+                    "status": status,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    **({"stages_ms": {stage: round(seconds * 1000, 2) for stage, seconds in trace.stages.items()}}
+                       if trace.stages else {}),
+                    **trace.attrs,
+                }})
+            _trace.reset(token)
@@ -0,0 +1 @@
+# AlgoVote 백엔드 벤치마크 스크립트
@@ -0,0 +1,183 @@
+"""
+입장 제어(admission control) 벤치마크
+
+느린 fake LLM으로 서로 다른 질문을 채팅 슬롯보다 훨씬 많이 동시에 보내면서 조회 요청을 함께 보내고,
+입장 제어를 끈 경우와 켠 경우의 채팅 성공/429 수, 지연, 조회 p95를 비교합니다.
+이어서 클라이언트별 빈도 제한과, 업스트림 rate limit 이후 새 호출을 바로 429로 거절하는지 확인합니다.
+
+다음 중 하나라도 어기면 0이 아닌 종료 코드로 끝납니다.
+- 입장 제어를 켜면 과부하 시 429가 발생하고, 모든 429에 Retry-After가 있으며, 429는 대기 기한 안에 응답
+- 입장 제어를 켜도 조회 요청은 모두 성공
+- 한 클라이언트가 허용량을 넘으면 429, 다른 클라이언트는 영향 없음
+- 업스트림이 rate limit을 반환한 뒤의 새 채팅 요청은 LLM을 호출하지 않고 429
+
+실행:
+    python -m benchmarks.admission --requests 100 --capacity 4 --queue 8 --queue-timeout 0.5 --latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.common import configure_app_env, percentile
+
+configure_app_env(ANSWER_CACHE_ENABLED="False")
+
+
+def configure(args) -> None:
+    # app을 import하기 전에 슬롯 설정을 환경 변수로 지정
+    os.environ["CHAT_MAX_CONCURRENCY"] = str(args.capacity)
+    os.environ["CHAT_MAX_QUEUE"] = str(args.queue)
+    os.environ["CHAT_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+
+
+async def timed(coro) -> tuple:
+    start = time.perf_counter()
+    response = await coro
+    return response, time.perf_counter() - start
+
+
+async def overload_case(main_module, httpx, requests: int, latency: float, readers: int) -> dict:
+    from app.llm import FakeLLMClient, set_llm_client
+
+    # LLM 클라이언트 자체의 동시성 제한은 넉넉하게 두어, 대기는 입장 제어 또는 LLM 대기열에서만 발생
+    client = FakeLLMClient(latency=latency, token_rate=0, max_concurrency=16)
+    set_llm_client(client)
+    reads = []
+    async with httpx.AsyncClient(app=main_module.app, base_url="http://bench", timeout=120) as http:
+        await http.get("/candidates/")  # 카탈로그 워밍업
+        chats = [
+            asyncio.create_task(timed(http.post(
+                "/api/question", json={"question": f"정책 질문 {i}", "stream": i % 2 == 1},
+            )))
+            for i in range(requests)
+        ]
+        done = asyncio.Event()
+
+        async def reader():
+            while not done.is_set():
+                response, elapsed = await timed(http.get("/candidates/"))
+                reads.append((response.status_code, elapsed))
+
+        reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+        results = await asyncio.gather(*chats)
+        done.set()
+        await asyncio.gather(*reader_tasks)
+
+    ok = [elapsed for response, elapsed in results if response.status_code == 200]
+    rejected = [(response, elapsed) for response, elapsed in results if response.status_code == 429]
+    return {
+        "ok": ok,
+        "rejected": [elapsed for _, elapsed in rejected],
+        "retry_after": all("retry-after" in response.headers for response, _ in rejected),
+        "reads": [elapsed for status, elapsed in reads if status == 200],
+        "read_failures": sum(1 for status, _ in reads if status != 200),
+        "llm_calls": client.calls,
+    }
+
+
+async def rate_limit_case(main_module, httpx, burst: int) -> tuple:
+    from app.admission import ClientRateLimiter
+    from app.llm import FakeLLMClient, set_llm_client
+
+    set_llm_client(FakeLLMClient(latency=0, token_rate=0))
+    main_module.chat_rate_limiter = ClientRateLimiter(rate_per_minute=60, burst=burst, enabled=True)
+    statuses = []
+    heavy = httpx.ASGITransport(app=main_module.app, client=("10.0.0.1", 40000))
+    light = httpx.ASGITransport(app=main_module.app, client=("10.0.0.2", 40000))
+    async with httpx.AsyncClient(transport=heavy, base_url="http://bench") as http:
+        for _ in range(burst * 2):
+            statuses.append((await http.post("/chat/", json={"question": "청년 주거 정책"})).status_code)
+    async with httpx.AsyncClient(transport=light, base_url="http://bench") as http:
+        other = (await http.post("/chat/", json={"question": "청년 주거 정책"})).status_code
+    main_module.chat_rate_limiter = ClientRateLimiter(enabled=False)
+    return statuses, other
+
+
+async def upstream_rate_limit_case(main_module, httpx) -> tuple:
+    from app.llm import FakeLLMClient, set_llm_client
+
+    class FakeRateLimit(Exception):
+        pass
+
+    class RateLimitedLLM(FakeLLMClient):
+        """항상 rate limit(Retry-After 2초)을 반환하는 fake 업스트림"""
+
+        async def _stream(self, messages, max_tokens, temperature):
+            self.calls += 1
+            raise FakeRateLimit("rate limit reached")
+            yield  # 비동기 제너레이터로 만들기 위한 문장
+
+        def _rate_limit_retry_after(self, error):
+            return 2.0 if isinstance(error, FakeRateLimit) else None
+
+    client = RateLimitedLLM(latency=0, token_rate=0, max_retries=0)
+    set_llm_client(client)
+    async with httpx.AsyncClient(app=main_module.app, base_url="http://bench") as http:
+        first = await http.post("/chat/", json={"question": "첫 질문"})
+        second = await http.post("/chat/", json={"question": "두 번째 질문"})
+    return first.status_code, second.status_code, second.headers.get("retry-after"), client.calls
+
+
+async def run(args) -> int:
+    import httpx
+
+    import app.main as main_module
+    from app.admission import chat_admission
+    from app.database import create_tables, dispose_engine
+
+    await create_tables()
+    failures = []
+
+    for enabled in (False, True):
+        chat_admission.enabled = enabled
+        result = await overload_case(main_module, httpx, args.requests, args.latency, args.readers)
+        label = "입장 제어 사용" if enabled else "입장 제어 없음"
+        print(
+            f"{label:<9} 채팅 {args.requests}건: 성공 {len(result['ok']):3d} (p95 {percentile(result['ok'], 0.95):5.2f}s)  "
+            f"429 {len(result['rejected']):3d} (p95 {percentile(result['rejected'], 0.95) * 1000:6.1f}ms)  "
+            f"LLM 호출 {result['llm_calls']:3d}  조회 {len(result['reads'])}건 p95 "
+            f"{percentile(result['reads'], 0.95) * 1000:6.1f}ms (p50 {statistics.median(result['reads']) * 1000:5.1f}ms)"
+        )
+        if enabled:
+            if not result["rejected"]:
+                failures.append("과부하에서 429가 발생하지 않았습니다")
+            if not result["retry_after"]:
+                failures.append("Retry-After 헤더가 없는 429가 있습니다")
+            if percentile(result["rejected"], 1.0) > args.queue_timeout + 0.5:
+                failures.append(f"429 응답이 대기 기한({args.queue_timeout}s)보다 늦었습니다")
+            if len(result["ok"]) > args.capacity + args.queue or len(result["ok"]) < args.capacity:
+                failures.append(f"성공한 채팅 수 {len(result['ok'])}가 슬롯/대기열 설정과 맞지 않습니다")
+        if result["read_failures"]:
+            failures.append(f"{label}: 조회 요청 {result['read_failures']}건 실패")
+    chat_admission.enabled = True
+
+    statuses, other = await rate_limit_case(main_module, httpx, burst=5)
+    print(f"클라이언트별 빈도 제한 (순간 허용 5건): 같은 클라이언트 {statuses}  다른 클라이언트 {other}")
+    if statuses[:5] != [200] * 5 or 429 not in statuses[5:] or other != 200:
+        failures.append("클라이언트별 빈도 제한이 기대대로 동작하지 않았습니다")
+
+    first, second, retry_after, calls = await upstream_rate_limit_case(main_module, httpx)
+    print(f"업스트림 rate limit: 첫 요청 {first} (안내 메시지)  다음 요청 {second} (Retry-After {retry_after})  LLM 호출 {calls}회")
+    if second != 429 or calls != 1:
+        failures.append("업스트림 rate limit 이후 새 요청이 거절되지 않았습니다")
+
+    await dispose_engine()
+    for failure in failures:
+        print(f"실패: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="동시에 보낼 서로 다른 채팅 요청 수")
+    parser.add_argument("--capacity", type=int, default=4, help="채팅 슬롯 수 (CHAT_MAX_CONCURRENCY)")
+    parser.add_argument("--queue", type=int, default=8, help="대기열 길이 (CHAT_MAX_QUEUE)")
+    parser.add_argument("--queue-timeout", type=float, default=0.5, help="대기 기한(초) (CHAT_QUEUE_TIMEOUT)")
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM 응답 지연(초)")
+    parser.add_argument("--readers", type=int, default=10, help="채팅과 동시에 조회를 반복할 사용자 수")
+    args = parser.parse_args()
+    configure(args)
+    sys.exit(asyncio.run(run(args)))
@@ -0,0 +1,98 @@
+"""
+답변 캐시 벤치마크
+
+인기 질문이 반복되는 질문 로그(Zipf 분포, 띄어쓰기/문장부호 변형 포함)를 재생하면서
+캐시 사용 여부에 따른 요청별 지연 시간 p50/p95와 LLM 호출 수를 비교합니다.
+
+실행:
+    python -m benchmarks.answer_cache --requests 500 --latency 0.05
+    python -m benchmarks.answer_cache --semantic --similarity 0.9
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from benchmarks.common import configure_app_env, percentile
+
+configure_app_env(os.getenv("DATABASE_URL", "sqlite://"))
+
+from app.cache import AnswerCache
+from app.llm import FakeLLMClient, set_llm_client
+import app.main as main_module
+from app.database import create_tables, dispose_engine
+from app.schemas import ChatRequest
+
+TOPICS = ["부동산", "청년 일자리", "저출생", "의료", "교육", "국방", "외교", "탄소중립", "연금 개혁", "교통"]
+TEMPLATES = [
+    "이 후보의 {topic} 정책은?",
+    "{topic} 공약을 요약해줘",
+    "{topic} 관련해서 어떤 계획이 있나요?",
+    "{topic} 분야 핵심 공약이 뭐야",
+]
+
+
+def build_question_log(requests: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    questions = [template.format(topic=topic) for topic in TOPICS for template in TEMPLATES]
+    weights = [1 / (rank + 1) for rank in range(len(questions))]  # Zipf 분포
+    log = []
+    for question in rng.choices(questions, weights=weights, k=requests):
+        # 사용자마다 띄어쓰기/문장부호가 조금씩 다름
+        if rng.random() < 0.3:
+            question = question.rstrip("?") + rng.choice(["", "?", "??", " ?", "!"])
+        if rng.random() < 0.2:
+            question = question.replace(" ", "  ", 1)
+        log.append(question)
+    return log
+
+
+async def replay(log: list, answer_cache: AnswerCache, latency: float) -> tuple:
+    client = FakeLLMClient(latency=latency, token_rate=0)
+    set_llm_client(client)
+    main_module.answer_cache = answer_cache
+
+    durations = []
+    for question in log:
+        start = time.perf_counter()
+        await main_module.cached_ai_response(ChatRequest(question=question))
+        durations.append(time.perf_counter() - start)
+    return durations, client.calls
+
+
+async def run(requests: int, latency: float, semantic: bool, similarity: float) -> None:
+    await create_tables()
+    log = build_question_log(requests)
+    print(f"질문 로그: {len(log)}건, 고유 질문: {len(set(log))}개, LLM 지연: {latency:.3f}s")
+
+    scenarios = [
+        ("캐시 없음", AnswerCache(enabled=False)),
+        ("정확 일치 캐시", AnswerCache(enabled=True, semantic=False)),
+    ]
+    if semantic:
+        scenarios.append(("유사도 캐시", AnswerCache(enabled=True, semantic=True, similarity=similarity)))
+
+    for name, answer_cache in scenarios:
+        durations, calls = await replay(log, answer_cache, latency)
+        print(
+            f"{name:<10} p50: {statistics.median(durations) * 1000:8.2f}ms  "
+            f"p95: {percentile(durations, 0.95) * 1000:8.2f}ms  "
+            f"LLM 호출: {calls:4d}회  적중률: {answer_cache.snapshot()['hit_ratio']:.2%}"
+        )
+    await dispose_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--semantic", action="store_true")
+    parser.add_argument("--similarity", type=float, default=0.9)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency, args.semantic, args.similarity))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+후보자 조회 쿼리 수/지연 벤치마크
+
+후보자 수를 늘려가며 `/candidates/`가 실행하는 SQL 쿼리 수가 일정한지(N+1 없음) 확인하고,
+카탈로그가 비어 있을 때(cold), 채워져 있을 때(warm), ETag 조건부 요청(304)의 지연을 측정합니다.
+쿼리 수가 후보자 수에 따라 달라지면 0이 아닌 종료 코드로 끝납니다.
+
+실행:
+    python -m benchmarks.candidate_queries --sizes 1 10 100 --policies 10
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks.common import configure_app_env
+
+configure_app_env()
+
+import httpx
+from sqlalchemy import event
+
+from app.catalog import catalog
+from app.database import Base, Candidate, Policy, SessionLocal, engine
+from app.main import app
+
+statements = []
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+async def reset(candidates: int, policies: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        for i in range(candidates):
+            candidate = Candidate(name=f"후보{i + 1}")
+            db.add(candidate)
+            await db.flush()
+            db.add_all(Policy(candidate_id=candidate.id, title=f"공약 {j + 1}") for j in range(policies))
+        await db.commit()
+    catalog.invalidate()
+
+
+async def timed_get(client: httpx.AsyncClient, headers: dict = None) -> tuple:
+    statements.clear()
+    start = time.perf_counter()
+    response = await client.get("/candidates/", headers=headers or {})
+    return response, len(statements), (time.perf_counter() - start) * 1000
+
+
+async def run(sizes: list, policies: int) -> int:
+    counts = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for size in sizes:
+            await reset(size, policies)
+            cold, cold_queries, cold_ms = await timed_get(client)
+            warm, warm_queries, warm_ms = await timed_get(client)
+            cached, _, cached_ms = await timed_get(client, {"If-None-Match": warm.headers["etag"]})
+            counts[size] = cold_queries
+            print(
+                f"후보 {size:4d}명: 쿼리 cold {cold_queries}회 / warm {warm_queries}회  "
+                f"지연 cold {cold_ms:7.2f}ms, warm {warm_ms:6.2f}ms, 304 {cached_ms:6.2f}ms "
+                f"(응답 {len(cold.content)}B, 조건부 상태 {cached.status_code})"
+            )
+    await engine.dispose()
+
+    if len(set(counts.values())) != 1:
+        print("후보자 수에 따라 쿼리 수가 달라졌습니다 (N+1 의심)")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--policies", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.sizes, args.policies)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+동일 질문 동시 요청 합치기(single-flight) 벤치마크
+
+느린 fake LLM으로 같은 질문을 `/api/question`에 동시에 N건 보내고 업스트림(LLM) 호출 수를 셉니다.
+첫 토큰이 나온 뒤에는 스트리밍 요청을 추가로 보내, 중간에 합류한 구독자도 처음부터 전체 답변을 받는지 확인합니다.
+합치기를 켰을 때 업스트림 호출이 1회가 아니거나 답변이 서로 다르면 0이 아닌 종료 코드로 끝납니다.
+
+실행:
+    python -m benchmarks.coalescing --requests 100 --late 10 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.common import configure_app_env
+
+# 합치기를 끈 비교에서는 모든 요청이 업스트림을 호출하므로 입장 제어(429)는 끔
+configure_app_env(ADMISSION_ENABLED="False")
+
+import httpx
+
+import app.main as main_module
+from app.database import create_tables, dispose_engine
+from app.llm import FakeLLMClient, set_llm_client
+from app.singleflight import SingleFlight
+
+QUESTION = "청년 주거 정책을 비교해 주세요"
+
+
+async def ask(client: httpx.AsyncClient, stream: bool) -> str:
+    response = await client.post("/api/question", json={"question": QUESTION, "stream": stream})
+    response.raise_for_status()
+    if not stream:
+        return response.json()["answer"]
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    tokens = "".join(event["content"] for event in events if event["type"] == "token").strip()
+    done = next(event["answer"] for event in events if event["type"] == "done")
+    # 중간에 합류해도 처음 토큰부터 받아야 하므로 토큰을 이어 붙인 결과가 최종 답변과 같아야 함
+    return done if tokens == done else f"<토큰 누락: {tokens!r}>"
+
+
+async def run_case(enabled: bool, requests: int, late: int, latency: float, token_rate: float) -> tuple:
+    client = FakeLLMClient(latency=latency, token_rate=token_rate, max_concurrency=requests + late)
+    set_llm_client(client)
+    main_module.chat_flights = SingleFlight(enabled=enabled)
+    main_module.answer_cache.invalidate()
+
+    async with httpx.AsyncClient(app=main_module.app, base_url="http://bench", timeout=60) as http:
+        start = time.perf_counter()
+        first = [asyncio.create_task(ask(http, stream=i % 2 == 1)) for i in range(requests)]
+        # 첫 토큰이 나온 뒤(업스트림 진행 중)에 스트리밍 구독자 추가
+        await asyncio.sleep(latency + 2 / token_rate if token_rate else latency)
+        joined = [asyncio.create_task(ask(http, stream=True)) for _ in range(late)]
+        answers = await asyncio.gather(*first, *joined)
+        elapsed = time.perf_counter() - start
+    return client.calls, answers, elapsed
+
+
+async def run(requests: int, late: int, latency: float, token_rate: float) -> int:
+    await create_tables()
+    failed = False
+    for enabled in (False, True):
+        calls, answers, elapsed = await run_case(enabled, requests, late, latency, token_rate)
+        label = "합치기 사용" if enabled else "합치기 없음"
+        print(
+            f"{label:<8} 요청 {len(answers)}건 (중간 합류 {late}건)  업스트림 호출 {calls:3d}회  "
+            f"서로 다른 답변 {len(set(answers))}개  소요 {elapsed:.2f}s"
+        )
+        if enabled and (calls != 1 or len(set(answers)) != 1):
+            failed = True
+    await dispose_engine()
+
+    if failed:
+        print("실패: 동일 질문 동시 요청이 업스트림 호출 1회로 합쳐지지 않았습니다.")
+        return 1
+    print("통과: 동일 질문 동시 요청이 업스트림 호출 1회로 처리되었습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--late", type=int, default=10, help="첫 토큰 이후 합류할 스트리밍 요청 수")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--token-rate", type=float, default=20)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.requests, args.late, args.latency, args.token_rate)))
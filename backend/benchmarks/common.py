@@ -0,0 +1,59 @@
+"""
+벤치마크 공통 도구
+
+`configure_app_env()`는 app 설정이 import 시점에 환경 변수를 읽으므로 app을 import하기 전에 호출해야 합니다.
+그래서 이 모듈은 최상위에서 app을 import하지 않습니다.
+"""
+import os
+import socket
+from typing import Dict, List
+
+TOPICS = ["부동산", "청년 일자리", "저출생", "의료", "교육", "국방", "외교", "탄소중립"]
+
+
+def configure_app_env(database_url: str = "sqlite://", **overrides: str) -> None:
+    """
+    벤치마크용 앱 환경 변수를 지정하는 함수 (app import 전에 호출)
+
+    기본값은 메모리 SQLite, 요청 로그 끔, 클라이언트별 채팅 빈도 제한 끔이며 `overrides`로 추가/변경합니다.
+    """
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["LOG_REQUESTS"] = "False"
+    os.environ["CHAT_RATE_LIMIT"] = "0"
+    os.environ.update(overrides)
+
+
+def percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def policy_fields(index: int) -> Dict[str, str]:
+    """index번째 합성 공약의 제목/분야/설명 (분야는 TOPICS를 순서대로 사용)"""
+    topic = TOPICS[index % len(TOPICS)]
+    return {
+        "title": f"{topic} 공약 {index + 1}",
+        "category": topic,
+        "description": f"{topic} 분야의 재원 마련, 추진 일정, 기대 효과를 담은 공약 설명입니다. " * 3,
+    }
+
+
+async def seed_catalog(candidates: int, policies: int) -> List[int]:
+    """테이블을 만들고 후보자와 후보자별 합성 공약을 DB에 직접 등록한 뒤 후보자 ID 목록을 반환하는 함수"""
+    from app.database import Candidate, Policy, SessionLocal, create_tables
+
+    await create_tables()
+    async with SessionLocal() as db:
+        rows = [Candidate(name=f"후보{i + 1}", party=f"정당{i + 1}") for i in range(candidates)]
+        db.add_all(rows)
+        await db.flush()
+        for candidate in rows:
+            db.add_all(Policy(candidate_id=candidate.id, **policy_fields(j)) for j in range(policies))
+        await db.commit()
+        return [candidate.id for candidate in rows]
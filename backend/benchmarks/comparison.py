@@ -0,0 +1,134 @@
+"""
+후보 비교표 벤치마크
+
+비교 화면이 후보별 조회를 여러 번 보내 클라이언트에서 분야별 비교표를 만드는 기존 방식과
+`/comparison/` 한 번(미리 만든 gzip 응답, ETag 304)의 요청 수, 전송 바이트, 지연을 비교합니다.
+이어서 fake LLM으로 분야별 요약을 켜고, 처음에는 분야 수만큼, 정책을 하나 추가하면 해당 분야 1건만
+LLM을 호출하는지, 새 워커(새 비교표 인스턴스)는 DB에 저장된 요약을 재사용해 LLM을 호출하지 않는지 확인합니다.
+기대한 LLM 호출 수와 다르면 0이 아닌 종료 코드로 끝납니다.
+
+실행:
+    python -m benchmarks.comparison --candidates 5 --policies 40 --repeat 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmarks.common import TOPICS, configure_app_env, seed_catalog
+
+configure_app_env()
+
+import httpx
+
+import app.main as main_module
+from app.comparison import ComparisonMatrix
+from app.database import dispose_engine
+from app.llm import FakeLLMClient, set_llm_client
+
+async def fan_out(client: httpx.AsyncClient) -> tuple:
+    """기존 방식: 후보 목록 + 후보별 정책 조회 후 클라이언트에서 분야별로 묶기 (요청 수, 전송 바이트)"""
+    response = await client.get("/candidates/")
+    candidates = response.json()
+    responses = await asyncio.gather(*(
+        client.get(f"/policies/?candidate_id={candidate['id']}") for candidate in candidates
+    ))
+    matrix = {}
+    for candidate, policies_response in zip(candidates, responses):
+        for policy in policies_response.json():
+            matrix.setdefault(policy["category"], {}).setdefault(candidate["id"], []).append(policy)
+    return 1 + len(responses), response.num_bytes_downloaded + sum(r.num_bytes_downloaded for r in responses)
+
+
+async def single(client: httpx.AsyncClient, headers: dict = None) -> tuple:
+    response = await client.get("/comparison/", headers=headers or {})
+    assert response.status_code in (200, 304), response.status_code
+    return 1, response.num_bytes_downloaded
+
+
+async def measure(func, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        requests, num_bytes = await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return requests, num_bytes, statistics.median(timings)
+
+
+async def summaries_case(client: httpx.AsyncClient, categories: int, latency: float) -> list:
+    failures = []
+    llm = FakeLLMClient(latency=latency, token_rate=0)
+    set_llm_client(llm)
+    main_module.comparison = ComparisonMatrix(summaries=True)
+
+    body = (await client.get("/comparison/")).json()
+    print(f"요약 사용: 첫 조회 즉시 응답 (생성 중인 요약 {body['summaries_pending']}개)")
+    await main_module.comparison.wait_for_summaries()
+    body = (await client.get("/comparison/")).json()
+    filled = sum(1 for row in body["categories"] if row["summary"])
+    print(f"  전체 생성: LLM 호출 {llm.calls}회, 요약 {filled}/{len(body['categories'])}개")
+    if llm.calls != categories or filled != categories:
+        failures.append(f"처음 요약 생성 시 LLM 호출 {llm.calls}회 (기대값 {categories}회)")
+
+    before = llm.calls
+    candidate_id = body["candidates"][0]["id"]
+    response = await client.post(f"/policies/?candidate_id={candidate_id}", json={
+        "title": "부동산 추가 공약", "category": TOPICS[0], "description": "새로 추가한 공약입니다.",
+    })
+    response.raise_for_status()
+    await client.get("/comparison/")
+    await main_module.comparison.wait_for_summaries()
+    print(f"  정책 1건 추가 후: 추가 LLM 호출 {llm.calls - before}회")
+    if llm.calls - before != 1:
+        failures.append(f"정책 추가 후 LLM 호출 {llm.calls - before}회 (기대값 1회)")
+
+    # 새 워커/재시작: 메모리는 비어 있지만 DB에 저장된 요약을 재사용
+    before = llm.calls
+    main_module.comparison = ComparisonMatrix(summaries=True)
+    body = (await client.get("/comparison/")).json()
+    await main_module.comparison.wait_for_summaries()
+    filled = sum(1 for row in body["categories"] if row["summary"])
+    print(f"  새 워커: 추가 LLM 호출 {llm.calls - before}회, 첫 응답의 요약 {filled}/{len(body['categories'])}개")
+    if llm.calls != before or filled != categories:
+        failures.append("새 워커가 저장된 요약을 재사용하지 않았습니다")
+    return failures
+
+
+async def run(candidates: int, policies: int, repeat: int, latency: float) -> int:
+    await seed_catalog(candidates, policies)
+    categories = min(policies, len(TOPICS))
+    async with httpx.AsyncClient(app=main_module.app, base_url="http://bench") as client:
+        await client.get("/candidates/")  # 카탈로그 워밍업
+        start = time.perf_counter()
+        await client.get("/comparison/")
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        rows = [
+            ("후보별 조회 (기존)", await measure(lambda: fan_out(client), repeat)),
+            ("/comparison/ (gzip)", await measure(lambda: single(client), repeat)),
+            ("/comparison/ (비압축)", await measure(lambda: single(client, {"Accept-Encoding": "identity"}), repeat)),
+        ]
+        etag = (await client.get("/comparison/")).headers["etag"]
+        rows.append(("/comparison/ (304)", await measure(lambda: single(client, {"If-None-Match": etag}), repeat)))
+
+        print(f"후보 {candidates}명 × 정책 {policies}개 ({categories}개 분야), 비교표 최초 생성 {cold_ms:.1f}ms")
+        for label, (requests, num_bytes, p50) in rows:
+            print(f"{label:<20} 요청 {requests:2d}건  전송 {num_bytes / 1024:7.1f}KB  p50 {p50:6.2f}ms")
+
+        failures = await summaries_case(client, categories, latency)
+    await dispose_engine()
+
+    for failure in failures:
+        print(f"실패: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--policies", type=int, default=40, help="후보자별 정책 수")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM 응답 지연(초)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.candidates, args.policies, args.repeat, args.latency)))
@@ -0,0 +1,48 @@
+"""
+동시 채팅 처리량 벤치마크
+
+fake LLM provider를 사용해 N개의 채팅 요청을 동시에 실행하고,
+전체 소요 시간이 LLM 지연 1회 수준인지 확인합니다.
+
+실행:
+    python -m benchmarks.concurrent_chat --requests 50 --latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_app_env
+
+configure_app_env(os.getenv("DATABASE_URL", "sqlite://"))
+
+from app.ai import collect_response, stream_ai_response
+from app.llm import FakeLLMClient, set_llm_client
+
+
+async def run(requests: int, latency: float, concurrency: int) -> None:
+    client = FakeLLMClient(latency=latency, max_concurrency=concurrency)
+    set_llm_client(client)
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        *(collect_response(stream_ai_response(f"질문 {i}")) for i in range(requests))
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"요청 수: {len(responses)}, LLM 지연: {latency:.2f}s, 동시 실행 제한: {concurrency}")
+    print(f"전체 소요 시간: {elapsed:.2f}s ({elapsed / latency:.2f} x LLM 지연)")
+    print(f"직렬 처리 시 예상 시간: {requests * latency:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
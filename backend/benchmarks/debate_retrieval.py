@@ -0,0 +1,138 @@
+"""
+토론 발화 청크 분할/검색 벤치마크
+
+합성 토론(후보 여러 명이 같은 주제를 번갈아 발언)에서 "후보 X가 주제 T에 대해 한 말"을 찾을 때
+기존 방식(글자 수 기준 분할 + 전체 색인 검색 후 후보 이름으로 사후 필터링)과
+화자 단위 분할 + 후보별 색인 사전 필터링 방식의 recall@k와 검색 지연을 비교합니다.
+
+기존 분할은 RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=20)를 흉내 내어
+줄 단위로 1000자까지 채우고 20자를 겹치게 자릅니다. (LangChain 없이 실행하기 위한 근사)
+
+실행:
+    python -m benchmarks.debate_retrieval --candidates 4 --debates 20 --k 5
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from app.retrieval import BM25Index, CorpusStats, speaker_candidate
+from benchmarks.common import percentile
+from preprocess.chunking import chunk_utterances
+
+TOPICS = ["부동산", "청년 일자리", "저출생", "의료", "교육", "국방", "외교", "탄소중립", "연금", "교통", "농업", "디지털"]
+FILLER = [
+    "구체적인 재원 마련 방안을 말씀드리겠습니다.",
+    "상대 후보의 주장은 현실과 맞지 않습니다.",
+    "국민 여러분께 약속드린 내용을 반드시 지키겠습니다.",
+    "단계별 추진 일정과 관계 부처 협의를 거치겠습니다.",
+    "지난 정부의 정책이 실패한 이유를 분명히 봐야 합니다.",
+]
+
+
+def synthetic_utterances(candidates: int, debates: int, rng: random.Random) -> tuple:
+    """합성 발화 목록과 정답((후보 이름, 주제) → 해당 후보가 그 주제를 말한 발화 순번 집합)을 만드는 함수"""
+    names = [f"후보{chr(ord('가') + i)}" for i in range(candidates)]
+    utterances, relevant = [], defaultdict(set)
+    for debate in range(debates):
+        date = f"2025.05.{debate + 1:02d}"
+        for topic in rng.sample(TOPICS, 4):
+            utterances.append({"speaker": "사회자", "text": f"다음 주제는 {topic}입니다. 각 후보께서 말씀해 주십시오.",
+                               "date": date, "source": f"{date}.txt", "index": len(utterances)})
+            for name in rng.sample(names, len(names)):
+                text = f"{topic} 문제에 대한 제 입장은 분명합니다. " + " ".join(rng.choices(FILLER, k=rng.randint(3, 12)))
+                relevant[(name, topic)].add(len(utterances))
+                utterances.append({"speaker": f"{name} 후보", "text": text, "date": date, "source": f"{date}.txt",
+                                   "index": len(utterances)})
+    return names, utterances, relevant
+
+
+def character_chunks(utterances: list, chunk_size: int = 1000, overlap: int = 20) -> list:
+    """기존 방식: 화자를 무시하고 '(화자) 발화' 줄을 chunk_size까지 채워 자르는 분할 (각 청크가 담은 발화 순번 포함)"""
+    chunks, text, members = [], "", []
+    for utterance in utterances:
+        line = f"({utterance['speaker']}) {utterance['text']}\n"
+        if text and len(text) + len(line) > chunk_size:
+            chunks.append((text, set(members)))
+            text, members = text[-overlap:], members[-1:]
+        text += line
+        members.append(utterance["index"])
+    if text:
+        chunks.append((text, set(members)))
+    return chunks
+
+
+def run(candidates: int, debates: int, k: int) -> None:
+    rng = random.Random(11)
+    names, utterances, relevant = synthetic_utterances(candidates, debates, rng)
+    queries = [(name, topic) for (name, topic) in relevant]
+    people = [{"id": i + 1, "name": name} for i, name in enumerate(names)]
+    ids = {person["name"]: person["id"] for person in people}
+
+    # 기존 방식: 전체 색인 하나, 검색 후 후보 이름이 들어간 청크만 남김
+    baseline = character_chunks(utterances)
+    baseline_index = BM25Index()
+    for doc_id, (text, _) in enumerate(baseline):
+        baseline_index.add(doc_id, text)
+
+    # 화자 단위 분할 + 후보별 색인
+    chunks = chunk_utterances(utterances, max_chars=1000)
+    stats = CorpusStats()
+    partitions = defaultdict(lambda: BM25Index(stats=stats))
+    members = {}
+    for doc_id, chunk in enumerate(chunks):
+        partitions[speaker_candidate(chunk.metadata["speaker"], people)].add(doc_id, chunk.content)
+        members[doc_id] = set(range(chunk.metadata["first_index"], chunk.metadata["last_index"] + 1))
+
+    def evaluate(search) -> tuple:
+        recalls, latencies = [], []
+        for name, topic in queries:
+            start = time.perf_counter()
+            found = search(name, f"{name} {topic}")
+            latencies.append(time.perf_counter() - start)
+            # 상위 k개 청크로 찾아낸 정답 발화 비율 (정답이 k개보다 많으면 k개를 모두 찾았을 때 100%)
+            expected = relevant[(name, topic)]
+            recalls.append(min(1.0, len(found & expected) / min(len(expected), k)))
+        return statistics.mean(recalls), latencies
+
+    def baseline_search(name: str, query: str) -> set:
+        found, taken = set(), 0
+        # 사후 필터링이라 후보의 청크 k개를 채울 때까지 전체 점수 순위를 훑어야 함
+        for doc_id, _ in baseline_index.search(query, len(baseline)):
+            text, doc_members = baseline[doc_id]
+            if f"({name} 후보)" not in text:
+                continue
+            # 청크 안에서 해당 후보의 발화만 정답으로 인정
+            found |= {index for index in doc_members if utterances[index]["speaker"] == f"{name} 후보"}
+            taken += 1
+            if taken >= k:
+                break
+        return found
+
+    def partitioned_search(name: str, query: str) -> set:
+        found = set()
+        for doc_id, _ in partitions[ids[name]].search(query, k):
+            found |= members[doc_id]
+        return found
+
+    print(f"후보 {candidates}명, 토론 {debates}회, 발화 {len(utterances)}개, 질의 {len(queries)}개, k={k}")
+    print(f"기존 분할: 청크 {len(baseline)}개 (화자가 섞인 청크 {sum(len({utterances[i]['speaker'] for i in m}) > 1 for _, m in baseline)}개)")
+    print(f"화자 단위: 청크 {len(chunks)}개 (후보별 색인 평균 {len(chunks) / max(1, len(partitions)):.0f}개)")
+
+    for label, search in [("기존 분할 + 사후 필터", baseline_search), ("화자 단위 + 후보 사전 필터", partitioned_search)]:
+        recall, latencies = evaluate(search)
+        print(
+            f"{label:<22} recall@{k} {recall:6.1%}  "
+            f"p50 {percentile(latencies, 0.5) * 1000:6.2f}ms  p95 {percentile(latencies, 0.95) * 1000:6.2f}ms  "
+            f"평균 {statistics.mean(latencies) * 1000:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--debates", type=int, default=20)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    run(args.candidates, args.debates, args.k)
@@ -0,0 +1,79 @@
+"""
+방송 자료 발화 추출 벤치마크
+
+여러 개의 대용량 합성 방송 자료(<br> 구분, -(화자) 발화)를 만들고, 프로세스 수를 늘려가며
+전체 처리 시간(MB/s)과 작업 프로세스의 최대 메모리(RSS)를 측정합니다.
+파일 크기가 커져도 메모리는 일정해야 하고, 처리 시간은 프로세스 수에 반비례해야 합니다.
+마지막 파일은 첫 파일과 방송일시가 같아, 결과 파일이 서로 덮어쓰지 않고 모두 남는지 확인합니다.
+마지막으로 같은 입력을 다시 처리해 크기/수정 시각 비교만으로 건너뛰는지 확인합니다.
+
+실행:
+    python -m benchmarks.extract_transcripts --files 4 --size-mb 100 --workers 1 2 4
+"""
+import argparse
+import glob
+import os
+import resource
+import tempfile
+import time
+
+from preprocess.extract_debate import extract_many
+
+SPEAKERS = ["사회자", "후보A", "후보B", "후보C", "후보D"]
+
+
+def write_transcript(path: str, size_mb: float, seed: int) -> None:
+    target = int(size_mb * 1024 * 1024)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<html><body>방송일시 : 2025. 5. {seed + 1}.<br>제작: 합성 자료<br>")
+        f.write("-(사회자) 지금부터 토론을 시작하겠습니다.<br>")
+        written, i = 0, 0
+        while written < target:
+            speaker = SPEAKERS[i % len(SPEAKERS)]
+            line = f"-({speaker}) {i}번째 발언입니다. " + "정책의 세부 내용을 설명드리겠습니다. " * 8 + "<br>추가 설명입니다.<br>"
+            f.write(line)
+            written += len(line.encode("utf-8"))
+            i += 1
+        f.write("-(사회자) 시청자 여러분, 고맙습니다.<br></body></html>")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs = []
+        for i in range(args.files):
+            path = os.path.join(workdir, f"broadcast{i}.php")
+            # 마지막 파일은 첫 파일과 같은 날짜
+            write_transcript(path, args.size_mb, i if i < args.files - 1 else 0)
+            inputs.append(path)
+        total_mb = sum(os.path.getsize(path) for path in inputs) / 1024 / 1024
+        print(f"방송 자료 {len(inputs)}개, 총 {total_mb:.0f}MB")
+
+        baseline = None
+        for workers in args.workers:
+            output_dir = os.path.join(workdir, f"out{workers}")
+            start = time.perf_counter()
+            extract_many(inputs, output_dir, workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed * workers
+            peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            print(
+                f"프로세스 {workers}개: {elapsed:6.2f}s ({total_mb / elapsed:6.1f} MB/s, "
+                f"선형 대비 효율 {baseline / workers / elapsed:5.0%}), 작업 프로세스 최대 RSS {peak_kb / 1024:.0f}MB"
+            )
+            outputs = glob.glob(os.path.join(output_dir, "*.txt"))
+            if len(outputs) != len(inputs):
+                print(f"  결과 파일 {len(outputs)}개 (기대값 {len(inputs)}개): 같은 날짜 결과가 덮어써졌습니다")
+
+        start = time.perf_counter()
+        written = extract_many(inputs, os.path.join(workdir, f"out{args.workers[-1]}"), args.workers[-1])
+        print(f"재실행: 새로 처리한 파일 {len(written)}개, {time.perf_counter() - start:.2f}s (크기/수정 시각 비교만 수행)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+부하 테스트용 OpenAI 호환 fake LLM 서버
+
+`/v1/chat/completions`(일괄/SSE 스트리밍)와 `/v1/embeddings`를 흉내 내는 HTTP 서버입니다.
+앱을 `LLM_PROVIDER=openai`, `OPENAI_API_BASE=http://127.0.0.1:<port>/v1`로 띄우면 openai SDK와
+실제 HTTP 호출 경로를 그대로 거치면서 외부 API 없이 지연/토큰 속도를 재현할 수 있습니다.
+답변 생성과 지연은 `FakeLLMClient`와 동일하고, `--error-rate` 비율만큼 429(rate limit)를 반환합니다.
+`GET /stats`는 받은 요청 수를 반환합니다.
+
+실행:
+    python -m benchmarks.fake_llm_server --port 9000 --latency 1.0 --token-rate 50 --error-rate 0
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from collections import Counter
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.llm import FakeLLMClient
+
+
+def create_app(latency: float, token_rate: float, prefill_rate: float = 0.0, error_rate: float = 0.0,
+               seed: int = 1) -> FastAPI:
+    server = FastAPI()
+    # 서버 자체가 병목이 되지 않도록 동시성 제한은 사실상 두지 않음
+    client = FakeLLMClient(latency=latency, token_rate=token_rate, prefill_rate=prefill_rate, max_concurrency=100000)
+    rng = random.Random(seed)
+    stats = Counter()
+
+    def rate_limited(kind: str):
+        stats[kind] += 1
+        if error_rate and rng.random() < error_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error", "code": None}},
+                headers={"Retry-After": "1"},
+            )
+        return None
+
+    @server.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        error = rate_limited("chat")
+        if error is not None:
+            return error
+        messages = body["messages"]
+        max_tokens = body.get("max_tokens") or 1000
+        model = body.get("model", "fake")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            answer = await client.chat(messages, max_tokens=max_tokens)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            }
+
+        def chunk(delta: dict, finish_reason=None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant"})
+            async for token in client.stream_chat(messages, max_tokens=max_tokens):
+                yield chunk({"content": token})
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @server.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        error = rate_limited("embed")
+        if error is not None:
+            return error
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        data = [
+            {"object": "embedding", "index": i, "embedding": await client.embed(text)}
+            for i, text in enumerate(inputs)
+        ]
+        return {"object": "list", "data": data, "model": body.get("model", "fake")}
+
+    @server.get("/stats")
+    async def read_stats():
+        return dict(stats)
+
+    return server
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=1.0, help="첫 토큰까지의 지연(초)")
+    parser.add_argument("--token-rate", type=float, default=50, help="초당 생성 토큰 수 (0이면 즉시)")
+    parser.add_argument("--prefill-rate", type=float, default=0, help="초당 프롬프트 처리 토큰 수 (0이면 무시)")
+    parser.add_argument("--error-rate", type=float, default=0, help="429를 반환할 요청 비율")
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency, args.token_rate, args.prefill_rate, args.error_rate),
+        host=args.host, port=args.port, log_level="warning",
+    )
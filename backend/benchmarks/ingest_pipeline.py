@@ -0,0 +1,67 @@
+"""
+임베딩 적재 파이프라인 처리량 벤치마크
+
+합성 토론 청크를 fake 임베딩 모델(요청당 지연)과 SQLite 벡터 저장소로 적재하면서
+기존 방식(청크 1개씩 순차 요청)과 배치/병렬 설정별 chunks/sec를 비교하고,
+체크포인트로 재실행 시 이미 적재한 청크를 건너뛰는지 확인합니다.
+
+실행:
+    python -m benchmarks.ingest_pipeline --chunks 2000 --latency 0.05
+"""
+import argparse
+import os
+import tempfile
+
+from preprocess.ingest import Checkpoint, Chunk, FakeEmbedder, IngestionPipeline, SQLiteVectorStore, TokenBucket
+
+
+def synthetic_chunks(count: int) -> list:
+    speakers = ["사회자", "후보A", "후보B", "후보C"]
+    return [
+        Chunk(
+            content=f"({speakers[i % len(speakers)]}) {i}번째 발언입니다. " + "정책에 대한 설명이 이어집니다. " * 20,
+            metadata={"source": "synthetic.txt"},
+        )
+        for i in range(count)
+    ]
+
+
+def run_case(name: str, chunks: list, latency: float, batch_size: int, workers: int, rps: float, workdir: str) -> None:
+    store = SQLiteVectorStore(os.path.join(workdir, f"{name}.db"))
+    checkpoint = Checkpoint(os.path.join(workdir, f"{name}.ingested"))
+    pipeline = IngestionPipeline(
+        embedder=FakeEmbedder(latency=latency),
+        store=store,
+        batch_size=batch_size,
+        max_workers=workers,
+        rate_limiter=TokenBucket(rate=rps, capacity=workers) if rps else None,
+        checkpoint=checkpoint,
+        log=lambda message: None,
+    )
+    stats = pipeline.run(chunks)
+    rerun = pipeline.run(chunks)
+    print(
+        f"{name:<16} batch={batch_size:<3d} workers={workers:<2d} "
+        f"{stats.chunks_per_sec:9.1f} chunks/sec ({stats.elapsed:6.2f}s)  "
+        f"재실행: {rerun.skipped}/{rerun.total}개 건너뜀, 저장 {store.count()}행"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="임베딩 요청당 지연(초)")
+    parser.add_argument("--rps", type=float, default=0, help="초당 최대 임베딩 요청 수 (0이면 제한 없음)")
+    args = parser.parse_args()
+
+    chunks = synthetic_chunks(args.chunks)
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"청크 {len(chunks)}개, 임베딩 요청당 지연 {args.latency:.3f}s")
+        # 기존 방식은 청크마다 요청 + 3초 대기였으므로 대기를 뺀 순차 처리를 기준으로 비교
+        run_case("순차(기존 방식)", chunks[: max(1, len(chunks) // 10)], args.latency, 1, 1, args.rps, workdir)
+        run_case("배치", chunks, args.latency, 32, 1, args.rps, workdir)
+        run_case("배치+병렬", chunks, args.latency, 32, 8, args.rps, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""
+재현 가능한 부하 테스트 (uvicorn 워커 + SQLite + OpenAI 호환 fake LLM 서버)
+
+임시 SQLite DB로 `app.main:app`을 uvicorn 워커 N개로 띄우고, 앱의 LLM 호출은 로컬 fake LLM 서버
+(`benchmarks.fake_llm_server`)로 보냅니다. openai SDK와 HTTP 호출 경로를 그대로 거치므로 외부 API 없이
+실제 배포와 같은 코드 경로를 측정할 수 있습니다.
+
+`/candidates/`, `/policies/` 조회와 `/api/question` 채팅(일괄/스트리밍, 인기 질문 반복 + 새 질문)을 섞어
+동시 사용자 수를 단계별로 올리면서 단계마다 경로별 처리량, p50/p95/p99 지연, 스트리밍 첫 줄 도착 시간,
+오류 수, 워커별 메모리(RSS, 최대 RSS), LLM 호출 수를 측정합니다.
+요청 선택은 고정 시드로 재현되며, 결과는 커밋 해시와 실행 조건을 담은 JSON으로 저장됩니다.
+`--baseline`으로 이전 결과를 지정하면 같은 동시 사용자 단계끼리 비교해, p95 지연 증가나 처리량 감소가
+`--max-regression` 비율을 넘으면 0이 아닌 종료 코드로 끝납니다.
+
+부하 생성기와 서버가 같은 머신에서 CPU를 나눠 쓰므로, 커밋 간 비교는 같은 머신/같은 옵션으로 실행한 결과끼리 합니다.
+워커 메모리는 Linux의 /proc에서 읽습니다.
+
+실행:
+    python -m benchmarks.load_test --workers 2 --concurrency 10 25 50 100 --duration 10
+    python -m benchmarks.load_test --baseline benchmarks/results/load_test-<커밋>.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import TOPICS, free_port, percentile, policy_fields
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+QUESTION_TEMPLATES = ["{topic} 정책을 비교해 주세요", "{topic} 공약의 재원 마련 방안은?", "{topic} 분야에서 가장 구체적인 공약은?"]
+# 실행 조건으로 결과에 기록할 앱 설정 (값이 다르면 비교 시 경고)
+RECORDED_ENV_PREFIXES = ("LLM_", "ANSWER_CACHE_", "CHAT_", "DB_POOL_", "CATALOG_", "RETRIEVAL_", "METRICS_", "LOG_REQUESTS")
+
+
+def git_revision() -> str:
+    """현재 커밋 해시 (작업 트리에 변경이 있으면 -dirty)"""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# --- 프로세스 관리 ---
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} 서버가 종료되었습니다 (종료 코드 {process.returncode})")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} 서버 시작 대기 시간 초과")
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    """uvicorn 워커 프로세스 ID 목록 (워커가 1개면 마스터 프로세스가 직접 요청을 처리)"""
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except (OSError, IndexError, ValueError):
+            continue
+        # multiprocessing의 resource_tracker 등은 제외하고 spawn으로 띄운 워커만
+        if ppid == master_pid and b"spawn_main" in cmdline:
+            children.append(int(entry))
+    return sorted(children) or [master_pid]
+
+
+def memory_usage(pid: int) -> Optional[Dict[str, float]]:
+    """프로세스의 현재 RSS와 최대 RSS(MB)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    to_mb = lambda key: int(fields[key].split()[0]) / 1024 if key in fields else None
+    return {"pid": pid, "rss_mb": to_mb("VmRSS"), "peak_rss_mb": to_mb("VmHWM")}
+
+
+class Stack:
+    """fake LLM 서버와 앱(uvicorn) 프로세스를 띄우고 정리하는 컨텍스트 매니저"""
+
+    def __init__(self, workers: int, latency: float, token_rate: float, error_rate: float, env: Dict[str, str]):
+        self.workers = workers
+        self.latency = latency
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.env = env
+        self.processes: List[subprocess.Popen] = []
+
+    def __enter__(self) -> "Stack":
+        self.workdir = tempfile.TemporaryDirectory()
+        llm_port, app_port = free_port(), free_port()
+        self.llm_url = f"http://127.0.0.1:{llm_port}"
+        self.app_url = f"http://127.0.0.1:{app_port}"
+        env = {
+            **os.environ,
+            **self.env,
+            "DATABASE_URL": f"sqlite:///{os.path.join(self.workdir.name, 'load_test.db')}",
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_BASE": f"{self.llm_url}/v1",
+            "OPENAI_API_KEY": "fake",
+            "DB_CREATE_TABLES": "False",
+        }
+        try:
+            llm = self._start([
+                "-m", "benchmarks.fake_llm_server", "--port", str(llm_port), "--latency", str(self.latency),
+                "--token-rate", str(self.token_rate), "--error-rate", str(self.error_rate),
+            ], env)
+            wait_until_up(f"{self.llm_url}/stats", llm)
+            subprocess.run([sys.executable, "-m", "app.migrate"], cwd=BACKEND_DIR, env=env, capture_output=True, check=True)
+            self.app = self._start([
+                "-m", "uvicorn", "app.main:app", "--port", str(app_port), "--workers", str(self.workers),
+                "--log-level", "warning", "--no-access-log",
+            ], env)
+            wait_until_up(f"{self.app_url}/ready", self.app)
+            # 워커가 여러 개면 모든 워커가 뜰 때까지 대기
+            deadline = time.perf_counter() + 30
+            while self.workers > 1 and len(worker_pids(self.app.pid)) < self.workers and time.perf_counter() < deadline:
+                time.sleep(0.1)
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _start(self, args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+        process = subprocess.Popen([sys.executable, *args], cwd=BACKEND_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.processes.append(process)
+        return process
+
+    def __exit__(self, *exc_info) -> None:
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.workdir.cleanup()
+
+    def llm_calls(self) -> int:
+        stats = httpx.get(f"{self.llm_url}/stats").json()
+        return stats.get("chat", 0)
+
+    def memory(self) -> List[Dict[str, float]]:
+        return [usage for usage in map(memory_usage, worker_pids(self.app.pid)) if usage]
+
+
+# --- 부하 생성 ---
+
+class Workload:
+    """
+    고정 시드로 재현되는 요청 혼합 (사용자마다 시드에서 파생한 난수 생성기를 사용해 요청 순서가 타이밍과 무관)
+
+    조회 요청은 `/candidates/`, 후보별 `/policies/?candidate_id=`, 전체 `/policies/`로 나누고,
+    채팅은 인기 질문일수록 자주 반복되도록(Zipf 분포) 질문 목록에서 고르되 `unique_ratio` 비율은 매번 새 질문으로 보냅니다.
+    """
+
+    def __init__(self, candidate_ids: List[int], chat_ratio: float, stream_ratio: float, unique_ratio: float, seed: int):
+        self.candidate_ids = candidate_ids
+        self.chat_ratio = chat_ratio
+        self.stream_ratio = stream_ratio
+        self.unique_ratio = unique_ratio
+        self.seed = seed
+        self.questions = [template.format(topic=topic) for topic in TOPICS for template in QUESTION_TEMPLATES]
+        self.weights = [1 / (rank + 1) ** 1.1 for rank in range(len(self.questions))]
+        self.unique = 0
+
+    def user_rng(self, concurrency: int, index: int) -> random.Random:
+        return random.Random(f"{self.seed}-{concurrency}-{index}")
+
+    def next(self, rng: random.Random) -> tuple:
+        """(경로 이름, 메서드, URL, 본문) 반환"""
+        if rng.random() < self.chat_ratio:
+            if rng.random() < self.unique_ratio:
+                self.unique += 1
+                question = f"{rng.choice(self.questions)} (질문 {self.unique})"
+            else:
+                question = rng.choices(self.questions, self.weights)[0]
+            stream = rng.random() < self.stream_ratio
+            candidate_ids = sorted(rng.sample(self.candidate_ids, min(2, len(self.candidate_ids))))
+            body = {"question": question, "candidate_ids": candidate_ids, "stream": stream}
+            return ("POST /api/question (stream)" if stream else "POST /api/question"), "POST", "/api/question", body
+        roll = rng.random()
+        if roll < 0.4:
+            return "GET /candidates/", "GET", "/candidates/", None
+        if roll < 0.8:
+            return "GET /policies/?candidate_id", "GET", f"/policies/?candidate_id={rng.choice(self.candidate_ids)}", None
+        return "GET /policies/", "GET", "/policies/", None
+
+
+async def seed(client: httpx.AsyncClient, candidates: int, policies: int) -> List[int]:
+    """앱 API로 후보자와 정책을 등록하고 후보자 ID 목록을 반환하는 함수"""
+    candidate_ids = []
+    for i in range(candidates):
+        response = await client.post("/candidates/", json={"name": f"후보{i + 1}", "party": f"정당{i + 1}"})
+        response.raise_for_status()
+        candidate_ids.append(response.json()["id"])
+    for candidate_id in candidate_ids:
+        for j in range(policies):
+            response = await client.post(f"/policies/?candidate_id={candidate_id}", json=policy_fields(j))
+            response.raise_for_status()
+    return candidate_ids
+
+
+async def send(client: httpx.AsyncClient, method: str, url: str, body: Optional[dict]) -> tuple:
+    """(상태 코드, 첫 줄 도착 시간 또는 None) 반환"""
+    if body is not None and body.get("stream"):
+        start = time.perf_counter()
+        first_line = None
+        async with client.stream(method, url, json=body) as response:
+            async for line in response.aiter_lines():
+                if first_line is None and line:
+                    first_line = time.perf_counter() - start
+        return response.status_code, first_line
+    response = await client.request(method, url, json=body)
+    return response.status_code, None
+
+
+async def user(client: httpx.AsyncClient, workload: Workload, rng: random.Random, measure_from: float,
+               measure_until: float, think_time: float, samples: list) -> None:
+    while time.perf_counter() < measure_until:
+        route, method, url, body = workload.next(rng)
+        start = time.perf_counter()
+        try:
+            status, first_line = await send(client, method, url, body)
+        except httpx.HTTPError as e:
+            status, first_line = type(e).__name__, None
+        elapsed = time.perf_counter() - start
+        # 워밍업 구간에 시작한 요청은 제외
+        if start >= measure_from:
+            samples.append((route, status, elapsed, first_line))
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+def summarize(samples: list, duration: float) -> Dict[str, dict]:
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample[0]].append(sample)
+    routes = {}
+    for route, route_samples in sorted(by_route.items()):
+        ok = [elapsed for _, status, elapsed, _ in route_samples if status == 200]
+        first_lines = [first for _, status, _, first in route_samples if status == 200 and first is not None]
+        statuses = defaultdict(int)
+        for _, status, _, _ in route_samples:
+            if status != 200:
+                statuses[str(status)] += 1
+        routes[route] = {
+            "requests": len(route_samples),
+            "throughput": len(ok) / duration,
+            "p50_ms": statistics.median(ok) * 1000 if ok else None,
+            "p95_ms": percentile(ok, 0.95) * 1000 if ok else None,
+            "p99_ms": percentile(ok, 0.99) * 1000 if ok else None,
+            "first_line_p50_ms": statistics.median(first_lines) * 1000 if first_lines else None,
+            "errors": dict(statuses),
+        }
+    return routes
+
+
+async def run_stage(stack: Stack, workload: Workload, concurrency: int, duration: float, warmup: float,
+                    think_time: float) -> dict:
+    samples = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    calls_before = stack.llm_calls()
+    async with httpx.AsyncClient(base_url=stack.app_url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        await asyncio.gather(*(
+            user(client, workload, workload.user_rng(concurrency, i), measure_from, measure_from + duration,
+                 think_time, samples)
+            for i in range(concurrency)
+        ))
+    routes = summarize(samples, duration)
+    all_ok = [elapsed for _, status, elapsed, _ in samples if status == 200]
+    return {
+        "concurrency": concurrency,
+        "throughput": len(all_ok) / duration,
+        "p50_ms": statistics.median(all_ok) * 1000 if all_ok else None,
+        "p95_ms": percentile(all_ok, 0.95) * 1000 if all_ok else None,
+        "p99_ms": percentile(all_ok, 0.99) * 1000 if all_ok else None,
+        "errors": sum(sum(route["errors"].values()) for route in routes.values()),
+        "llm_calls": stack.llm_calls() - calls_before,
+        "routes": routes,
+        "workers": stack.memory(),
+    }
+
+
+# --- 출력/비교 ---
+
+def fmt_ms(value: Optional[float]) -> str:
+    return f"{value:8.1f}" if value is not None else "       -"
+
+
+def print_stage(stage: dict) -> None:
+    print(
+        f"\n동시 사용자 {stage['concurrency']:>4}  전체 {stage['throughput']:7.1f} req/s  p50 {fmt_ms(stage['p50_ms'])}ms  "
+        f"p95 {fmt_ms(stage['p95_ms'])}ms  p99 {fmt_ms(stage['p99_ms'])}ms  오류 {stage['errors']}  LLM 호출 {stage['llm_calls']}"
+    )
+    for route, summary in stage["routes"].items():
+        first_line = f"  첫 줄 p50 {fmt_ms(summary['first_line_p50_ms'])}ms" if summary["first_line_p50_ms"] is not None else ""
+        errors = f"  오류 {summary['errors']}" if summary["errors"] else ""
+        print(
+            f"  {route:<30} {summary['throughput']:7.1f} req/s  p50 {fmt_ms(summary['p50_ms'])}ms  "
+            f"p95 {fmt_ms(summary['p95_ms'])}ms  p99 {fmt_ms(summary['p99_ms'])}ms{first_line}{errors}"
+        )
+    memory = ", ".join(f"{worker['rss_mb']:.0f}MB (최대 {worker['peak_rss_mb']:.0f}MB)" for worker in stage["workers"])
+    print(f"  워커 메모리: {memory or '측정 불가'}")
+
+
+def compare(baseline: dict, current: dict, max_regression: float) -> List[str]:
+    """같은 동시 사용자 단계의 경로별 p95 지연과 처리량을 비교해 허용치를 넘은 항목을 반환하는 함수"""
+    print(f"\n기준 결과와 비교: {baseline['revision']} → {current['revision']}")
+    if baseline["params"] != current["params"]:
+        print("  경고: 실행 조건이 달라 비교 결과가 정확하지 않을 수 있습니다.")
+    regressions = []
+    base_stages = {stage["concurrency"]: stage for stage in baseline["stages"]}
+    for stage in current["stages"]:
+        base = base_stages.get(stage["concurrency"])
+        if base is None:
+            continue
+        for route, summary in stage["routes"].items():
+            base_route = base["routes"].get(route)
+            if not base_route or not base_route["p95_ms"] or not summary["p95_ms"]:
+                continue
+            p95_change = summary["p95_ms"] / base_route["p95_ms"] - 1
+            throughput_change = summary["throughput"] / base_route["throughput"] - 1 if base_route["throughput"] else 0.0
+            flag = ""
+            if p95_change > max_regression or throughput_change < -max_regression:
+                flag = "  ← 회귀"
+                regressions.append(
+                    f"동시 사용자 {stage['concurrency']} {route}: p95 {p95_change:+.0%}, 처리량 {throughput_change:+.0%}"
+                )
+            print(
+                f"  동시 {stage['concurrency']:>4} {route:<30} p95 {base_route['p95_ms']:8.1f} → {summary['p95_ms']:8.1f}ms "
+                f"({p95_change:+.0%})  처리량 {base_route['throughput']:7.1f} → {summary['throughput']:7.1f} "
+                f"({throughput_change:+.0%}){flag}"
+            )
+    return regressions
+
+
+async def run(args) -> dict:
+    env = {} if args.answer_cache else {"ANSWER_CACHE_ENABLED": "False"}
+    env["LOG_REQUESTS"] = "False"
+    # 모든 가상 사용자가 같은 IP에서 요청하므로 클라이언트별 빈도 제한은 끄고, 슬롯/대기열 제한(429)은 그대로 측정
+    env["CHAT_RATE_LIMIT"] = "0"
+    recorded_env = {key: value for key, value in sorted({**os.environ, **env}.items())
+                    if key.startswith(RECORDED_ENV_PREFIXES)}
+    params = {
+        "workers": args.workers, "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+        "think_time": args.think_time, "chat_ratio": args.chat_ratio, "stream_ratio": args.stream_ratio,
+        "unique_ratio": args.unique_ratio, "candidates": args.candidates, "policies": args.policies,
+        "latency": args.latency, "token_rate": args.token_rate, "error_rate": args.error_rate, "seed": args.seed,
+        "env": recorded_env,
+    }
+    result = {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "stages": [],
+    }
+
+    with Stack(args.workers, args.latency, args.token_rate, args.error_rate, env) as stack:
+        async with httpx.AsyncClient(base_url=stack.app_url, timeout=30) as client:
+            candidate_ids = await seed(client, args.candidates, args.policies)
+        workload = Workload(candidate_ids, args.chat_ratio, args.stream_ratio, args.unique_ratio, args.seed)
+        print(
+            f"커밋 {result['revision']}  워커 {args.workers}  LLM 지연 {args.latency}s / {args.token_rate} tok/s  "
+            f"채팅 비율 {args.chat_ratio:.0%}  단계별 {args.duration:.0f}s (워밍업 {args.warmup:.0f}s)"
+        )
+        for concurrency in args.concurrency:
+            stage = await run_stage(stack, workload, concurrency, args.duration, args.warmup, args.think_time)
+            result["stages"].append(stage)
+            print_stage(stage)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn 워커 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 25, 50, 100], help="단계별 동시 사용자 수")
+    parser.add_argument("--duration", type=float, default=10, help="단계별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2, help="단계별 워밍업 시간(초, 측정에서 제외)")
+    parser.add_argument("--think-time", type=float, default=0, help="사용자별 요청 사이 대기 시간(초)")
+    parser.add_argument("--chat-ratio", type=float, default=0.2, help="전체 요청 중 /api/question 비율")
+    parser.add_argument("--stream-ratio", type=float, default=0.5, help="채팅 중 스트리밍 요청 비율")
+    parser.add_argument("--unique-ratio", type=float, default=0.2, help="채팅 중 매번 새로운 질문의 비율")
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--policies", type=int, default=30, help="후보자별 정책 수")
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM 첫 토큰까지의 지연(초)")
+    parser.add_argument("--token-rate", type=float, default=50, help="fake LLM 초당 생성 토큰 수")
+    parser.add_argument("--error-rate", type=float, default=0, help="fake LLM이 429를 반환할 비율")
+    parser.add_argument("--no-answer-cache", dest="answer_cache", action="store_false", help="답변 캐시 끄기")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/load_test-<커밋>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용할 p95 증가/처리량 감소 비율")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    output = args.output or os.path.join(RESULTS_DIR, f"load_test-{result['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f), result, args.max_regression)
+        for regression in regressions:
+            print(f"실패: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
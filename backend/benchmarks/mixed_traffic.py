@@ -0,0 +1,171 @@
+"""
+조회/채팅 혼합 트래픽 부하 테스트
+
+SQLite DB와 fake LLM으로 앱을 프로세스 안에서 실행하고,
+`/candidates/`, `/policies/` 조회와 `/api/question` 채팅을 섞어 동시에 보내면서
+경로별 처리량과 지연 시간을 측정합니다. DB 호출이 이벤트 루프를 막지 않으면
+채팅이 LLM을 기다리는 동안에도 조회 요청이 계속 처리되어야 합니다.
+
+`--mode sync`는 비동기 엔진 도입 전 방식(async 핸들러 안에서 동기 세션으로 매 요청 조회)을 재현한 앱,
+`--mode async`는 현재 앱(비동기 세션 + 카탈로그 캐시)을 측정하고, `both`(기본값)는 둘을 차례로 측정해 비교합니다.
+LLM 호출은 두 방식 모두 같은 비동기 fake LLM을 사용하므로 차이는 DB 접근 방식에서 나옵니다.
+기존 방식은 채팅 요청이 LLM 응답을 기다리는 동안에도 세션의 커넥션을 붙잡고 있어, 동시 채팅이 풀 크기를 넘으면
+이벤트 루프 안에서 커넥션을 기다리느라 `DB_POOL_TIMEOUT`초씩 모든 요청이 멈춥니다.
+
+실행:
+    python -m benchmarks.mixed_traffic --concurrency 50 --duration 10 --chat-ratio 0.2
+    python -m benchmarks.mixed_traffic --mode sync --duration 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.common import TOPICS, configure_app_env, percentile, seed_catalog
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.db")
+configure_app_env(f"sqlite:///{DB_PATH}")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("ANSWER_CACHE_ENABLED", "False")
+
+from typing import List
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.ai import stream_ai_response
+from app.config import DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT
+from app.database import Candidate, Policy, dispose_engine
+from app.main import app
+from app.schemas import Candidate as CandidateSchema
+from app.schemas import Policy as PolicySchema
+from app.schemas import ChatRequest
+
+def sync_app(engine) -> FastAPI:
+    """비동기 엔진 도입 전 방식: async 핸들러 안에서 동기 세션으로 매 요청 조회 (쿼리 동안 이벤트 루프가 멈춤)"""
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+    baseline = FastAPI()
+
+    def get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @baseline.get("/candidates/", response_model=List[CandidateSchema])
+    async def read_candidates(db: Session = Depends(get_db)):
+        return db.query(Candidate).all()
+
+    @baseline.get("/policies/", response_model=List[PolicySchema])
+    async def read_policies(db: Session = Depends(get_db)):
+        return db.query(Policy).all()
+
+    @baseline.post("/api/question")
+    async def answer_question(request: ChatRequest, db: Session = Depends(get_db)):
+        policies = []
+        if request.candidate_ids:
+            policies = db.query(Policy).filter(Policy.candidate_id.in_(request.candidate_ids)).all()
+        answer, related_policies = "", []
+        async for event in stream_ai_response(request.question, policies):
+            if event["type"] == "policies":
+                related_policies = event["related_policies"]
+            elif event["type"] in ("done", "error"):
+                answer = event["answer"]
+        return JSONResponse(content={"answer": answer, "related_policies": related_policies})
+
+    return baseline
+
+
+async def worker(client: httpx.AsyncClient, candidate_ids: list, chat_ratio: float, deadline: float,
+                 results: dict, rng: random.Random) -> None:
+    while time.perf_counter() < deadline:
+        if rng.random() < chat_ratio:
+            route = "/api/question"
+            body = {"question": f"{rng.choice(TOPICS)} 정책은?", "candidate_ids": [rng.choice(candidate_ids)]}
+            start = time.perf_counter()
+            response = await client.post(route, json=body)
+        else:
+            route = rng.choice(["/candidates/", "/policies/"])
+            start = time.perf_counter()
+            response = await client.get(route)
+        elapsed = time.perf_counter() - start
+        results[route].append(elapsed if response.status_code == 200 else None)
+
+
+async def measure(target: FastAPI, candidate_ids: list, concurrency: int, duration: float, chat_ratio: float) -> dict:
+    results = defaultdict(list)
+    rng = random.Random(1)
+    # 앱 예외(풀 대기 시간 초과 등)는 500 응답으로 받아 실패로 집계
+    transport = httpx.ASGITransport(app=target, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            worker(client, candidate_ids, chat_ratio, deadline, results, random.Random(rng.random()))
+            for _ in range(concurrency)
+        ))
+    return results
+
+
+def report(label: str, results: dict, duration: float) -> dict:
+    throughput = {}
+    print(label)
+    for route, samples in sorted(results.items()):
+        ok = [sample for sample in samples if sample is not None]
+        throughput[route] = len(ok) / duration
+        if not ok:
+            print(f"  {route:<14} 성공 응답 없음 (실패 {len(samples)}건)")
+            continue
+        print(
+            f"  {route:<14} {len(ok) / duration:8.1f} req/s  "
+            f"p50: {statistics.median(ok) * 1000:7.1f}ms  p95: {percentile(ok, 0.95) * 1000:7.1f}ms  "
+            f"실패: {len(samples) - len(ok)}"
+        )
+    return throughput
+
+
+async def run(mode: str, concurrency: int, duration: float, chat_ratio: float, candidates: int, policies: int) -> None:
+    candidate_ids = await seed_catalog(candidates, policies)
+    print(f"동시 사용자: {concurrency}, 측정 시간: {duration:.0f}s, 채팅 비율: {chat_ratio:.0%}")
+
+    throughput = {}
+    if mode in ("sync", "both"):
+        # 커넥션 풀 설정은 비동기 엔진과 동일하게 (채팅 요청은 LLM 응답까지 세션의 커넥션을 붙잡고 있음)
+        engine = create_engine(f"sqlite:///{DB_PATH}", pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                               pool_timeout=DB_POOL_TIMEOUT)
+        results = await measure(sync_app(engine), candidate_ids, concurrency, duration, chat_ratio)
+        engine.dispose()
+        throughput["sync"] = report("동기 세션 (기존 방식)", results, duration)
+    if mode in ("async", "both"):
+        results = await measure(app, candidate_ids, concurrency, duration, chat_ratio)
+        throughput["async"] = report("비동기 세션 (현재 앱)", results, duration)
+    await dispose_engine()
+
+    if len(throughput) == 2:
+        for route, value in sorted(throughput["async"].items()):
+            baseline = throughput["sync"].get(route, 0.0)
+            ratio = f"{value / baseline:5.1f}배" if baseline else "   -"
+            print(f"처리량 비교 {route:<14} 동기 {baseline:8.1f} → 비동기 {value:8.1f} req/s ({ratio})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--chat-ratio", type=float, default=0.2)
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--policies", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(run(args.mode, args.concurrency, args.duration, args.chat_ratio, args.candidates, args.policies))
+
+
+if __name__ == "__main__":
+    main()
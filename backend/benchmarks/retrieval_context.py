@@ -0,0 +1,106 @@
+"""
+정책 검색(RAG) 컨텍스트 선택 벤치마크
+
+후보별로 많은 공약이 등록된 합성 DB(SQLite 메모리)에서
+기존 방식(후보의 모든 정책을 프롬프트에 포함)과 검색 방식(관련 정책 top-k, 토큰 예산 이내)의
+프롬프트 토큰 수와 전체 응답 지연을 비교합니다. fake LLM은 프롬프트 길이에 비례한 처리 시간을 흉내 냅니다.
+
+실행:
+    python -m benchmarks.retrieval_context --candidates 5 --policies 200 --match-count 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.common import configure_app_env
+
+configure_app_env()
+
+from app.ai import build_messages, collect_response, stream_ai_response
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.database import Candidate, Policy, SessionLocal, create_tables, dispose_engine
+from app.llm import FakeLLMClient, set_llm_client
+from app.retrieval import PolicyRetriever, estimate_tokens
+
+TOPICS = ["부동산", "청년 일자리", "저출생", "의료", "교육", "국방", "외교", "탄소중립", "연금", "교통", "농업", "디지털"]
+FILLER = "세부 이행 계획과 재원 조달 방안, 단계별 추진 일정, 관계 부처 협의 절차를 포함합니다. "
+
+
+async def seed(db, candidates: int, policies: int, rng: random.Random) -> list:
+    candidate_ids = []
+    for i in range(candidates):
+        candidate = Candidate(name=f"후보{i + 1}", party=f"정당{i + 1}")
+        db.add(candidate)
+        await db.flush()
+        candidate_ids.append(candidate.id)
+        for j in range(policies):
+            topic = TOPICS[j % len(TOPICS)]
+            db.add(Policy(
+                candidate_id=candidate.id,
+                title=f"{topic} 공약 {j + 1}",
+                category=topic,
+                description=f"{topic} 분야의 {j + 1}번째 공약입니다. " + FILLER * rng.randint(2, 6),
+            ))
+    await db.commit()
+    return candidate_ids
+
+
+def prompt_tokens(question: str, policies: list) -> int:
+    messages, _ = build_messages(question, policies)
+    return sum(estimate_tokens(message["content"]) for message in messages)
+
+
+async def run(candidates: int, policies: int, match_count: int, questions: int, latency: float, prefill_rate: float) -> None:
+    rng = random.Random(7)
+    await create_tables()
+    db = SessionLocal()
+    candidate_ids = await seed(db, candidates, policies, rng)
+    retriever = PolicyRetriever()
+    set_llm_client(FakeLLMClient(latency=latency, token_rate=0, prefill_rate=prefill_rate))
+
+    results = {"전체 포함": ([], []), "검색 top-k": ([], [])}
+    for _ in range(questions):
+        question = f"이 후보의 {rng.choice(TOPICS)} 정책은 무엇인가요?"
+        target = [rng.choice(candidate_ids)]
+
+        start = time.perf_counter()
+        query = select(Policy).options(selectinload(Policy.candidate)).where(Policy.candidate_id.in_(target))
+        selected = (await db.scalars(query)).all()
+        await collect_response(stream_ai_response(question, selected))
+        results["전체 포함"][0].append(prompt_tokens(question, selected))
+        results["전체 포함"][1].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        selected = await retriever.retrieve(db, question, target, match_count)
+        await collect_response(stream_ai_response(question, selected))
+        results["검색 top-k"][0].append(prompt_tokens(question, selected))
+        results["검색 top-k"][1].append(time.perf_counter() - start)
+
+    await db.close()
+    print(f"후보 {candidates}명 x 정책 {policies}개, 질문 {questions}개, match_count={match_count}")
+    for name, (tokens, durations) in results.items():
+        print(
+            f"{name:<8} 프롬프트 토큰 평균: {statistics.mean(tokens):9.0f}  "
+            f"응답 지연 p50: {statistics.median(durations) * 1000:8.1f}ms"
+        )
+    await dispose_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--policies", type=int, default=200)
+    parser.add_argument("--match-count", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--prefill-rate", type=float, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.candidates, args.policies, args.match_count, args.questions, args.latency, args.prefill_rate))
+
+
+if __name__ == "__main__":
+    main()
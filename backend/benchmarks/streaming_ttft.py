@@ -0,0 +1,63 @@
+"""
+스트리밍 응답의 첫 토큰 도착 시간(TTFT) 벤치마크
+
+fake LLM provider로 일괄 응답(stream_ai_response를 끝까지 모아 반환)과 스트리밍 응답을 비교합니다.
+일괄 응답은 전체 답변이 끝나야 반환되고, 스트리밍 응답은 첫 토큰이 도착하면 바로 전달됩니다.
+
+실행:
+    python -m benchmarks.streaming_ttft --latency 0.5 --token-rate 20 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.common import configure_app_env
+
+configure_app_env(os.getenv("DATABASE_URL", "sqlite://"))
+
+from app.ai import collect_response, stream_ai_response
+from app.llm import FakeLLMClient, set_llm_client
+
+
+async def measure_blocking(question: str) -> float:
+    start = time.perf_counter()
+    await collect_response(stream_ai_response(question))
+    return time.perf_counter() - start
+
+
+async def measure_streaming(question: str) -> tuple:
+    start = time.perf_counter()
+    first_token = None
+    async for event in stream_ai_response(question):
+        if event["type"] == "token" and first_token is None:
+            first_token = time.perf_counter() - start
+    return first_token, time.perf_counter() - start
+
+
+async def run(requests: int, latency: float, token_rate: float) -> None:
+    question = "이 후보의 부동산 정책은 무엇이고, 청년 주거 지원은 어떻게 달라지나요?"
+    set_llm_client(FakeLLMClient(latency=latency, token_rate=token_rate, max_concurrency=requests))
+
+    blocking = await asyncio.gather(*(measure_blocking(question) for _ in range(requests)))
+    streaming = await asyncio.gather(*(measure_streaming(question) for _ in range(requests)))
+    ttft = [first for first, _ in streaming]
+    total = [end for _, end in streaming]
+
+    print(f"요청 수: {requests}, 첫 토큰 지연: {latency:.2f}s, 토큰 속도: {token_rate:.0f}/s")
+    print(f"일괄 응답   - 첫 바이트까지 p50: {statistics.median(blocking):.3f}s")
+    print(f"스트리밍    - 첫 토큰까지  p50: {statistics.median(ttft):.3f}s, 완료까지 p50: {statistics.median(total):.3f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--token-rate", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency, args.token_rate))
+
+
+if __name__ == "__main__":
+    main()
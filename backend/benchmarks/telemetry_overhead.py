@@ -0,0 +1,105 @@
+"""
+계측(지표/요청 로그) 오버헤드 마이크로벤치마크
+
+1) 단계 기록(`telemetry.stage`), 히스토그램 관측, 카운터 증가 1회의 비용(ns)을 측정하고
+2) 가장 가벼운 채팅 경로(답변 캐시 적중)를 계측 on/off로 반복 호출해 요청당 추가 시간(µs)을 비교합니다.
+요청 로그는 /dev/null로 보내 JSON 직렬화 비용까지 포함합니다.
+`--max-overhead-us`를 지정하면 요청당 추가 시간이 이를 넘을 때 0이 아닌 종료 코드로 끝납니다.
+
+실행:
+    python -m benchmarks.telemetry_overhead --iterations 200000 --requests 500 --rounds 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from benchmarks.common import configure_app_env
+
+configure_app_env()
+
+import httpx
+
+from app.cache import answer_cache
+from app.main import app, match_count
+from app.schemas import ChatRequest, ChatResponse
+from app.telemetry import Counter, Histogram, telemetry
+
+
+def per_op_ns(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def micro(iterations: int) -> None:
+    histogram = Histogram("bench_seconds", "bench", ("stage",))
+    counter = Counter("bench_total", "bench", ("source",))
+
+    def stage():
+        with telemetry.stage("bench"):
+            pass
+
+    baseline = per_op_ns(lambda: None, iterations)
+    print(f"빈 호출                {baseline:7.0f}ns")
+    print(f"Histogram.observe      {per_op_ns(lambda: histogram.observe(0.0123, stage='db'), iterations) - baseline:7.0f}ns")
+    print(f"Counter.inc            {per_op_ns(lambda: counter.inc(source='cache'), iterations) - baseline:7.0f}ns")
+    print(f"telemetry.stage        {per_op_ns(stage, iterations) - baseline:7.0f}ns")
+
+
+async def request_latency(client: httpx.AsyncClient, requests: int) -> float:
+    """캐시 적중 채팅 요청 1건의 평균 처리 시간(µs)"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.post("/chat/", json={"question": "청년 주거 정책"})
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def end_to_end(requests: int, rounds: int) -> float:
+    # /chat/과 같은 키(기본 match_count)로 저장해야 캐시 적중 경로를 측정
+    request = ChatRequest(question="청년 주거 정책")
+    await answer_cache.set(request.question, None, ChatResponse(answer="캐시된 답변", related_policies=[]),
+                           match_count=match_count(request))
+    for handler in logging.getLogger("algovote").handlers:
+        handler.setStream(open(os.devnull, "w"))
+
+    modes = [("계측 off", False, False), ("지표만", True, False), ("지표 + 요청 로그", True, True)]
+    results = {label: [] for label, _, _ in modes}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await request_latency(client, 200)  # 워밍업
+        # 잡음을 줄이기 위해 모드를 번갈아 여러 번 측정하고 가장 빠른 값을 사용
+        for _ in range(rounds):
+            for label, enabled, log_requests in modes:
+                telemetry.enabled, telemetry.log_requests = enabled, log_requests
+                results[label].append(await request_latency(client, requests))
+
+    baseline = min(results["계측 off"])
+    overhead = 0.0
+    for label, _, _ in modes:
+        latency = min(results[label])
+        overhead = latency - baseline
+        print(f"캐시 적중 /chat/ {label:<12} {latency:7.1f}µs  요청당 추가 {overhead:6.1f}µs ({overhead / baseline:+.1%})")
+    return overhead
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=500, help="라운드당 요청 수")
+    parser.add_argument("--rounds", type=int, default=8)
+    parser.add_argument("--max-overhead-us", type=float, default=0, help="요청당 허용 추가 시간 (0이면 확인하지 않음)")
+    args = parser.parse_args()
+
+    micro(args.iterations)
+    overhead = asyncio.run(end_to_end(args.requests, args.rounds))
+    if args.max_overhead_us and overhead > args.max_overhead_us:
+        print(f"실패: 요청당 계측 오버헤드 {overhead:.1f}µs > 예산 {args.max_overhead_us:.1f}µs")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+화자 단위 토론 청크 분할
+
+발화 경계를 넘지 않도록 같은 화자의 연속 발화만 하나의 청크로 묶고,
+청크마다 화자/방송일/원본 위치 메타데이터를 붙입니다.
+"""
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:
+    from ingest import Chunk
+except ImportError:  # backend 디렉터리에서 preprocess.chunking으로 불러온 경우 (벤치마크 등)
+    from preprocess.ingest import Chunk
+
+# extract_debate.py의 txt 출력 형식: "(화자) 발화" (발화가 여러 줄이면 다음 줄로 이어짐)
+TXT_UTTERANCE = re.compile(r"^\((.*?)\)\s?(.*)$")
+SENTENCE_END = re.compile(r"(?<=[.?!。])\s+")
+DATE_IN_NAME = re.compile(r"(\d{4}\.\d{2}\.\d{2})")
+
+
+def load_utterances(path: str) -> List[Dict[str, Any]]:
+    """
+    extract_debate.py 결과 파일에서 발화 목록을 읽는 함수
+
+    `.jsonl`은 발화별 레코드를 그대로, `.txt`는 '(화자) 발화' 형식을 해석해 같은 형태로 반환합니다.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    name = os.path.basename(path)
+    date_match = DATE_IN_NAME.search(name)
+    utterances: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            match = TXT_UTTERANCE.match(line)
+            if match:
+                utterances.append({
+                    "speaker": match.group(1).strip(),
+                    "text": match.group(2),
+                    "date": date_match.group(1) if date_match else None,
+                    "source": name,
+                    "index": len(utterances),
+                })
+            elif utterances:
+                utterances[-1]["text"] += "\n" + line
+    return utterances
+
+
+def split_text(text: str, max_chars: int) -> Iterator[str]:
+    """max_chars를 넘는 발화를 문장 경계에서 나누는 제너레이터 (한 문장이 더 길면 글자 수로 자름)"""
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            if current:
+                yield current
+                current = ""
+            yield sentence[:max_chars]
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            yield current
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        yield current
+
+
+def chunk_utterances(utterances: Iterable[Dict[str, Any]], max_chars: int = 1000) -> List[Chunk]:
+    """
+    발화 목록을 화자 단위 청크로 묶는 함수
+
+    같은 화자의 연속 발화는 max_chars 이내에서 합치고, 화자가 바뀌면 항상 새 청크를 시작합니다.
+    청크 본문은 기존과 같이 '(화자) 발화' 형식이며 메타데이터에 speaker, date, source,
+    first_index/last_index(발화 순번 범위)를 기록합니다.
+    """
+    chunks: List[Chunk] = []
+    current: List[Dict[str, Any]] = []
+    pieces: List[str] = []
+
+    def flush():
+        if not current:
+            return
+        first, last = current[0], current[-1]
+        chunks.append(Chunk(
+            content=f"({first['speaker']}) " + "\n".join(pieces),
+            metadata={
+                "speaker": first["speaker"],
+                "date": first.get("date"),
+                "source": first.get("source"),
+                "first_index": first.get("index"),
+                "last_index": last.get("index"),
+            },
+        ))
+        current.clear()
+        pieces.clear()
+
+    for utterance in utterances:
+        if current and current[0]["speaker"] != utterance["speaker"]:
+            flush()
+        for piece in split_text(utterance["text"].strip(), max_chars):
+            size = sum(len(p) + 1 for p in pieces)
+            if pieces and size + len(piece) > max_chars:
+                flush()
+            current.append(utterance)
+            pieces.append(piece)
+    flush()
+    return chunks
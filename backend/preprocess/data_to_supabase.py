@@ -1,58 +1,66 @@
 from dotenv import load_dotenv
+import argparse
 import os
-import time
-
-from supabase import create_client
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain.document_loaders import TextLoader
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_community.vectorstores import SupabaseVectorStore
-from langchain_google_genai._common import GoogleGenerativeAIError
-
-from langchain.chains import LLMChain
-
-# .env 파일 로드
-load_dotenv()
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
-supabase = create_client(supabase_url, supabase_key)
-google_api_key = os.getenv("GOOGLE_API_KEY")
-
-embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-exp-03-07", google_api_key=google_api_key)
-
-# 파일 경로 및 이름 설정
-file_path = "../preprocess/2025.05.02.txt"
-file_name = os.path.basename(file_path)
-
-# 문서 불러오기 (.txt 파일)
-loader = TextLoader(file_path, encoding="utf-8")
-documents = loader.load()
-
-# Splitter 정의 및 실행
-text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=20)
-
-docs = text_splitter.split_documents(documents)
-
-i = 0
-for doc in docs:
-    success = False
-    while not success:
-        try:
-            SupabaseVectorStore.from_documents(
-                documents=[doc],
-                embedding=embeddings,
-                client=supabase,
-                table_name="debate_information"
-            )
-            print(f"{len(docs)}개 중 {i+1}개 완료, ✅대기중...")
-            time.sleep(3)
-            success = True  # 성공 시 루프 탈출
-        except GoogleGenerativeAIError as e:
-            if "429" in str(e) or "Resource has been exhausted" in str(e):
-                print("⚠️ 429 에러 발생: 리소스 초과. 5초 대기 후 재시도합니다...")
-                time.sleep(5)
-            else:
-                raise e  # 다른 예외는 그대로 발생
-    i += 1
-
-print("모든 배치가 Supabase에 업로드 완료되었습니다.")
\ No newline at end of file
+
+from chunking import chunk_utterances, load_utterances
+from ingest import Checkpoint, IngestionPipeline, SupabaseStore, TokenBucket, post_debate_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토론 자료를 임베딩해 Supabase에 적재합니다.")
+    parser.add_argument("file_path", nargs="?", default="../preprocess/2025.05.02.txt",
+                        help="extract_debate.py 결과 파일 (.jsonl 권장, .txt도 가능)")
+    parser.add_argument("--table", default="debate_information")
+    parser.add_argument("--batch-size", type=int, default=32, help="임베딩 요청 1회에 넣을 청크 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 진행할 임베딩 요청 수")
+    parser.add_argument("--rpm", type=float, default=60, help="분당 최대 임베딩 요청 수")
+    parser.add_argument("--max-chars", type=int, default=1000, help="청크 최대 글자 수 (화자가 바뀌면 항상 새 청크)")
+    parser.add_argument("--checkpoint", default=None, help="적재 완료 기록 파일 (기본: <파일명>.ingested, --backend-url이면 <파일명>.posted)")
+    parser.add_argument("--backend-url", default=None,
+                        help="지정하면 Supabase 대신 백엔드 POST /debates/에 청크를 등록 (예: http://localhost:8000)")
+    args = parser.parse_args()
+
+    # 파일 경로 설정
+    file_path = args.file_path
+
+    # 발화 경계를 넘지 않는 화자 단위 청크 (메타데이터: speaker, date, source, 발화 순번 범위)
+    chunks = chunk_utterances(load_utterances(file_path), max_chars=args.max_chars)
+
+    # 백엔드 /debates/search용 청크 등록 (임베딩 없이 speaker/date/source 메타데이터와 본문만 전송)
+    if args.backend_url:
+        posted = post_debate_chunks(
+            chunks,
+            args.backend_url,
+            checkpoint=Checkpoint(args.checkpoint or f"{file_path}.posted"),
+        )
+        print(f"{posted}개 청크를 백엔드에 등록했습니다.")
+        return
+
+    from supabase import create_client
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    # .env 파일 로드
+    load_dotenv()
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
+    supabase = create_client(supabase_url, supabase_key)
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+
+    embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-exp-03-07", google_api_key=google_api_key)
+
+    # 배치 임베딩 + 병렬 요청 + 속도 제한, 재실행 시 이미 적재한 청크는 건너뜀
+    pipeline = IngestionPipeline(
+        embedder=embeddings,
+        store=SupabaseStore(supabase, table_name=args.table),
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        rate_limiter=TokenBucket(rate=args.rpm / 60, capacity=args.workers),
+        checkpoint=Checkpoint(args.checkpoint or f"{file_path}.ingested"),
+    )
+    pipeline.run(chunks)
+
+    print("모든 배치가 Supabase에 업로드 완료되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,281 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# 방송 자료는 <br> 또는 개행으로 줄이 나뉘며, 한 줄이 매우 길 수 있으므로 블록 단위로 읽음
+LINE_BREAK = re.compile(r"<br\s*/?>|\n")
+BROADCAST_DATE = re.compile(r"방송일시\s*:\s*(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})")
+UTTERANCE = re.compile(r"-\((.*?)\)\s*(.*)", re.DOTALL)
+DIALOGUE_START = "-(사회자)"
+DIALOGUE_END = "여러분, 고맙습니다."
+BLOCK_SIZE = 1 << 20
+MANIFEST_NAME = ".extract_manifest.json"
+
+
+@dataclass
+class Utterance:
+    speaker: str
+    text: str
+    date: str
+    source: str
+    index: int
+    offset: int  # 원본 파일에서 발화가 시작하는 문자 위치
+
+
+def iter_lines(f: TextIO, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, str]]:
+    """파일을 블록 단위로 읽어 (원본 문자 위치, 줄) 을 차례로 반환하는 제너레이터"""
+    buffer, base = "", 0
+    while True:
+        block = f.read(block_size)
+        if not block:
+            break
+        buffer += block
+        last = 0
+        for match in LINE_BREAK.finditer(buffer):
+            yield base + last, buffer[last:match.start()]
+            last = match.end()
+        # 마지막 줄(블록 끝에서 잘린 "<br" 포함)은 아직 끝나지 않았을 수 있으므로 다음 블록과 합침
+        buffer, base = buffer[last:], base + last
+    if buffer:
+        yield base, buffer
+
+
+def find_broadcast_date(path: str) -> Optional[str]:
+    """방송일시('방송일시 : 2025. 5. 2.')를 찾아 'YYYY.MM.DD' 형식으로 반환하는 함수"""
+    with open(path, "r", encoding="utf-8") as f:
+        for _, line in iter_lines(f):
+            match = BROADCAST_DATE.search(line)
+            if match:
+                year, month, day = match.groups()
+                return f"{int(year):04d}.{int(month):02d}.{int(day):02d}"
+    return None
+
+
+def iter_utterances(path: str, date: str) -> Iterator[Utterance]:
+    """
+    -(사회자) ~ '여러분, 고맙습니다.' 구간에서 -(화자) 발화를 하나씩 반환하는 제너레이터
+
+    파일 전체를 메모리에 올리지 않고 줄 단위로 처리하므로, 메모리 사용량은 가장 긴 발화 크기로 제한됩니다.
+    """
+    source = os.path.basename(path)
+    started = False
+    index = 0
+    current: Optional[Tuple[int, str, List[str]]] = None
+
+    def flush() -> Optional[Utterance]:
+        nonlocal index
+        if current is None:
+            return None
+        offset, speaker, lines = current
+        text = "\n".join(lines).strip()
+        if not text:
+            return None
+        index += 1
+        return Utterance(speaker=speaker.strip(), text=text, date=date, source=source, index=index - 1, offset=offset)
+
+    with open(path, "r", encoding="utf-8") as f:
+        for offset, line in iter_lines(f):
+            if not started:
+                start = line.find(DIALOGUE_START)
+                if start == -1:
+                    continue
+                started = True
+                line, offset = line[start:], offset + start
+
+            match = UTTERANCE.match(line) if line.startswith("-(") else None
+            if match:
+                utterance = flush()
+                if utterance:
+                    yield utterance
+                current = (offset, match.group(1), [match.group(2)])
+            elif current is not None:
+                current[2].append(line)
+
+            if DIALOGUE_END in line:
+                break
+
+    utterance = flush()
+    if utterance:
+        yield utterance
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_owner(jsonl_path: str) -> Optional[str]:
+    """기존 결과 파일을 만든 방송 자료 이름 (첫 레코드의 source, 없으면 None)"""
+    try:
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            return json.loads(f.readline()).get("source")
+    except (OSError, ValueError):
+        return None
+
+
+def claim_output(output_dir: str, date: str, source: str) -> str:
+    """
+    결과 파일 경로(확장자 제외)를 정하는 함수
+
+    기본은 `<날짜>`이고, 같은 날짜의 다른 방송 자료가 그 이름의 결과를 이미 만들었거나 동시에 만드는 중이면
+    `<날짜>_<원본 파일 이름>`을 사용합니다. 임시 파일을 배타적으로 만들어 이름을 선점하므로
+    여러 프로세스가 같은 파일에 동시에 쓰지 않습니다.
+    """
+    stem = os.path.splitext(source)[0]
+    for name in (date, f"{date}_{stem}"):
+        base = os.path.join(output_dir, name)
+        try:
+            open(base + ".jsonl.tmp", "x").close()
+        except FileExistsError:
+            continue
+        if output_owner(base + ".jsonl") in (None, source):
+            return base
+        os.remove(base + ".jsonl.tmp")
+    raise FileExistsError(f"결과 파일 이름이 이미 사용 중입니다: {os.path.join(output_dir, date)}_{stem}")
 
 
 def extract_dialogue_from_php(file_path, output_dir='../../src/data'):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """
+    방송 자료 1개에서 발화를 추출해 저장하는 함수
+
+    `<날짜>.txt`에는 기존과 같은 '(화자) 발화' 형식으로, `<날짜>.jsonl`에는 발화별 레코드
+    (speaker, text, date, source, index, offset)로 저장합니다.
+    같은 날짜의 다른 방송 자료가 있으면 `<날짜>_<원본 파일 이름>`으로 저장합니다.
+
+    Returns:
+        Optional[str]: 저장한 txt 파일 경로 (방송일시/대화 블록을 찾지 못하면 None)
+    """
+    formatted_date = find_broadcast_date(file_path)
+    if not formatted_date:
+        print(f"방송일시를 찾을 수 없습니다: {file_path}")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = claim_output(output_dir, formatted_date, os.path.basename(file_path))
+    output_txt_path = base + ".txt"
+    output_jsonl_path = base + ".jsonl"
+
+    count = 0
+    with open(output_txt_path + ".tmp", 'w', encoding='utf-8') as txt, \
+            open(output_jsonl_path + ".tmp", 'w', encoding='utf-8') as jsonl:
+        for utterance in iter_utterances(file_path, formatted_date):
+            txt.write(f"({utterance.speaker}) {utterance.text}\n")
+            jsonl.write(json.dumps(asdict(utterance), ensure_ascii=False) + "\n")
+            count += 1
+
+    if count == 0:
+        os.remove(output_txt_path + ".tmp")
+        os.remove(output_jsonl_path + ".tmp")
+        print(f"대화 블록을 찾을 수 없습니다: {file_path}")
+        return None
 
-    # 방송일시 추출: '방송일시 : 2025. 5. 2.'
-    date_match = re.search(r'방송일시\s*:\s*(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})', content)
+    # 완성된 파일만 보이도록 마지막에 이름 변경
+    os.replace(output_txt_path + ".tmp", output_txt_path)
+    os.replace(output_jsonl_path + ".tmp", output_jsonl_path)
+    print(f"[{count}개의 발화를 .txt 파일로 저장했습니다: {output_txt_path}")
+    return output_txt_path
 
-    if not date_match:
-        print("방송일시를 찾을 수 없습니다.")
-        return
 
-    year, month, day = date_match.groups()
-    formatted_date = f"{int(year):04d}.{int(month):02d}.{int(day):02d}"
-    output_txt_path = f"{output_dir}{formatted_date}.txt"
+def file_stat(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
 
-    # <br>를 개행으로 변환
-    content = content.replace('<br>', '\n')
 
-    # -(사회자) ~ 여러분, 고맙습니다. 구간 추출
-    dialogue_block_match = re.search(r'(-\(사회자\).*?여러분, 고맙습니다\.[^\n]*\n?)', content, re.DOTALL)
+def _extract_job(job: Tuple[str, str, Optional[Dict[str, str]]]) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+    # 내용 해시도 작업 프로세스에서 계산해 대용량 입력을 읽는 시간이 병렬로 처리되도록 함
+    path, output_dir, previous = job
+    entry = {**file_stat(path), "hash": file_hash(path)}
+    if previous and previous["hash"] == entry["hash"] and os.path.exists(previous["output"]):
+        # 수정 시각만 바뀌고 내용은 같은 경우
+        return path, {**entry, "output": previous["output"]}, False
+    output = extract_dialogue_from_php(path, output_dir)
+    if output is None:
+        return path, None, False
+    return path, {**entry, "output": os.path.abspath(output)}, True
 
-    if not dialogue_block_match:
-        print("대화 블록을 찾을 수 없습니다.")
-        return
 
-    dialogue_block = dialogue_block_match.group(1)
+def load_manifest(output_dir: str) -> Dict[str, Dict[str, str]]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
-    # -(화자) 발화내용 추출
-    pattern = r'-\((.*?)\)\s*(.*?)(?=\n-\(|\Z)'
-    matches = re.findall(pattern, dialogue_block, re.DOTALL)
 
-    with open(output_txt_path, 'w', encoding='utf-8') as f:
-        for speaker, text in matches:
-            cleaned_text = text.strip()
-            if cleaned_text:
-                f.write(f"({speaker.strip()}) {cleaned_text}\n")
+def save_manifest(output_dir: str, manifest: Dict[str, Dict[str, str]]) -> None:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
 
-    print(f"[{len(matches)}개의 발화를 .txt 파일로 저장했습니다: {output_txt_path}")
+
+def extract_many(paths: List[str], output_dir: str = '../../src/data', workers: Optional[int] = None) -> List[str]:
+    """
+    여러 방송 자료를 프로세스 풀로 병렬 처리하는 함수
+
+    파일 크기/수정 시각과 내용 해시를 `output_dir/.extract_manifest.json`에 기록해, 지난 실행 이후 바뀌지 않았고
+    결과 파일이 남아 있는 방송 자료는 다시 처리하지 않습니다. 크기와 수정 시각이 같으면 해시 계산 없이 건너뛰고,
+    다르면 작업 프로세스에서 해시를 계산해 내용이 실제로 바뀐 경우에만 다시 추출합니다.
+
+    Returns:
+        List[str]: 이번 실행에서 새로 저장한 txt 파일 경로 목록
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    # 이전 실행이 중단되며 남긴 임시 파일은 결과 파일 이름 선점을 방해하므로 삭제
+    for stale in glob.glob(os.path.join(output_dir, "*.tmp")):
+        os.remove(stale)
+
+    jobs = []
+    for path in paths:
+        previous = manifest.get(os.path.abspath(path))
+        if previous and os.path.exists(previous["output"]) and \
+                (previous.get("size"), previous.get("mtime_ns")) == tuple(file_stat(path).values()):
+            print(f"변경 없음, 건너뜀: {path}")
+            continue
+        jobs.append((path, output_dir, previous))
+
+    written = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, entry, extracted in executor.map(_extract_job, jobs):
+                if entry is None:
+                    continue
+                manifest[os.path.abspath(path)] = entry
+                if extracted:
+                    written.append(entry["output"])
+                else:
+                    print(f"내용 변경 없음, 건너뜀: {path}")
+        save_manifest(output_dir, manifest)
+    return written
+
+
+def collect_paths(inputs: List[str], pattern: str) -> List[str]:
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, pattern))))
+        else:
+            paths.append(item)
+    return paths
 
 
 if __name__ == "__main__":
-    extract_dialogue_from_php('../../src/data/broadcast03_2020.php')
+    parser = argparse.ArgumentParser(description="방송 자료에서 토론 발화를 추출합니다.")
+    parser.add_argument("inputs", nargs="*", default=['../../src/data/broadcast03_2020.php'],
+                        help="방송 자료 파일 또는 디렉터리")
+    parser.add_argument("--output-dir", default='../../src/data')
+    parser.add_argument("--pattern", default="*.php", help="디렉터리 입력 시 처리할 파일 패턴")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+
+    extract_many(collect_paths(args.inputs, args.pattern), args.output_dir, args.workers)
@@ -0,0 +1,327 @@
+"""
+토론 자료 임베딩 적재 파이프라인
+
+청크를 배치로 묶어 임베딩하고, 동시 요청 수와 요청 속도(토큰 버킷)를 제한하면서 벡터 저장소에 일괄 저장합니다.
+처리한 청크의 내용 해시를 체크포인트 파일에 기록하므로, 중간에 실패해도 다시 실행하면 이미 적재한 청크는 건너뜁니다.
+임베딩 모델과 벡터 저장소는 교체할 수 있어 로컬에서는 FakeEmbedder + SQLiteVectorStore로 전체 흐름을 시험할 수 있습니다.
+`post_debate_chunks`는 임베딩 없이 같은 청크를 백엔드 `POST /debates/`에 등록합니다.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
+
+Vector = List[float]
+
+
+@dataclass
+class Chunk:
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def content_hash(self) -> str:
+        payload = self.content + "\0" + json.dumps(self.metadata, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Embedder(Protocol):
+    """여러 문장을 한 번의 요청으로 임베딩하는 객체 (LangChain Embeddings와 호환)"""
+
+    def embed_documents(self, texts: List[str]) -> List[Vector]:
+        ...
+
+
+class VectorStore(Protocol):
+    """임베딩된 청크를 일괄 저장하는 객체"""
+
+    def add(self, rows: Sequence[Tuple[Chunk, Vector]]) -> None:
+        ...
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷 속도 제한기
+
+    초당 `rate`개씩 토큰이 채워지며 최대 `capacity`개까지 모아 둘 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Checkpoint:
+    """적재가 끝난 청크의 내용 해시를 한 줄에 하나씩 기록하는 파일"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.done = {line.strip() for line in f if line.strip()}
+
+    def record(self, hashes: Iterable[str]) -> None:
+        hashes = list(hashes)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(f"{content_hash}\n" for content_hash in hashes)
+                f.flush()
+                os.fsync(f.fileno())
+            self.done.update(hashes)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    message = str(error)
+    return "429" in message or "Resource has been exhausted" in message or "rate limit" in message.lower()
+
+
+@dataclass
+class IngestStats:
+    total: int = 0
+    skipped: int = 0
+    embedded: int = 0
+    batches: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.embedded / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class IngestionPipeline:
+    """
+    배치 임베딩 + 병렬 요청 + 속도 제한 + 체크포인트 기반 재시작을 지원하는 적재 파이프라인
+
+    Args:
+        embedder: 임베딩 모델
+        store: 벡터 저장소
+        batch_size: 한 번의 임베딩 요청에 넣을 청크 수
+        max_workers: 동시에 진행할 임베딩 요청 수
+        rate_limiter: 임베딩 요청 속도 제한기 (배치 1개 = 토큰 1개)
+        checkpoint: 적재 완료 청크 기록 (None이면 재시작 시 처음부터)
+        max_retries: 429 발생 시 배치당 최대 재시도 횟수
+        retry_backoff: 재시도 기본 대기 시간(초), 시도마다 2배씩 증가
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        store: VectorStore,
+        batch_size: int = 32,
+        max_workers: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        max_retries: int = 6,
+        retry_backoff: float = 2.0,
+        log=print,
+    ):
+        self.embedder = embedder
+        self.store = store
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.checkpoint = checkpoint
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.log = log
+        self._stats_lock = threading.Lock()
+
+    def run(self, chunks: Iterable[Chunk]) -> IngestStats:
+        stats = IngestStats()
+        start = time.perf_counter()
+
+        # 체크포인트에 있거나 입력 안에서 중복된 청크는 건너뜀
+        done = self.checkpoint.done if self.checkpoint else set()
+        pending, seen = [], set()
+        for chunk in chunks:
+            stats.total += 1
+            content_hash = chunk.content_hash
+            if content_hash in done or content_hash in seen:
+                stats.skipped += 1
+                continue
+            seen.add(content_hash)
+            pending.append(chunk)
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        self.log(f"전체 {stats.total}개 중 {stats.skipped}개는 이미 적재됨, {len(pending)}개를 {len(batches)}개 배치로 적재합니다.")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 결과를 순서대로 소비하면서 첫 예외가 있으면 그대로 전파
+            for _ in executor.map(lambda batch: self._process(batch, stats, len(batches)), batches):
+                pass
+
+        stats.elapsed = time.perf_counter() - start
+        self.log(f"적재 완료: {stats.embedded}개 ({stats.chunks_per_sec:.1f} chunks/sec, 재시도 {stats.retries}회)")
+        return stats
+
+    def _process(self, batch: List[Chunk], stats: IngestStats, total_batches: int) -> None:
+        vectors = self._embed(batch, stats)
+        self.store.add(list(zip(batch, vectors)))
+        if self.checkpoint:
+            self.checkpoint.record(chunk.content_hash for chunk in batch)
+        with self._stats_lock:
+            stats.embedded += len(batch)
+            stats.batches += 1
+            self.log(f"{total_batches}개 배치 중 {stats.batches}개 완료 ({stats.embedded}개 청크)")
+
+    def _embed(self, batch: List[Chunk], stats: IngestStats) -> List[Vector]:
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                return self.embedder.embed_documents([chunk.content for chunk in batch])
+            except Exception as e:
+                if not is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                self.log(f"⚠️ 429 에러 발생: 리소스 초과. {delay:.1f}초 대기 후 재시도합니다...")
+                with self._stats_lock:
+                    stats.retries += 1
+                time.sleep(delay)
+                attempt += 1
+
+
+class FakeEmbedder:
+    """외부 API 없이 내용 해시로 결정적인 벡터를 만드는 테스트용 임베딩 모델"""
+
+    def __init__(self, dimension: int = 768, latency: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency  # 요청(배치)당 지연(초)
+
+    def embed_documents(self, texts: List[str]) -> List[Vector]:
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = []
+        for text in texts:
+            seed = hashlib.sha256(text.encode("utf-8")).digest()
+            vector = [(seed[i % len(seed)] - 127.5) / 127.5 for i in range(self.dimension)]
+            norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+            vectors.append([v / norm for v in vector])
+        return vectors
+
+
+class SQLiteVectorStore:
+    """로컬 시험용 SQLite 벡터 저장소 (content_hash 기준으로 중복 저장하지 않음)"""
+
+    def __init__(self, path: str, table_name: str = "debate_information"):
+        self.table_name = table_name
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} ("
+            "content_hash TEXT PRIMARY KEY, content TEXT, metadata TEXT, embedding TEXT)"
+        )
+        self._conn.commit()
+
+    def add(self, rows: Sequence[Tuple[Chunk, Vector]]) -> None:
+        values = [
+            (chunk.content_hash, chunk.content, json.dumps(chunk.metadata, ensure_ascii=False), json.dumps(vector))
+            for chunk, vector in rows
+        ]
+        with self._lock:
+            self._conn.executemany(f"INSERT OR IGNORE INTO {self.table_name} VALUES (?, ?, ?, ?)", values)
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+
+
+class SupabaseStore:
+    """
+    Supabase(pgvector) 저장소
+
+    LangChain SupabaseVectorStore와 같은 테이블 구조(id, content, metadata, embedding)를 사용하며,
+    id를 내용 해시에서 만든 UUID로 지정해 upsert하므로 같은 청크를 다시 적재해도 중복되지 않습니다.
+    """
+
+    def __init__(self, client, table_name: str = "debate_information"):
+        self.client = client
+        self.table_name = table_name
+
+    def add(self, rows: Sequence[Tuple[Chunk, Vector]]) -> None:
+        records = [
+            {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, chunk.content_hash)),
+                "content": chunk.content,
+                "metadata": {**chunk.metadata, "content_hash": chunk.content_hash},
+                "embedding": vector,
+            }
+            for chunk, vector in rows
+        ]
+        self.client.table(self.table_name).upsert(records).execute()
+
+
+def debate_chunk_record(chunk: Chunk) -> Dict[str, Any]:
+    """청크를 백엔드 `POST /debates/` 요청 항목(DebateChunkCreate: speaker, content, date, source)으로 바꾸는 함수"""
+    return {
+        "speaker": chunk.metadata["speaker"],
+        "content": chunk.content,
+        "date": chunk.metadata.get("date"),
+        "source": chunk.metadata.get("source"),
+    }
+
+
+def post_debate_chunks(
+    chunks: Iterable[Chunk],
+    backend_url: str,
+    batch_size: int = 200,
+    checkpoint: Optional[Checkpoint] = None,
+    timeout: float = 30.0,
+    log=print,
+) -> int:
+    """
+    화자 단위 청크를 백엔드 `POST /debates/`에 배치로 등록하고 등록한 청크 수를 반환하는 함수
+
+    `/debates/`는 같은 청크를 다시 받으면 중복 저장하므로, 체크포인트에 기록된 청크와 입력 안의 중복은 보내지 않습니다.
+    배치마다 응답을 받은 뒤 체크포인트에 기록하므로 실패 후 다시 실행하면 남은 배치부터 등록합니다.
+    """
+    done = checkpoint.done if checkpoint else set()
+    pending, seen = [], set()
+    for chunk in chunks:
+        content_hash = chunk.content_hash
+        if content_hash in done or content_hash in seen:
+            continue
+        seen.add(content_hash)
+        pending.append(chunk)
+
+    url = backend_url.rstrip("/") + "/debates/"
+    posted = 0
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        body = json.dumps([debate_chunk_record(chunk) for chunk in batch], ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+        if checkpoint:
+            checkpoint.record(chunk.content_hash for chunk in batch)
+        posted += len(batch)
+        log(f"{len(pending)}개 중 {posted}개 청크를 {url}에 등록했습니다.")
+    return posted
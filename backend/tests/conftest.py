@@ -0,0 +1,42 @@
+"""
+테스트 공통 설정
+
+app을 import하기 전에 환경 변수를 지정해 메모리 SQLite DB와 fake LLM을 사용하고,
+pytest-asyncio 없이 `async def test_*` 함수를 asyncio.run으로 실행합니다.
+
+실행 (backend 디렉터리에서):
+    python -m pytest -q
+"""
+import asyncio
+import inspect
+import os
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ["LOG_REQUESTS"] = "False"
+os.environ["CHAT_RATE_LIMIT"] = "0"
+os.environ["FAKE_LLM_LATENCY"] = "0"
+os.environ["FAKE_LLM_TOKEN_RATE"] = "0"
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**kwargs))
+    return True
+
+
+@pytest.fixture
+def database():
+    """빈 메모리 DB를 만들고 프로세스 전역 캐시/색인을 비우는 fixture"""
+    from app.database import create_tables, dispose_engine
+    from app.main import invalidate_derived_data
+
+    asyncio.run(create_tables())
+    invalidate_derived_data()
+    yield
+    asyncio.run(dispose_engine())
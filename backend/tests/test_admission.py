@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+from app import main
+from app.admission import AdmissionQueue, ClientRateLimiter, Overloaded
+
+
+async def test_rejects_when_queue_is_full():
+    queue = AdmissionQueue("test", capacity=1, max_queue=1, queue_timeout=1, enabled=True)
+    await queue.acquire()
+    waiting = asyncio.create_task(queue.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded) as rejected:
+        await queue.acquire()
+    assert rejected.value.reason == "queue_full"
+    assert queue.stats.rejected_queue_full == 1
+
+    queue.release()
+    await waiting
+    assert queue.active == 1 and queue.stats.queued == 1
+
+
+async def test_rejects_after_queue_timeout():
+    queue = AdmissionQueue("test", capacity=1, max_queue=4, queue_timeout=0.05, enabled=True)
+    await queue.acquire()
+
+    with pytest.raises(Overloaded) as rejected:
+        await queue.acquire()
+    assert rejected.value.reason == "queue_timeout"
+    assert rejected.value.retry_after_header == "1"
+    assert queue.snapshot()["waiting"] == 0
+
+    # 기한이 지난 대기자는 슬롯을 넘겨받지 않으므로 반납하면 슬롯이 비어야 함
+    queue.release()
+    assert queue.active == 0
+
+
+async def test_release_hands_slot_to_waiters_in_order():
+    queue = AdmissionQueue("test", capacity=1, max_queue=4, queue_timeout=1, enabled=True)
+    await queue.acquire()
+    order = []
+
+    async def wait(name):
+        await queue.acquire()
+        order.append(name)
+
+    waiters = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+    await asyncio.sleep(0)
+    # 대기 중인 요청이 있으면 새 요청이 슬롯을 가로채지 않고 대기열 뒤에 섬
+    late = asyncio.create_task(wait("c"))
+    await asyncio.sleep(0)
+
+    for _ in range(3):
+        queue.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiters, late)
+    assert order == ["a", "b", "c"]
+    assert queue.active == 1
+
+
+async def test_pause_rejects_until_cooldown_ends():
+    queue = AdmissionQueue("test", capacity=4, max_queue=4, queue_timeout=1, enabled=True)
+    queue.pause(0.05)
+    with pytest.raises(Overloaded) as rejected:
+        await queue.acquire()
+    assert rejected.value.reason == "upstream_rate_limited"
+    await asyncio.sleep(0.06)
+    await queue.acquire()
+
+
+def test_rate_limiter_is_off_by_default():
+    assert ClientRateLimiter(rate_per_minute=0, enabled=True).enabled is False
+    assert main.chat_rate_limiter.enabled is False
+
+
+async def test_rate_limit_keys_on_trusted_header(database, monkeypatch):
+    limiter = ClientRateLimiter(rate_per_minute=1, burst=1, enabled=True, header="X-Real-IP")
+    monkeypatch.setattr(main, "chat_rate_limiter", limiter)
+    # 모든 요청이 같은 프록시 주소에서 들어오는 경우
+    transport = httpx.ASGITransport(app=main.app, client=("10.0.0.1", 40000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def ask(ip):
+            return (await client.post("/chat/", json={"question": "질문"}, headers={"X-Real-IP": ip})).status_code
+
+        assert await ask("1.1.1.1") == 200
+        assert await ask("2.2.2.2") == 200
+        assert await ask("1.1.1.1") == 429
+        assert limiter.snapshot()["clients"] == 2
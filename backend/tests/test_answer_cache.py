@@ -0,0 +1,99 @@
+import time
+
+from app.cache import AnswerCache, normalize_question
+from app.schemas import ChatResponse
+
+
+class CountingCache(AnswerCache):
+    """임베딩 호출 횟수를 세는 캐시 (fake LLM 임베딩 사용)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.embeds = 0
+
+    async def _embed(self, text):
+        self.embeds += 1
+        return await super()._embed(text)
+
+
+def answer(text: str) -> ChatResponse:
+    return ChatResponse(answer=text, related_policies=[])
+
+
+def test_normalize_question():
+    assert normalize_question("  청년   주거 정책은？ ") == normalize_question("청년 주거 정책은")
+
+
+async def test_exact_hit_ignores_candidate_order():
+    cache = AnswerCache(enabled=True, semantic=False)
+    await cache.set("부동산 정책은?", [2, 1], answer("답변"))
+    assert (await cache.get("부동산 정책은", [1, 2])).answer == "답변"
+    assert await cache.get("부동산 정책은", [1]) is None
+    assert cache.stats.exact_hits == 1 and cache.stats.misses == 1
+
+
+async def test_ttl_expiry():
+    cache = AnswerCache(enabled=True, semantic=False, ttl=60)
+    await cache.set("질문", None, answer("답변"))
+    key = cache.make_key("질문")
+    cache._entries[key].expires_at = time.monotonic() - 1
+    assert await cache.get("질문") is None
+    assert cache.snapshot()["entries"] == 0
+
+
+async def test_lru_eviction_by_entry_count():
+    cache = AnswerCache(enabled=True, semantic=False, max_entries=2)
+    await cache.set("질문 1", None, answer("1"))
+    await cache.set("질문 2", None, answer("2"))
+    await cache.get("질문 1")  # 최근 사용으로 갱신
+    await cache.set("질문 3", None, answer("3"))
+    assert await cache.get("질문 2") is None
+    assert (await cache.get("질문 1")).answer == "1"
+    assert cache.stats.evictions == 1
+
+
+async def test_byte_cap():
+    cache = AnswerCache(enabled=True, semantic=False, max_bytes=400)
+    await cache.set("너무 긴 답변", None, answer("가" * 500))
+    assert cache.snapshot()["entries"] == 0
+
+    for i in range(10):
+        await cache.set(f"질문 {i}", None, answer("짧은 답변"))
+    assert cache.snapshot()["bytes"] <= 400
+    assert (await cache.get("질문 9")).answer == "짧은 답변"
+
+
+async def test_invalidate_drops_entries_and_late_writes():
+    cache = CountingCache(enabled=True, semantic=True)
+    await cache.set("질문", None, answer("답변"))
+    cache.invalidate()
+    assert await cache.get("질문") is None
+    assert cache.data_version == 1
+
+    # 무효화 전에 시작한 저장(임베딩 대기 중)은 버림
+    original = cache._embed
+
+    async def embed_then_invalidate(text):
+        cache.invalidate()
+        return await original(text)
+
+    cache._embed = embed_then_invalidate
+    await cache.set("다른 질문", None, answer("이전 데이터 기준 답변"))
+    assert cache.snapshot()["entries"] == 0
+
+
+async def test_semantic_hit_and_single_embedding_per_miss():
+    cache = CountingCache(enabled=True, semantic=True, similarity=0.8)
+    await cache.set("청년 주거 정책 알려줘", None, answer("주거 답변"))
+    assert cache.embeds == 1
+
+    response, embedding = await cache.lookup("청년 주거 정책 알려줘요")
+    assert response.answer == "주거 답변"
+    assert cache.stats.semantic_hits == 1
+
+    # 실패한 조회에서 만든 임베딩을 저장 시 재사용
+    embeds = cache.embeds
+    response, embedding = await cache.lookup("국방 예산 계획")
+    assert response is None and embedding is not None
+    await cache.set("국방 예산 계획", None, answer("국방 답변"), embedding)
+    assert cache.embeds == embeds + 1
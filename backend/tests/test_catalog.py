@@ -0,0 +1,94 @@
+from datetime import timedelta
+from email.utils import format_datetime
+
+import httpx
+from sqlalchemy import event
+
+from app import main
+from app.catalog import catalog
+from app.database import Base, Candidate, Policy, SessionLocal, get_engine
+
+
+def client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+
+async def seed(candidates: int, policies: int = 3) -> None:
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        db.add_all(
+            Candidate(name=f"후보{i + 1}", policies=[Policy(title=f"공약 {j + 1}") for j in range(policies)])
+            for i in range(candidates)
+        )
+        await db.commit()
+    catalog.invalidate()
+
+
+async def test_candidate_reads_use_constant_queries(database):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        counts = {}
+        async with client() as http:
+            for size in (1, 10, 50):
+                await seed(size)
+                statements.clear()
+                response = await http.get("/candidates/")
+                assert len(response.json()) == size
+                counts[size] = len(statements)
+
+                # 스냅샷이 있으면 DB를 읽지 않음
+                statements.clear()
+                await http.get("/candidates/")
+                await http.get("/policies/?candidate_id=1")
+                assert statements == []
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert set(counts.values()) == {2}
+
+
+async def test_conditional_requests(database):
+    await seed(2)
+    async with client() as http:
+        first = await http.get("/candidates/")
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+        assert etag.startswith('W/"')
+
+        for value in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+            response = await http.get("/candidates/", headers={"If-None-Match": value})
+            assert response.status_code == 304 and response.content == b""
+            assert response.headers["etag"] == etag
+        assert (await http.get("/candidates/", headers={"If-None-Match": '"other"'})).status_code == 200
+
+        assert (await http.get("/candidates/", headers={"If-Modified-Since": last_modified})).status_code == 304
+        earlier = format_datetime(catalog._snapshot.last_modified - timedelta(seconds=1), usegmt=True)
+        assert (await http.get("/candidates/", headers={"If-Modified-Since": earlier})).status_code == 200
+        assert (await http.get("/candidates/", headers={"If-Modified-Since": "not a date"})).status_code == 200
+        # If-None-Match가 있으면 If-Modified-Since는 무시
+        response = await http.get("/candidates/", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified})
+        assert response.status_code == 200
+
+
+async def test_write_changes_etag_and_reload_keeps_last_modified(database):
+    await seed(1)
+    async with client() as http:
+        first = await http.get("/candidates/")
+
+        # TTL 만료로 다시 읽어도 내용이 같으면 ETag/Last-Modified 유지
+        catalog._snapshot.loaded_at -= catalog.ttl
+        reloaded = await http.get("/candidates/")
+        assert reloaded.headers["etag"] == first.headers["etag"]
+        assert reloaded.headers["last-modified"] == first.headers["last-modified"]
+
+        await http.post("/policies/?candidate_id=1", json={"title": "새 공약"})
+        response = await http.get("/candidates/", headers={"If-None-Match": first.headers["etag"]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != first.headers["etag"]
+        assert [policy["title"] for policy in response.json()[0]["policies"]][-1] == "새 공약"
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import httpx
+from app import main
+from app.admission import AdmissionQueue
+from app.ai import FALLBACK_ANSWER
+from app.cache import answer_cache
+from app.llm import FakeLLMClient, set_llm_client
+
+
+class BrokenLLM(FakeLLMClient):
+    """스트리밍 호출이 항상 실패하는 fake 클라이언트"""
+
+    async def _stream(self, messages, max_tokens, temperature):
+        raise RuntimeError("upstream down")
+        yield
+
+
+def client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+
+def events(response: httpx.Response) -> list:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+async def test_stream_sends_policies_tokens_then_done(database):
+    async with client() as http:
+        response = await http.post("/chat/", json={"question": "스트리밍 질문", "stream": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    received = events(response)
+    types = [event["type"] for event in received]
+    assert types[0] == "policies" and types[-1] == "done"
+    assert set(types[1:-1]) == {"token"}
+    assert "".join(event["content"] for event in received[1:-1]) == received[-1]["answer"]
+
+
+async def test_stream_reports_llm_failure_as_error_event(database):
+    set_llm_client(BrokenLLM(max_retries=0))
+    try:
+        async with client() as http:
+            response = await http.post("/chat/", json={"question": "실패하는 질문", "stream": True})
+    finally:
+        set_llm_client(None)
+
+    assert response.status_code == 200
+    received = events(response)
+    assert [event["type"] for event in received] == ["policies", "error"]
+    assert received[-1]["answer"] == FALLBACK_ANSWER
+
+
+async def test_rejected_stream_is_429_not_a_stream(database, monkeypatch):
+    queue = AdmissionQueue("chat", capacity=1, max_queue=1, queue_timeout=1, enabled=True)
+    queue.pause(60)
+    monkeypatch.setattr(main, "chat_admission", queue)
+    async with client() as http:
+        response = await http.post("/chat/", json={"question": "거절될 질문", "stream": True})
+
+    assert response.status_code == 429
+    assert response.headers["content-type"] != "application/x-ndjson"
+    assert "retry-after" in response.headers
+
+
+async def test_answer_started_before_policy_write_is_not_cached(database):
+    set_llm_client(FakeLLMClient(latency=0.2))
+    try:
+        async with client() as http:
+            candidate = (await http.post("/candidates/", json={"name": "후보", "party": "정당"})).json()
+            question = {"question": "청년 주거 공약은?", "candidate_ids": [candidate["id"]]}
+
+            pending = asyncio.create_task(http.post("/api/question", json=question))
+            await asyncio.sleep(0.05)
+            # LLM 호출 중에 공약이 추가됨
+            await http.post(
+                "/policies/", params={"candidate_id": candidate["id"]},
+                json={"title": "청년 주거 지원", "category": "주거", "description": "청년 주거 공약"},
+            )
+            assert (await pending).status_code == 200
+            assert answer_cache.snapshot()["entries"] == 0
+
+            # 새 데이터로 만든 답변은 저장되고 다음 요청에서 적중
+            hits = answer_cache.stats.exact_hits
+            first = (await http.post("/api/question", json=question)).json()
+            assert [policy["title"] for policy in first["related_policies"]] == ["청년 주거 지원"]
+            await http.post("/api/question", json=question)
+            assert answer_cache.stats.exact_hits == hits + 1
+    finally:
+        set_llm_client(None)
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import json
+
+import httpx
+from app import main
+from preprocess import ingest
+from preprocess.chunking import chunk_utterances, load_utterances
+from preprocess.ingest import Checkpoint, post_debate_chunks
+
+
+def utterance(speaker: str, text: str, index: int) -> dict:
+    return {"speaker": speaker, "text": text, "date": "2025.05.02", "source": "2025.05.02.jsonl", "index": index}
+
+
+def test_chunk_never_spans_two_speakers():
+    utterances = [
+        utterance("사회자", "질문드리겠습니다.", 0),
+        utterance("김철수 후보", "답변드리겠습니다.", 1),
+        utterance("김철수 후보", "덧붙이겠습니다.", 2),
+        utterance("이영희 후보", "반론하겠습니다.", 3),
+    ]
+    chunks = chunk_utterances(utterances, max_chars=1000)
+
+    assert [chunk.metadata["speaker"] for chunk in chunks] == ["사회자", "김철수 후보", "이영희 후보"]
+    assert chunks[1].content == "(김철수 후보) 답변드리겠습니다.\n덧붙이겠습니다."
+    assert (chunks[1].metadata["first_index"], chunks[1].metadata["last_index"]) == (1, 2)
+    assert chunks[1].metadata["date"] == "2025.05.02"
+
+
+def test_long_utterance_splits_at_sentence_boundaries():
+    sentences = [f"{i}번째 문장은 이렇게 끝납니다." for i in range(10)]
+    chunks = chunk_utterances([utterance("김철수 후보", " ".join(sentences), 0)], max_chars=60)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.metadata["speaker"] == "김철수 후보"
+        body = chunk.content.removeprefix("(김철수 후보) ")
+        assert len(body) <= 60
+        assert body.endswith("끝납니다.")
+    assert " ".join(chunk.content.removeprefix("(김철수 후보) ") for chunk in chunks) == " ".join(sentences)
+
+
+def test_txt_continuation_lines(tmp_path):
+    path = tmp_path / "2025.05.02.txt"
+    path.write_text("(사회자) 시작하겠습니다.\n(김철수 후보) 첫 줄입니다.\n이어지는 줄입니다.\n(사회자) 고맙습니다.\n", encoding="utf-8")
+
+    utterances = load_utterances(str(path))
+
+    assert [u["speaker"] for u in utterances] == ["사회자", "김철수 후보", "사회자"]
+    assert utterances[1]["text"] == "첫 줄입니다.\n이어지는 줄입니다."
+    assert utterances[1]["date"] == "2025.05.02" and utterances[1]["source"] == "2025.05.02.txt"
+    # 이어지는 줄은 같은 발화의 청크에 들어감
+    assert [chunk.content for chunk in chunk_utterances(utterances)][1] == "(김철수 후보) 첫 줄입니다. 이어지는 줄입니다."
+
+
+async def test_post_debate_chunks_loads_backend(database, tmp_path, monkeypatch):
+    chunks = chunk_utterances([
+        utterance("김철수 후보", "탄소중립을 앞당기겠습니다.", 0),
+        utterance("이영희 후보", "교육 격차를 줄이겠습니다.", 1),
+    ])
+    posted = []
+
+    @contextlib.contextmanager
+    def urlopen(request, timeout):
+        assert request.full_url == "http://backend/debates/"
+        posted.append(json.loads(request.data))
+        yield io.BytesIO(b"[]")
+
+    monkeypatch.setattr(ingest.urllib.request, "urlopen", urlopen)
+    checkpoint = Checkpoint(str(tmp_path / "debate.posted"))
+    assert post_debate_chunks(chunks + chunks, "http://backend/", batch_size=1, checkpoint=checkpoint, log=lambda _: None) == 2
+    # 다시 실행하면 이미 등록한 청크는 보내지 않음
+    assert post_debate_chunks(chunks, "http://backend", checkpoint=Checkpoint(checkpoint.path), log=lambda _: None) == 0
+    assert len(posted) == 2
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        kim = (await client.post("/candidates/", json={"name": "김철수"})).json()["id"]
+        for batch in posted:
+            (await client.post("/debates/", json=batch)).raise_for_status()
+
+        results = (await client.get("/debates/search", params={"q": "탄소중립"})).json()
+        assert [(result["candidate_id"], result["date"], result["source"]) for result in results] == [
+            (kim, "2025.05.02", "2025.05.02.jsonl")
+        ]
@@ -0,0 +1,54 @@
+import gzip
+
+import httpx
+from app import main
+from app.database import Candidate, Policy, SessionLocal
+
+
+async def seed() -> None:
+    async with SessionLocal() as db:
+        db.add(Candidate(name="김철수", party="미래당", policies=[
+            Policy(title="주택 공급 확대", category="부동산", description="공공주택을 공급합니다."),
+        ]))
+        await db.commit()
+
+
+async def get(client: httpx.AsyncClient, **headers) -> tuple:
+    """(응답, 압축을 풀지 않은 본문) 반환"""
+    request = client.build_request("GET", "/comparison/", headers=headers)
+    response = await client.send(request, stream=True)
+    raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+async def test_gzip_follows_accept_encoding_quality(database):
+    await seed()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        compressed, body = await get(client, **{"Accept-Encoding": "gzip, deflate"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+
+        for refused in ("gzip;q=0", "identity", "br, gzip; q=0.0", "*;q=0"):
+            response, raw = await get(client, **{"Accept-Encoding": refused})
+            assert "content-encoding" not in response.headers, refused
+            assert raw == gzip.decompress(body)
+
+        response, _ = await get(client, **{"Accept-Encoding": "*"})
+        assert response.headers["content-encoding"] == "gzip"
+
+
+async def test_conditional_request_and_policy_change(database):
+    await seed()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        first = await client.get("/comparison/")
+        etag = first.headers["etag"]
+        cached = await client.get("/comparison/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["last-modified"] == first.headers["last-modified"]
+
+        candidate_id = first.json()["candidates"][0]["id"]
+        await client.post(f"/policies/?candidate_id={candidate_id}",
+                          json={"title": "국방비 증액", "category": "국방", "description": "국방비를 늘립니다."})
+        changed = await client.get("/comparison/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert [row["category"] for row in changed.json()["categories"]] == ["국방", "부동산"]
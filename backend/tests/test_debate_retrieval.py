@@ -0,0 +1,37 @@
+import httpx
+from app import main
+from app.catalog import catalog
+from app.database import DebateChunk, SessionLocal
+
+
+async def test_scores_are_comparable_across_candidates(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        kim = (await client.post("/candidates/", json={"name": "김철수"})).json()["id"]
+        lee = (await client.post("/candidates/", json={"name": "이영희"})).json()["id"]
+        # 김철수 후보는 연금을 여러 번 언급해 후보별 IDF였다면 같은 발언의 점수가 낮아짐
+        chunks = [{"speaker": "김철수 후보", "content": "연금 개혁을 추진하겠습니다."} for _ in range(2)]
+        chunks += [{"speaker": "김철수 후보", "content": f"연금 재정 {i}"} for i in range(4)]
+        chunks += [{"speaker": "이영희 후보", "content": "연금 개혁을 추진하겠습니다."},
+                   {"speaker": "이영희 후보", "content": "교육 격차를 줄이겠습니다."}]
+        (await client.post("/debates/", json=chunks)).raise_for_status()
+
+        response = await client.get("/debates/search", params={"q": "연금 개혁", "candidate_id": [kim, lee], "k": 3})
+        results = response.json()
+        assert {result["candidate_id"] for result in results} == {kim, lee}
+        assert len({round(result["score"], 9) for result in results}) == 1
+
+
+async def test_index_follows_catalog_refresh(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        kim = (await client.post("/candidates/", json={"name": "김철수"})).json()["id"]
+        assert (await client.get("/debates/search", params={"q": "탄소중립"})).json() == []
+
+        # 다른 워커가 등록한 청크: 이 프로세스에서는 invalidate()가 호출되지 않음
+        async with SessionLocal() as db:
+            db.add(DebateChunk(speaker="김철수 후보", content="탄소중립을 앞당기겠습니다."))
+            await db.commit()
+        assert (await client.get("/debates/search", params={"q": "탄소중립"})).json() == []
+        catalog._snapshot.loaded_at -= catalog.ttl  # CATALOG_TTL 경과
+
+        results = (await client.get("/debates/search", params={"q": "탄소중립"})).json()
+        assert [result["candidate_id"] for result in results] == [kim]
@@ -0,0 +1,42 @@
+import os
+
+from preprocess.extract_debate import extract_many
+
+
+def write_transcript(path: str, day: int, speech: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"방송일시 : 2025. 5. {day}.<br>-(사회자) 토론을 시작하겠습니다.<br>")
+        f.write(f"-(후보A) {speech}<br>-(사회자) 여러분, 고맙습니다.<br>")
+
+
+def test_same_date_inputs_do_not_overwrite(tmp_path):
+    inputs = [str(tmp_path / "first.php"), str(tmp_path / "second.php")]
+    write_transcript(inputs[0], 1, "첫 번째 방송")
+    write_transcript(inputs[1], 1, "두 번째 방송")
+    output_dir = str(tmp_path / "out")
+
+    written = extract_many(inputs, output_dir, workers=2)
+
+    assert len(set(written)) == 2
+    contents = "".join(open(path, encoding="utf-8").read() for path in written)
+    assert "첫 번째 방송" in contents and "두 번째 방송" in contents
+    assert not [name for name in os.listdir(output_dir) if name.endswith(".tmp")]
+
+    # 다시 실행해도 각 자료는 자기 결과 파일을 유지
+    os.utime(inputs[0], ns=(0, 0))
+    write_transcript(inputs[1], 1, "두 번째 방송 수정")
+    rewritten = extract_many(inputs, output_dir, workers=2)
+    assert len(rewritten) == 1 and rewritten[0] in written
+    assert "두 번째 방송 수정" in open(rewritten[0], encoding="utf-8").read()
+
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    path = str(tmp_path / "broadcast.php")
+    write_transcript(path, 2, "발언")
+    output_dir = str(tmp_path / "out")
+    assert len(extract_many([path], output_dir, workers=1)) == 1
+
+    assert extract_many([path], output_dir, workers=1) == []
+    # 수정 시각만 바뀌면 해시를 비교해 다시 추출하지 않음
+    os.utime(path, ns=(1, 1))
+    assert extract_many([path], output_dir, workers=1) == []
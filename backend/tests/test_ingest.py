@@ -0,0 +1,76 @@
+import pytest
+
+from preprocess.ingest import Checkpoint, Chunk, FakeEmbedder, IngestionPipeline, SQLiteVectorStore
+
+
+class FailingEmbedder(FakeEmbedder):
+    """처음 `succeed`번의 요청만 성공하고 이후에는 `error`를 던지는 임베딩 모델"""
+
+    def __init__(self, succeed: int, error: Exception, failures: int = 10**9):
+        super().__init__(dimension=8)
+        self.succeed = succeed
+        self.error = error
+        self.failures = failures
+        self.requests = 0
+
+    def embed_documents(self, texts):
+        self.requests += 1
+        if self.succeed < self.requests <= self.succeed + self.failures:
+            raise self.error
+        return super().embed_documents(texts)
+
+
+def chunks(count: int):
+    return [Chunk(content=f"발화 {i}", metadata={"speaker": "김철수 후보", "first_index": i}) for i in range(count)]
+
+
+def pipeline(embedder, store, checkpoint, **kwargs) -> IngestionPipeline:
+    options = {"batch_size": 2, "max_workers": 1, "retry_backoff": 0.0, "log": lambda _: None}
+    return IngestionPipeline(embedder=embedder, store=store, checkpoint=checkpoint, **{**options, **kwargs})
+
+
+def test_failed_run_checkpoints_completed_batches_and_rerun_skips_them(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "vectors.db"))
+    checkpoint_path = str(tmp_path / "debate.ingested")
+    items = chunks(6)
+
+    with pytest.raises(RuntimeError):
+        pipeline(FailingEmbedder(succeed=1, error=RuntimeError("boom")), store, Checkpoint(checkpoint_path)).run(items)
+    assert Checkpoint(checkpoint_path).done == {chunk.content_hash for chunk in items[:2]}
+    assert store.count() == 2
+
+    embedder = FailingEmbedder(succeed=10**9, error=RuntimeError("unused"))
+    stats = pipeline(embedder, store, Checkpoint(checkpoint_path)).run(items)
+    assert (stats.skipped, stats.embedded, embedder.requests) == (2, 4, 2)
+    assert store.count() == 6
+    assert Checkpoint(checkpoint_path).done == {chunk.content_hash for chunk in items}
+
+
+def test_duplicates_within_one_input_are_embedded_once(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "vectors.db"))
+    items = chunks(3)
+
+    stats = pipeline(FakeEmbedder(dimension=8), store, None).run(items + items[:2])
+
+    assert (stats.total, stats.skipped, stats.embedded) == (5, 2, 3)
+    assert store.count() == 3
+
+
+def test_rate_limited_batches_are_retried(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "vectors.db"))
+    embedder = FailingEmbedder(succeed=0, error=RuntimeError("429 Resource has been exhausted"), failures=2)
+
+    stats = pipeline(embedder, store, None, max_retries=3).run(chunks(2))
+
+    assert (stats.retries, stats.embedded, embedder.requests) == (2, 2, 3)
+    assert store.count() == 2
+
+
+def test_rate_limit_gives_up_after_max_retries(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "vectors.db"))
+    embedder = FailingEmbedder(succeed=0, error=RuntimeError("rate limit exceeded"))
+
+    with pytest.raises(RuntimeError):
+        pipeline(embedder, store, None, max_retries=2).run(chunks(2))
+    assert embedder.requests == 3
+    assert store.count() == 0
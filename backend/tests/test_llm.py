@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.llm import BaseLLMClient, FakeLLMClient, LLMError
+
+
+class FlakyLLM(FakeLLMClient):
+    """처음 `failures`번은 타임아웃으로 실패하는 fake 클라이언트"""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(latency=0, token_rate=0, **kwargs)
+        self.failures = failures
+
+    async def _stream(self, messages, max_tokens, temperature):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise asyncio.TimeoutError()
+        yield "ok"
+
+
+def test_base_client_requires_provider_methods():
+    with pytest.raises(TypeError):
+        BaseLLMClient()
+
+
+async def test_chat_retries_then_succeeds():
+    client = FlakyLLM(failures=2, max_retries=3, retry_backoff=0.001)
+    assert await client.chat([{"role": "user", "content": "질문"}]) == "ok"
+    assert client.calls == 3
+
+
+async def test_chat_gives_up_after_max_retries():
+    client = FlakyLLM(failures=10, max_retries=1, retry_backoff=0.001)
+    with pytest.raises(LLMError):
+        await client.chat([{"role": "user", "content": "질문"}])
+    assert client.calls == 2
+
+
+async def test_backoff_releases_slot():
+    # 슬롯 1개: 재시도 대기 중인 요청이 있어도 다른 요청은 백오프가 끝나기 전에 처리됨
+    client = FlakyLLM(failures=1, max_concurrency=1, max_retries=1, retry_backoff=0.2)
+    messages = [{"role": "user", "content": "질문"}]
+    retrying = asyncio.create_task(client.chat(messages))
+    await asyncio.sleep(0.01)
+    assert await asyncio.wait_for(client.chat(messages), timeout=0.1) == "ok"
+    assert await retrying == "ok"
+
+
+async def test_stream_backoff_releases_slot():
+    client = FlakyLLM(failures=1, max_concurrency=1, max_retries=1, retry_backoff=0.2)
+    messages = [{"role": "user", "content": "질문"}]
+
+    async def collect():
+        return "".join([token async for token in client.stream_chat(messages)])
+
+    retrying = asyncio.create_task(collect())
+    await asyncio.sleep(0.01)
+    assert await asyncio.wait_for(collect(), timeout=0.1) == "ok"
+    assert await retrying == "ok"
+
+
+async def test_embedding_does_not_wait_for_stream_slots():
+    # 채팅 슬롯을 모두 차지한 긴 스트리밍 답변이 있어도 캐시 조회용 임베딩은 바로 처리됨
+    client = FakeLLMClient(latency=0.5, token_rate=0, max_concurrency=1)
+    messages = [{"role": "user", "content": "질문"}]
+
+    async def collect():
+        return "".join([token async for token in client.stream_chat(messages)])
+
+    streaming = asyncio.create_task(collect())
+    await asyncio.sleep(0.01)
+    assert len(await asyncio.wait_for(client.embed("질문"), timeout=0.1)) == 256
+    assert await streaming
@@ -0,0 +1,73 @@
+import httpx
+from app import main
+from app.catalog import catalog
+from app.database import Candidate, Policy, SessionLocal
+from app.retrieval import PolicyRetriever
+
+
+async def seed() -> dict:
+    async with SessionLocal() as db:
+        kim = Candidate(name="김철수", party="미래당", policies=[
+            Policy(title="주택 공급 확대", category="부동산", description="공공주택 50만 호를 공급합니다."),
+            Policy(title="청년 월세 지원", category="부동산", description="청년 월세를 지원합니다."),
+            Policy(title="전세 사기 예방", category="부동산", description="전세 보증을 강화합니다."),
+            Policy(title="재건축 규제 완화", category="부동산", description="재건축 절차를 단축합니다."),
+        ])
+        lee = Candidate(name="이영희", party="희망당", policies=[
+            Policy(title="주택 공급 확대", category="부동산", description="공공주택 30만 호를 공급합니다."),
+            Policy(title="국방 예산 증액", category="국방", description="국방비를 늘립니다."),
+        ])
+        db.add_all([kim, lee])
+        await db.commit()
+        return {"kim": kim.id, "lee": lee.id}
+
+
+async def test_candidate_name_in_question_prefers_that_candidate(database):
+    ids = await seed()
+    retriever = PolicyRetriever()
+    async with SessionLocal() as db:
+        # 프론트엔드 챗봇 페이지는 후보 ID 없이 질문 앞에 후보 이름/정당을 붙여 보냄
+        for name, party, key in (("김철수", "미래당", "kim"), ("이영희", "희망당", "lee")):
+            question = f"{name} 후보({party})의 공약에 대해 답변합니다: 주택 공급 계획은?"
+            policies = await retriever.retrieve(db, question, match_count=1)
+            assert [policy.candidate_id for policy in policies] == [ids[key]]
+
+
+async def test_candidate_filter_without_match_falls_back_to_candidate_policies(database):
+    ids = await seed()
+    retriever = PolicyRetriever()
+    async with SessionLocal() as db:
+        policies = await retriever.retrieve(db, "요약해줘", [ids["kim"]], match_count=3)
+        assert len(policies) == 3
+        assert {policy.candidate_id for policy in policies} == {ids["kim"]}
+
+        policies = await retriever.retrieve(db, "요약해줘", [ids["kim"], ids["lee"]], match_count=4)
+        assert [policy.candidate_id for policy in policies] == [ids["kim"], ids["lee"], ids["kim"], ids["lee"]]
+
+        # 후보를 지정하지 않은 질문은 관련 정책이 없으면 컨텍스트 없이 답변
+        assert await retriever.retrieve(db, "요약해줘") == []
+
+
+async def test_index_follows_catalog_refresh(database):
+    ids = await seed()
+    retriever = PolicyRetriever()
+    async with SessionLocal() as db:
+        assert all(policy.category != "환경" for policy in await retriever.retrieve(db, "탄소중립", [ids["lee"]]))
+
+        # 다른 워커가 등록한 정책: 이 프로세스에서는 invalidate()가 호출되지 않음
+        db.add(Policy(candidate_id=ids["lee"], title="탄소중립 2040", category="환경", description="석탄 발전을 줄입니다."))
+        await db.commit()
+        catalog._snapshot.loaded_at -= catalog.ttl  # CATALOG_TTL 경과
+
+        policies = await retriever.retrieve(db, "탄소중립", [ids["lee"]], match_count=1)
+        assert [policy.title for policy in policies] == ["탄소중립 2040"]
+
+
+async def test_match_count_is_part_of_cache_and_flight_key(database):
+    await seed()
+    hits = main.answer_cache.stats.exact_hits
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        for count in (1, 4, 1):
+            response = await client.post("/chat/", json={"question": "부동산 정책은?", "match_count": count})
+            assert len(response.json()["related_policies"]) == count
+    assert main.answer_cache.stats.exact_hits - hits == 1
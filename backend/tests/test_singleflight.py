@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+from app import main
+from app.llm import FakeLLMClient, set_llm_client
+from app.singleflight import SingleFlight
+
+
+async def collect(flight) -> list:
+    return [event async for event in flight.subscribe()]
+
+
+async def test_error_reaches_every_subscriber():
+    release = asyncio.Event()
+
+    async def producer():
+        yield {"type": "token", "content": "a"}
+        await release.wait()
+        raise RuntimeError("upstream")
+
+    flights = SingleFlight(enabled=True)
+    first = flights.join("q", producer)
+    early = asyncio.create_task(collect(first))
+    await asyncio.sleep(0)
+    late = asyncio.create_task(collect(flights.join("q", producer)))
+    release.set()
+
+    for task in (early, late):
+        with pytest.raises(RuntimeError, match="upstream"):
+            await task
+    assert flights.snapshot()["upstream_calls"] == 1
+    assert flights.snapshot()["in_flight"] == 0
+
+
+async def test_late_joiner_replays_buffered_events():
+    release = asyncio.Event()
+
+    async def producer():
+        for i in range(3):
+            yield {"type": "token", "content": str(i)}
+        await release.wait()
+        yield {"type": "done", "answer": "012"}
+
+    flights = SingleFlight(enabled=True)
+    leader = flights.join("q", producer)
+    while len(leader.events) < 3:
+        await asyncio.sleep(0)
+
+    follower = flights.join("q", producer)
+    assert follower is leader and follower.followers == 1
+    task = asyncio.create_task(collect(follower))
+    release.set()
+    events = await task
+    assert [event.get("content", event.get("answer")) for event in events] == ["0", "1", "2", "012"]
+
+    # 끝난 호출의 키는 지워져 다음 요청은 새 호출을 시작
+    assert flights.join("q", producer) is not leader
+
+
+async def test_identical_concurrent_requests_share_one_upstream_call(database):
+    llm = FakeLLMClient(latency=0.2, token_rate=0, max_concurrency=100)
+    set_llm_client(llm)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.post("/api/question", json={"question": "청년 주거 정책은?", "stream": i % 2 == 1})
+                for i in range(100)
+            ))
+    finally:
+        set_llm_client(None)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert llm.calls == 1
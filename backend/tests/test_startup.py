@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from benchmarks.startup import BACKEND_DIR, UNREACHABLE_DATABASE_URL, environment, measure_first_request, measure_import
+
+# 시작 시간 예산(ms): CI 장비 차이를 감안해 넉넉하게 잡고, 환경 변수로 조정 (0이면 확인하지 않음)
+MAX_IMPORT_MS = float(os.getenv("STARTUP_MAX_IMPORT_MS", "5000"))
+MAX_FIRST_REQUEST_MS = float(os.getenv("STARTUP_MAX_FIRST_REQUEST_MS", "15000"))
+
+# 앱을 시작(lifespan)한 뒤 / 와 /ready의 상태 코드를 출력
+READY_PROBE = """
+import asyncio, json
+import httpx
+import app.main
+
+async def probe():
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with app.main.app.router.lifespan_context(app.main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [(await client.get(path)).status_code for path in ("/", "/ready")]
+
+print(json.dumps(asyncio.run(probe())))
+"""
+
+
+@pytest.mark.parametrize("database_url", ["sqlite:///startup.db", UNREACHABLE_DATABASE_URL])
+def test_import_does_not_load_sdk_or_create_engine(database_url):
+    probe = measure_import(database_url)
+    assert probe["heavy_modules"] == []
+    assert probe["engine_created"] is False
+    if MAX_IMPORT_MS:
+        assert probe["import_ms"] < MAX_IMPORT_MS
+
+
+def test_starts_without_database():
+    output = subprocess.run(
+        [sys.executable, "-c", READY_PROBE],
+        cwd=BACKEND_DIR, env=environment(UNREACHABLE_DATABASE_URL), capture_output=True, text=True, check=True,
+    ).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == [200, 503]
+
+
+@pytest.mark.parametrize("migrated", [True, False])
+def test_first_request_within_budget(migrated, tmp_path):
+    if migrated:
+        database_url = f"sqlite:///{tmp_path / 'startup.db'}"
+        subprocess.run([sys.executable, "-m", "app.migrate"], cwd=BACKEND_DIR, env=environment(database_url),
+                       capture_output=True, check=True)
+    else:
+        database_url = UNREACHABLE_DATABASE_URL
+
+    elapsed_ms, ready = measure_first_request(database_url)
+    assert ready == (200 if migrated else 503)
+    if MAX_FIRST_REQUEST_MS:
+        assert elapsed_ms < MAX_FIRST_REQUEST_MS
@@ -0,0 +1,51 @@
+import re
+
+import httpx
+from app import main
+from app.telemetry import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "테스트", ("route",), buckets=(0.1, 1.0))
+    route = 'a"b\\c\nd'
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route=route)
+
+    labels = 'route="a\\"b\\\\c\\nd"'
+    assert histogram.render() == [
+        "# HELP test_seconds 테스트",
+        "# TYPE test_seconds histogram",
+        f'test_seconds_bucket{{{labels},le="0.1"}} 1',
+        f'test_seconds_bucket{{{labels},le="1"}} 3',
+        f'test_seconds_bucket{{{labels},le="+Inf"}} 4',
+        f"test_seconds_sum{{{labels}}} 4.25",
+        f"test_seconds_count{{{labels}}} 4",
+    ]
+
+
+def stage_counts(text: str) -> dict:
+    pattern = r'^algovote_chat_stage_duration_seconds_count\{stage="(\w+)"\} (\d+)$'
+    return {stage: int(count) for stage, count in re.findall(pattern, text, re.MULTILINE)}
+
+
+async def test_metrics_records_chat_and_catalog_stages(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        before = stage_counts((await client.get("/metrics")).text)
+        (await client.post("/candidates/", json={"name": "후보"})).raise_for_status()
+        (await client.get("/candidates/")).raise_for_status()
+        # 카탈로그 로딩 쿼리도 db 단계로 기록
+        assert stage_counts((await client.get("/metrics")).text).get("db", 0) > before.get("db", 0)
+        (await client.post("/chat/", json={"question": "메트릭 확인용 질문"})).raise_for_status()
+
+        response = await client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        after = stage_counts(response.text)
+        for stage in ("cache", "retrieval", "prompt", "llm", "serialize"):
+            assert after.get(stage, 0) > before.get(stage, 0), stage
+
+        # 요청 지연 히스토그램: 버킷 값은 누적이고 +Inf 버킷이 _count와 같음
+        prefix = 'algovote_http_request_duration_seconds_bucket{method="POST",route="/chat/",status="200",le="'
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in response.text.splitlines() if line.startswith(prefix)]
+        assert buckets == sorted(buckets) and buckets[-1] >= 1
+        count_line = 'algovote_http_request_duration_seconds_count{method="POST",route="/chat/",status="200"} '
+        assert f"{count_line}{buckets[-1]}" in response.text.splitlines()